@@ -1,27 +1,46 @@
+import sys
 from datetime import datetime, date
 from pathlib import Path
+from typing import List
 
 from colorama import Fore
 from nornir import InitNornir
 from nornir.core import Nornir, Task
 from nornir.core.filter import F
 from nornir_napalm.plugins.tasks import napalm_get
-from nornir_utils.plugins.tasks.files import write_file
 
+from modules.utility.compliance_checker import ComplianceChecker
+from modules.utility.config_index import ConfigIndex
 from modules.utility.credential_handler import CredentialHandler
+from modules.utility.export_writer import ExportWriter
+from modules.utility.log_pipeline import setup_log_pipeline
+from modules.utility.result_spooler import StreamingResultProcessor
 
 
 class BackupConfiguration:
     """
     Třida určená pro pravidelný backup konfigurace síťových zařízení (využití pro automatický backup např. pomocí nástroje cron).
+    Konfigurace jsou zapisovány přes asynchronní ExportWriter (atomický zápis) - pracovní vlákna tak nečekají na disk.
+
+    Args:
+        export_writer (ExportWriter): zapisovač záloh. Defaultně None (ExportWriter bez komprese - restore_configuration.py čte nekomprimované zálohy).
+        config_index (ConfigIndex): invertovaný index konfigurací, do kterého jsou zálohy zároveň indexovány. Defaultně None (bez indexace).
 
     Attributes:
         date (datetime.date): datum provedení backupu
+        export_writer (ExportWriter): zapisovač záloh
+        config_index (Optional[ConfigIndex]): invertovaný index konfigurací
 
     """
 
-    def __init__(self):
+    def __init__(self, export_writer: ExportWriter = None, config_index: ConfigIndex = None):
         self._date = datetime.now().date()
+        self._export_writer = export_writer or ExportWriter()
+        self._config_index = config_index
+
+    @property
+    def export_writer(self) -> ExportWriter:
+        return self._export_writer
 
     def setup_inventory(self) -> Nornir:
         """
@@ -31,6 +50,7 @@ class BackupConfiguration:
             Nornir - nornir objekt, který obsahuje zparsované informace o hostech, skupinách. Dále zajišťuje multithreading funkcionalitu.
         """
         creds_handler = CredentialHandler()
+        setup_log_pipeline()  # logování nornir přes frontu (config.yml - logging: enabled: False)
         nr = InitNornir(config_file="config.yml")  # Nornir objekt, který přeskočí hosty, které nezvládli požadovaný (sub)task - více o chybě v nornir.log
         creds_handler.insert_creds(nr)
         return nr
@@ -63,17 +83,46 @@ class BackupConfiguration:
             running_configuration = result[0].result["config"]['running'].strip()
             file_path = Path(Path.cwd() / 'backups' / f"{task.host.name}" / f"{task.host.name}_{str(self._date)}.conf")
             self._create_parent_folders(file_path.parent)
-            res = task.run(write_file, filename=str(file_path), content=running_configuration, append=False)
-            if not res.failed:
-                print(f"Backup {file_path.name} of running configuration was successful for host {task.host.name}.")
-            else:
-                print(f"{Fore.RED}Backup of running configuration failed for host {task.host.name} - more info in nornir.log")
+            self._export_writer.submit(file_path, running_configuration)
+            if self._config_index:
+                self._config_index.index_config(file_path, task.host.name, str(self._date), running_configuration)
+            print(f"Backup {file_path.name} of running configuration was queued for host {task.host.name}.")
         else:
             print(f"{Fore.RED}Backup of running configuration failed for host {task.host.name} - more info in nornir.log")
 
+    def report_failed_backups(self) -> List[str]:
+        """
+        Metoda, která vypíše hosty, jejichž zálohu se nepodařilo zapsat na disk (zápis probíhá asynchronně, takže chyba zápisu
+        není známa v okamžiku zařazení zálohy do fronty). Volá se až po uzavření zapisovače (close).
+
+        Returns:
+            Vrací list jmen hostů, jejichž zálohu se nepodařilo zapsat.
+        """
+        failed_hosts = []
+        for file_path, error in self._export_writer.get_errors():
+            host = file_path.parent.name  # backups/<host>/<host>_<datum>.conf
+            failed_hosts.append(host)
+            print(f"{Fore.RED}Backup {file_path.name} of running configuration failed for host {host} - {error}")
+        return failed_hosts
+
 
 if __name__ == '__main__':
-    backup_configuration = BackupConfiguration()
+    backup_configuration = BackupConfiguration(config_index=ConfigIndex(Path(Path.cwd() / "export" / "config_index.sqlite")))
     nr = backup_configuration.setup_inventory()
     all_devices = nr.filter(F(dev_type="router") | F(dev_type="L3_switch") | F(dev_type="switch"))
-    all_devices.run(backup_configuration.backup_device_running_configuration, name="Backup running configuration")
+    # running konfigurace nejsou drženy v AggregatedResult do konce běhu - po dokončení hosta jsou uloženy na disk
+    all_devices = all_devices.with_processors([StreamingResultProcessor(Path(Path.cwd() / "export" / "spool"))])
+    try:
+        result = all_devices.run(backup_configuration.backup_device_running_configuration, name="Backup running configuration")
+    finally:
+        backup_configuration.export_writer.close()  # zápis zbývajících záloh i v případě výjimky (vlákno zapisovače je daemon)
+        backup_configuration.export_writer.print_report()
+    failed_hosts = set(result.failed_hosts) | set(backup_configuration.report_failed_backups())
+
+    # Kontrola souladu nových záloh s pravidly (compliance/rules.yml) - výsledek v export/compliance/compliance_report.json
+    hosts = {name: {"vendor": host.get("vendor"), "dev_type": host.get("dev_type")} for name, host in all_devices.inventory.hosts.items()}
+    ComplianceChecker(Path(Path.cwd() / "compliance" / "rules.yml")).run(
+        hosts, Path(Path.cwd() / "backups"), report_file=Path(Path.cwd() / "export" / "compliance" / "compliance_report.json"))
+    if failed_hosts:
+        print(f"{Fore.RED}Backup failed for hosts: {', '.join(sorted(failed_hosts))}")
+        sys.exit(1)  # nenulový návratový kód - cron/monitoring pozná neúplný backup
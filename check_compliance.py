@@ -0,0 +1,33 @@
+from pathlib import Path
+from typing import Dict
+
+from nornir import InitNornir
+from nornir.core import Nornir
+from nornir.core.filter import F
+
+from modules.utility.compliance_checker import ComplianceChecker
+
+RULES_FILE = Path(Path.cwd() / "compliance" / "rules.yml")
+BACKUP_DIR = Path(Path.cwd() / "backups")
+REPORT_FILE = Path(Path.cwd() / "export" / "compliance" / "compliance_report.json")
+
+
+def get_hosts(nornir_devices: Nornir) -> Dict[str, Dict[str, str]]:
+    """
+    Funkce, která z inventáře získá výrobce a typ jednotlivých zařízení (pro výběr platných pravidel).
+
+    Args:
+        nornir_devices (Nornir): filtrovaný Nornir objekt
+
+    Returns:
+        Vrací slovník host -> údaje hosta (vendor, dev_type).
+    """
+    return {name: {"vendor": host.get("vendor"), "dev_type": host.get("dev_type")}
+            for name, host in nornir_devices.inventory.hosts.items()}
+
+
+if __name__ == '__main__':
+    nr = InitNornir(config_file="config.yml")  # pouze inventář - kontrola probíhá nad zálohami, bez připojení k zařízením
+    all_devices = nr.filter(F(dev_type="router") | F(dev_type="L3_switch") | F(dev_type="switch"))
+    compliance_checker = ComplianceChecker(RULES_FILE)
+    compliance_checker.run(get_hosts(all_devices), BACKUP_DIR, report_file=REPORT_FILE)
@@ -1,12 +1,20 @@
 from datetime import datetime
-from time import sleep
-from typing import Dict, List
+from time import sleep, time
+from typing import Dict, List, Optional
 from colorama import Fore
 from influxdb import InfluxDBClient
 from nornir import InitNornir
 from nornir.core import Nornir
+from nornir.core.task import AggregatedResult
 from nornir_napalm.plugins.tasks import napalm_get
+from modules.utility.acl_hit_collector import AclHitCollector
+from modules.utility.adaptive_scheduler import AdaptivePollScheduler
+from modules.utility.counter_rate_calculator import CounterRateCalculator
 from modules.utility.credential_handler import CredentialHandler
+from modules.utility.log_pipeline import setup_log_pipeline
+from modules.utility.inventory_index import InventoryIndex
+from modules.utility.metrics_endpoint import MetricsStore
+from modules.utility.sample_compressor import SampleCompressor
 
 
 def setup_inventory() -> Nornir:
@@ -17,6 +25,7 @@ def setup_inventory() -> Nornir:
         Nornir - nornir objekt, který obsahuje zparsované informace o hostech, skupinách. Dále zajišťuje multithreading funkcionalitu.
     """
     creds_handler = CredentialHandler()
+    setup_log_pipeline()  # logování nornir přes frontu (config.yml - logging: enabled: False)
     nr = InitNornir(
         config_file="config.yml")  # Nornir objekt, který přeskočí zařízení, které nezvládly požadovaný (sub)task. více o chybě v nornir.log
 
@@ -30,20 +39,50 @@ class DBHandler:
     """
     Třida, která slouží jako rozhraní pro práci s InfluxDB. Používána např. pro pravidelný zápis NAPALM dat do DB nebo pro zjištění stavu stavu jednotlviých DB.
 
+    Args:
+        rate_calculator (CounterRateCalculator): objekt pro výpočet rychlostí rozhraní z kumulativních statistik. Defaultně None (vytvoří se nový).
+        sample_compressor (SampleCompressor): objekt, který rozhoduje, které hodnoty se zapíší do InfluxDB (deadband, change-only, heartbeat). Defaultně None (výchozí politiky).
+        poll_scheduler (AdaptivePollScheduler): objekt, který plánuje interval dotazování jednotlivých zařízení dle vytížení CPU. Defaultně None (všechna zařízení jsou dotazována každých 10 sekund).
+
     Attributes:
         nr_obj (Nornir): Nornir objekt, umožňující volat paralelně nornir úkoly (tasky) a agregovat výsledky z jednotlivých tasků pro daná zařízení.
+        rate_calculator (CounterRateCalculator): objekt, který uchovává předchozí vzorky statistik rozhraní a počítá z nich rychlosti.
+        sample_compressor (SampleCompressor): objekt, který potlačuje zápis nezměněných nebo předvídatelných hodnot do InfluxDB.
+        poll_scheduler (Optional[AdaptivePollScheduler]): objekt, který plánuje dotazování jednotlivých zařízení (None = pevný interval).
+        inventory_index (InventoryIndex): index inventáře - slouží k rychlému výběru zařízení, která jsou na řadě k dotazu.
 
     """
 
-    def __init__(self):
-        self._nr_obj: Nornir = setup_inventory()
+    METRICS_HELP = {"cpu_usage": "CPU usage of the device in percent.",
+                    "uptime": "Device uptime in seconds.",
+                    "interface_rate": "Per-second rate of the interface counter."}
+
+    POLL_INTERVAL = 10
+    ACL_POLL_INTERVAL = 300
 
-    def show_db_state(self, db_conn: InfluxDBClient) -> None:
+    def __init__(self, rate_calculator: CounterRateCalculator = None, sample_compressor: SampleCompressor = None,
+                 poll_scheduler: AdaptivePollScheduler = None):
+        self._nr_obj: Nornir = setup_inventory()
+        self._rate_calculator = rate_calculator or CounterRateCalculator()
+        self._sample_compressor = sample_compressor or SampleCompressor()
+        self._poll_scheduler = poll_scheduler
+        self._inventory_index = InventoryIndex(self._nr_obj)
+
+    def show_db_state(self, db_conn: InfluxDBClient, time_from: str = "now() - 1h", time_to: str = "now()",
+                      hosts: Optional[List[str]] = None, limit: Optional[int] = None, chunk_size: int = 10000,
+                      print_rows: bool = False) -> None:
         """
-        Metoda pro zjištění stavu DB (databáze, measurements, datové body).
+        Metoda pro zjištění stavu DB (databáze, measurements, souhrn datových bodů). Datové body jsou čteny po částech (chunked query)
+        s omezením na časový rozsah, hosty a počet bodů - do paměti se nikdy nenačte celé měření, vypisují se pouze agregované souhrny.
 
         Args:
             db_conn (InfluxDBClient): connection objekt, který slouží jako klient pro připojení k InfluxDB. Dále obsahuje operace pro práci s InfluxDB.
+            time_from (str): začátek časového rozsahu (InfluxQL výraz nebo RFC3339 čas v uvozovkách). Defaultně "now() - 1h".
+            time_to (str): konec časového rozsahu. Defaultně "now()".
+            hosts (Optional[List[str]]): hosti, jejichž data se mají zobrazit. Defaultně None (všichni hosti).
+            limit (Optional[int]): maximální počet datových bodů na měření. Defaultně None (bez omezení).
+            chunk_size (int): počet datových bodů v jedné části odpovědi InfluxDB. Defaultně 10000.
+            print_rows (bool): jestli se mají vypisovat i jednotlivé datové body (průběžně, po částech). Defaultně False.
 
         Returns:
             None
@@ -60,17 +99,71 @@ class DBHandler:
         for measurement in db_conn.get_list_measurements():
             measurement_name = str(measurement['name'])
             print(f"{Fore.GREEN} Measurement: {measurement_name}")
-            query = f"SELECT * FROM {measurement_name};"
-            rs = db_conn.query(query)
-            for row in list(rs.get_points(measurement=measurement_name)):
-                print(row)
+            summary = self._get_measurement_summary(db_conn, measurement_name, time_from, time_to, hosts, limit,
+                                                    chunk_size, print_rows)
+            if not summary:
+                print(f"{Fore.RED} No data points in the specified range.")
+            for (host, field), stats in sorted(summary.items(), key=lambda item: (str(item[0][0]), item[0][1])):  # host může chybět (None)
+                print(f"{host} {field}: count={stats['count']} first=({stats['first_time']}, {stats['first']}) "
+                      f"last=({stats['last_time']}, {stats['last']}) min={stats['min']} max={stats['max']}")
+
+    def _get_measurement_summary(self, db_conn: InfluxDBClient, measurement: str, time_from: str, time_to: str,
+                                 hosts: Optional[List[str]], limit: Optional[int], chunk_size: int,
+                                 print_rows: bool) -> Dict:
+        """
+        Metoda, která po částech (chunked query) načte datové body měření a průběžně počítá souhrn (počet, první/poslední hodnota, min/max)
+        pro každou dvojici host + field. V paměti je vždy pouze jedna část odpovědi.
+
+        Args:
+            db_conn (InfluxDBClient): connection objekt, který slouží jako klient pro připojení k InfluxDB.
+            measurement (str): název InfluxDB měření (measurement).
+            time_from (str): začátek časového rozsahu.
+            time_to (str): konec časového rozsahu.
+            hosts (Optional[List[str]]): filtr hostů (None = všichni hosti).
+            limit (Optional[int]): maximální počet datových bodů (None = bez omezení).
+            chunk_size (int): počet datových bodů v jedné části odpovědi.
+            print_rows (bool): jestli se mají vypisovat jednotlivé datové body.
+
+        Returns:
+            Vrací slovník (host, field) -> souhrn (count, first, first_time, last, last_time, min, max).
+        """
+        query = f'SELECT * FROM "{measurement}" WHERE time >= {time_from} AND time <= {time_to}'
+        if hosts:
+            escaped_hosts = [host.replace("'", "\\'") for host in hosts]
+            hosts_condition = " OR ".join(f"\"host\" = '{host}'" for host in escaped_hosts)
+            query += f" AND ({hosts_condition})"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        summary = {}
+        for result_set in db_conn.query(query, chunked=True, chunk_size=chunk_size):
+            for point in result_set.get_points(measurement=measurement):
+                if print_rows:
+                    print(point)
+                host = point.get("host")
+                for field, value in point.items():
+                    if field in ("time", "host", "interface", "acl", "seq") or value is None:
+                        continue
+                    series = " ".join(str(point[tag]) for tag in ("interface", "acl", "seq") if point.get(tag) is not None)
+                    key = (f"{host} {series}" if series else host, field)
+                    stats = summary.get(key)
+                    if stats is None:
+                        summary[key] = {"count": 1, "first": value, "first_time": point["time"], "last": value,
+                                        "last_time": point["time"], "min": value, "max": value}
+                        continue
+                    stats["count"] += 1
+                    stats["last"] = value
+                    stats["last_time"] = point["time"]
+                    if isinstance(value, (int, float)):
+                        stats["min"] = min(stats["min"], value)
+                        stats["max"] = max(stats["max"], value)
+        return summary
 
     def _get_measurement(self, napalm_key: str) -> str:
         """
         Metoda, která vrací název InfluxDB měření (measurement) dle napalm klíče (podle toho, co zrovna chceme zapsat do DB).
 
         Args:
-            napalm_key (str): napalm klíč (dle použité NAPALM getter funkce)
+            napalm_key (str): napalm klíč (dle použité NAPALM getter funkce), případně acl_hits (počty shod záznamů ACL)
 
         Returns:
             Vrací název InfluxDB měření (measurement).
@@ -79,6 +172,10 @@ class DBHandler:
             return "hw_details"
         elif napalm_key == "facts":
             return "device_facts"
+        elif napalm_key == "interfaces_counters":
+            return "interface_rates"
+        elif napalm_key == "acl_hits":
+            return "acl_hits"
         return ""
 
     def _get_monitored_fields_values(self, napalm_key: str, host_dict: Dict) -> Dict:
@@ -129,28 +226,221 @@ class DBHandler:
         save_message = f"{Fore.GREEN}[{fetch_time_utc}] {host}: Measurement of {measurement} was successfuly saved." if is_saved and fields_dict else f"{Fore.RED}[{fetch_time_utc}] {host}: Measurement of {measurement} was not successfuly saved."
         print(save_message)
 
-    def write_monitored_data(self, db_conn: InfluxDBClient) -> None:
+    def _write_interface_rates_to_db(self, host: str, fetch_time_utc: str, interfaces_rates: Dict[str, Dict[str, float]],
+                                     db_conn: InfluxDBClient) -> None:
+        """
+        Metoda, která zapíše rychlosti všech rozhraní daného hosta do InfluxDB (jedním zápisem, tag interface určuje rozhraní).
+
+        Args:
+            host (str): jméno hosta
+            fetch_time_utc (str): časové razítko (v UTC) - určuje kdy byla získána data pomocí NAPALM getterů.
+            interfaces_rates (Dict[str, Dict[str, float]]): slovník rozhraní -> statistika -> rychlost za sekundu.
+            db_conn (InfluxDBClient): connection objekt, který slouží jako klient pro připojení k InfluxDB. Dále obsahuje operace pro práci s InfluxDB.
+
+        Returns:
+            None
+        """
+        measurement = self._get_measurement("interfaces_counters")
+        json_body = [
+            {
+                "measurement": measurement,
+                "tags": {
+                    "host": f"{host}",
+                    "interface": f"{interface}"
+                },
+                "time": f"{fetch_time_utc}",
+                "fields": fields_dict
+            }
+            for interface, fields_dict in interfaces_rates.items() if fields_dict
+        ]
+        is_saved = db_conn.write_points(json_body) if json_body else False
+        save_message = f"{Fore.GREEN}[{fetch_time_utc}] {host}: Measurement of {measurement} ({len(json_body)} interfaces) was successfuly saved." if is_saved else f"{Fore.RED}[{fetch_time_utc}] {host}: Measurement of {measurement} was not successfuly saved."
+        print(save_message)
+
+    def _write_acl_hits_to_db(self, host: str, fetch_time_utc: str, samples: List[Dict], db_conn: InfluxDBClient) -> None:
         """
-        Metoda, která slouží k pravidélnemu zápisu dat do InfluxDB. Zápis je prováděň v nekonečné smyččce.
+        Metoda, která zapíše počty shod záznamů ACL daného hosta do InfluxDB (jedním zápisem, tagy acl a seq určují záznam).
 
         Args:
+            host (str): jméno hosta
+            fetch_time_utc (str): časové razítko (v UTC) - určuje kdy byly získány počty shod.
+            samples (List[Dict]): vzorky záznamů ACL (viz AclHitCollector.collect_acl_hits).
             db_conn (InfluxDBClient): connection objekt, který slouží jako klient pro připojení k InfluxDB. Dále obsahuje operace pro práci s InfluxDB.
 
         Returns:
             None
         """
+        measurement = self._get_measurement("acl_hits")
+        json_body = [
+            {
+                "measurement": measurement,
+                "tags": {
+                    "host": f"{host}",
+                    "acl": f"{sample['acl']}",
+                    "seq": f"{sample['seq']}"
+                },
+                "time": f"{fetch_time_utc}",
+                "fields": {"hits": sample["hits"], **({"delta": sample["delta"]} if sample["delta"] is not None else {})}
+            }
+            for sample in samples
+        ]
+        is_saved = db_conn.write_points(json_body) if json_body else False
+        save_message = f"{Fore.GREEN}[{fetch_time_utc}] {host}: Measurement of {measurement} ({len(json_body)} ACL entries) was successfuly saved." if is_saved else f"{Fore.RED}[{fetch_time_utc}] {host}: Measurement of {measurement} was not successfuly saved."
+        print(save_message)
+
+    def write_acl_hits_data(self, acl_hit_collector: AclHitCollector, db_conn: Optional[InfluxDBClient] = None,
+                            interval: float = ACL_POLL_INTERVAL) -> None:
+        """
+        Metoda, která slouží k pravidelnému sběru počtů shod záznamů ACL (Cisco routery a L3 switche). Vzorky včetně přírůstků jsou
+        ukládány do lokálního úložiště collectoru (pokud je definováno) a/nebo do InfluxDB. Sběr je prováděn v nekonečné smyčce.
+
+        Args:
+            acl_hit_collector (AclHitCollector): objekt, který čte počty shod a počítá přírůstky od předchozího vzorku.
+            db_conn (Optional[InfluxDBClient]): connection objekt, který slouží jako klient pro připojení k InfluxDB. Defaultně None (do InfluxDB se nezapisuje).
+            interval (float): interval sběru v sekundách. Defaultně ACL_POLL_INTERVAL.
+
+        Returns:
+            None
+        """
+        nornir_devices = self._nr_obj.filter(filter_func=lambda host: host.get("vendor") == "cisco" and
+                                             host.get("dev_type") in ("router", "L3_switch"))
         while True:
-            aggregated_result = self._nr_obj.run(task=napalm_get, name="Get env_details and device facts", getters=["environment", "facts"])
+            aggregated_result = nornir_devices.run(task=acl_hit_collector.collect_acl_hits, name="Get ACL hit counters")
             data_fetch_time_utc = str(datetime.utcnow())
             for host in aggregated_result:
+                if host in aggregated_result.failed_hosts:
+                    print(f"{Fore.RED}[{data_fetch_time_utc}] {host}: Failure during ACL hit counters collection.")
+                elif db_conn is not None:
+                    self._write_acl_hits_to_db(host, data_fetch_time_utc, aggregated_result[host].result["samples"], db_conn)
+            sleep(interval)
+
+    def _update_metrics_store(self, metrics_store: MetricsStore, fields_dict: Dict, labels: Dict[str, str]) -> None:
+        """
+        Metoda, která uloží monitorovaná data do in-memory úložiště posledních hodnot (vystaveno ve formátu Prometheus).
+
+        Args:
+            metrics_store (MetricsStore): úložiště posledních hodnot metrik.
+            fields_dict (Dict): Python slovník, který obsahuje jednotlivé sloupce (s daty) - fields.
+            labels (Dict[str, str]): labely metrik (např. host, interface).
+
+        Returns:
+            None
+        """
+        for field, value in fields_dict.items():
+            if field in self.METRICS_HELP:
+                metrics_store.set(field, value, labels, self.METRICS_HELP[field])
+            else:
+                metrics_store.set("interface_rate", value, {**labels, "counter": field}, self.METRICS_HELP["interface_rate"])
+
+    def write_monitored_data(self, db_conn: Optional[InfluxDBClient] = None, metrics_store: Optional[MetricsStore] = None) -> None:
+        """
+        Metoda, která slouží k pravidélnemu zápisu dat do InfluxDB a/nebo do in-memory úložiště posledních hodnot (MetricsStore), které si
+        stahují scrapery přes MetricsEndpoint. Zápis je prováděň v nekonečné smyččce. Pokud je nastaven poll_scheduler, jsou v každém cyklu
+        dotazována pouze zařízení, která jsou na řadě, a interval každého zařízení se přizpůsobuje vytížení jeho CPU.
+
+        Args:
+            db_conn (Optional[InfluxDBClient]): connection objekt, který slouží jako klient pro připojení k InfluxDB. Defaultně None (do InfluxDB se nezapisuje).
+            metrics_store (Optional[MetricsStore]): úložiště posledních hodnot metrik. Defaultně None (pull endpoint není plněn).
+
+        Raises:
+            ValueError: Výjimka, která nastane, pokud není zadán ani db_conn ani metrics_store.
+
+        Returns:
+            None
+        """
+        if db_conn is None and metrics_store is None:
+            raise ValueError("At least one sink (db_conn or metrics_store) must be defined.")
+        while True:
+            nornir_devices = self._get_devices_to_poll()
+            if nornir_devices is None:
+                sleep(self._get_sleep_time())
+                continue
+            aggregated_result = nornir_devices.run(task=napalm_get, name="Get env_details, device facts and interfaces counters",
+                                                   getters=["environment", "facts", "interfaces_counters"])
+            data_fetch_time_utc = str(datetime.utcnow())
+            data_fetch_timestamp = time()
+            interfaces_counters = {}
+            for host in aggregated_result:
+                if self._poll_scheduler is not None:
+                    self._report_to_scheduler(host, aggregated_result, data_fetch_timestamp)
                 if host not in aggregated_result.failed_hosts:
                     for key, result_dict in aggregated_result[host].result.items():
+                        if key == "interfaces_counters":
+                            interfaces_counters[host] = result_dict
+                            continue
                         measurement = self._get_measurement(key)
                         fields = self._get_monitored_fields_values(key, result_dict)
-                        self._write_to_db(host, measurement, data_fetch_time_utc, fields, db_conn)
+                        if metrics_store is not None:
+                            self._update_metrics_store(metrics_store, fields, {"host": host})
+                        if db_conn is not None:
+                            fields = self._sample_compressor.filter_fields((host, measurement), fields, data_fetch_timestamp)
+                            if fields:
+                                self._write_to_db(host, measurement, data_fetch_time_utc, fields, db_conn)
                 else:
                     print(f"{Fore.RED}[{data_fetch_time_utc}] {host}: Failure during data collection (using NAPALM getters). Device is not probably supported by used NAPALM getter.")
-            sleep(10)
+            # rychlosti rozhraní jsou spočítány vektorově pro všechny hosty najednou (první cyklus pouze uloží vzorky)
+            interfaces_rates = self._rate_calculator.update(interfaces_counters, {host: data_fetch_timestamp for host in interfaces_counters})
+            for host, host_rates in interfaces_rates.items():
+                if metrics_store is not None:
+                    for interface, fields in host_rates.items():
+                        self._update_metrics_store(metrics_store, fields, {"host": host, "interface": interface})
+                if host_rates and db_conn is not None:
+                    rates_measurement = self._get_measurement("interfaces_counters")
+                    host_rates = {interface: self._sample_compressor.filter_fields((host, rates_measurement, interface), fields, data_fetch_timestamp)
+                                  for interface, fields in host_rates.items()}
+                    if any(host_rates.values()):
+                        self._write_interface_rates_to_db(host, data_fetch_time_utc, host_rates, db_conn)
+            if db_conn is not None:
+                totals = self._sample_compressor.get_totals()
+                print(f"[{data_fetch_time_utc}] Written values: {totals['written']}, suppressed values: {totals['suppressed']}.")
+            sleep(self._get_sleep_time())
+
+    def _get_devices_to_poll(self) -> Optional[Nornir]:
+        """
+        Metoda, která vrací zařízení, která se mají v aktuálním cyklu dotázat.
+
+        Returns:
+            Vrací Nornir objekt se zařízeními k dotázání (bez poll_scheduleru všechna zařízení) nebo None, pokud není na řadě žádné zařízení.
+        """
+        if self._poll_scheduler is None:
+            return self._nr_obj
+        now = time()
+        self._poll_scheduler.add_hosts(self._nr_obj.inventory.hosts.keys(), now)
+        due_hosts = self._poll_scheduler.get_due_hosts(now)
+        return self._inventory_index.filter_names(due_hosts) if due_hosts else None
+
+    def _get_sleep_time(self) -> float:
+        """
+        Metoda, která vrací dobu čekání do dalšího cyklu sběru dat.
+
+        Returns:
+            Vrací počet sekund do dalšího cyklu (bez poll_scheduleru pevný interval POLL_INTERVAL).
+        """
+        if self._poll_scheduler is None:
+            return self.POLL_INTERVAL
+        return self._poll_scheduler.time_until_next(time())
+
+    def _report_to_scheduler(self, host: str, aggregated_result: AggregatedResult, timestamp: float) -> None:
+        """
+        Metoda, která předá poll_scheduleru aktuální vytížení CPU hosta (případně neúspěšný sběr dat) a vypíše změnu intervalu dotazování.
+
+        Args:
+            host (str): jméno hosta
+            aggregated_result (AggregatedResult): výsledek NAPALM getterů
+            timestamp (float): čas získání dat (unix timestamp)
+
+        Returns:
+            None
+        """
+        previous_interval = self._poll_scheduler.get_intervals().get(host)
+        if host in aggregated_result.failed_hosts:
+            interval = self._poll_scheduler.report_failure(host, timestamp)
+        else:
+            environment = aggregated_result[host].result.get("environment", {})
+            cpu_usage = self._get_monitored_fields_values("environment", environment).get("cpu_usage")
+            interval = self._poll_scheduler.report(host, cpu_usage, timestamp)
+        if previous_interval is not None and interval != previous_interval:
+            print(f"{Fore.YELLOW}{host}: Polling interval changed from {previous_interval:.1f}s to {interval:.1f}s.")
 
     def drop_db_measurements(self, db_conn: InfluxDBClient, measurements: List[str]) -> None:
         """
@@ -179,8 +469,24 @@ if __name__ == '__main__':
     # Zápis dat do databáze - nekonečná smyčka, nutno zakomentovat pokud chcete zobrazit stav DB
     db_writer.write_monitored_data(db_nornir_conn)
 
+    # Pull-based alternativa (Prometheus formát) - poslední hodnoty jsou dostupné na http://<server>:9100/metrics, InfluxDB je volitelný
+    #from modules.utility.metrics_endpoint import MetricsEndpoint
+    #metrics_store = MetricsStore()
+    #MetricsEndpoint(metrics_store, port=9100).start()
+    #db_writer.write_monitored_data(metrics_store=metrics_store)
+
+    # Adaptivní interval dotazování (5 - 120 s) dle vytížení CPU jednotlivých zařízení
+    #db_writer = DBHandler(poll_scheduler=AdaptivePollScheduler(min_interval=5, max_interval=120))
+    #db_writer.write_monitored_data(db_nornir_conn)
+
+    # Počty shod záznamů ACL (časová řada v lokálním úložišti i InfluxDB) - nekonečná smyčka
+    #from pathlib import Path
+    #from modules.utility.snapshot_store import SnapshotStore
+    #acl_hit_collector = AclHitCollector(SnapshotStore(Path(Path.cwd() / "export" / "snapshots.sqlite")))
+    #db_writer.write_acl_hits_data(acl_hit_collector, db_nornir_conn)
+
     #Smazat všechna měření jednotlivých databází
-    #db_writer.drop_db_measurements(db_nornir_conn, ['hw_details', 'device_facts'])
+    #db_writer.drop_db_measurements(db_nornir_conn, ['hw_details', 'device_facts', 'interface_rates', 'acl_hits'])
     #db_writer.drop_db_measurements(db_ansible_conn, ['hw_details', 'device_facts'])
     #db_writer.drop_db_measurements(db_telegraf_conn, ['cpu', 'system'])
 
@@ -188,7 +494,7 @@ if __name__ == '__main__':
     #print_title("Ansible DB info")
     #db_writer.show_db_state(db_ansible_conn)
     #print_title("Nornir DB info ")
-    #db_writer.show_db_state(db_nornir_conn)
+    #db_writer.show_db_state(db_nornir_conn, time_from="now() - 7d", hosts=["R1", "MLS1"])
     #print_title("Telegraf DB info ")
     #db_writer.show_db_state(db_telegraf_conn)
 
@@ -1,11 +1,13 @@
 import datetime
 import time
+from pathlib import Path
 
 from colorama import Fore
 from nornir import InitNornir
 from nornir.core import Nornir
 from nornir.core.exceptions import NornirSubTaskError, NornirExecutionError
 from nornir.core.filter import F
+from nornir.core.task import Task
 from nornir_netmiko import netmiko_send_command
 from nornir_utils.plugins.functions import print_result, print_title
 from modules.tasks.delete_configuration import DeleteConfiguration
@@ -16,10 +18,22 @@ from modules.tasks.nat_configuration import NATConfiguration
 from modules.tasks.ospf_configuration import OSPFConfiguration
 from modules.tasks.packet_filter_configuration import PacketFilterConfiguration
 from modules.tasks.static_configuration import StaticRoutingConfiguration
+from modules.utility.acl_hit_collector import AclHitCollector
+from modules.utility.command_cache import CommandCache
+from modules.utility.connection_prewarmer import ConnectionPrewarmer
+from modules.utility.counter_rate_calculator import CounterRateCalculator
 from modules.utility.credential_handler import CredentialHandler
+from modules.utility.export_writer import ExportWriter
+from modules.utility.log_pipeline import setup_log_pipeline
+from modules.utility.inventory_index import InventoryIndex
 from modules.utility.network_info_collector import NetworkInfoCollector
 from modules.utility.network_info_exporter import NetworkInfoExporter
 from modules.utility.network_info_viewer import NetworkUtilityViewer
+from modules.utility.ordered_output import OrderedOutputProcessor
+from modules.utility.result_spooler import StreamingResultProcessor
+from modules.utility.snapshot_store import SnapshotStore
+from modules.utility.task_deadline import TaskDeadline
+from modules.utility.task_retry import CircuitBreaker, ResilientTaskRunner, RetryPolicy
 
 
 def setup_inventory() -> Nornir:
@@ -29,6 +43,7 @@ def setup_inventory() -> Nornir:
     Returns:
         Nornir - nornir objekt, který obsahuje zparsované informace o hostech, skupinách. Dále zajišťuje multithreading funkcionalitu.
     """
+    setup_log_pipeline()  # logování nornir přes frontu (config.yml - logging: enabled: False)
     nr = InitNornir(config_file="config.yml")  # Nornir objekt, který přeskočí zařízení, které nezvládly požadovaný (sub)task. více o chybě v nornir.log
 
     # Nornir objekt, který zastavení všechny následující tasky, v případě, že došlo k chybě u tasku předchozího.
@@ -38,7 +53,8 @@ def setup_inventory() -> Nornir:
     return nr
 
 
-def configure_network_devices(nornir_devices: Nornir, task_func: callable, task_name: str, dry_run: bool) -> None:
+def configure_network_devices(nornir_devices: Nornir, task_func: callable, task_name: str, dry_run: bool,
+                              task_runner: ResilientTaskRunner = None) -> None:
     """
     Wrapper funkce, která slouží pro konfiguraci síťových zařízení (routerů, switchů). Funkce obaluje specifikovaný nornir úkol (task_func), který se týká konfigurace síťových prvků.
 
@@ -48,13 +64,33 @@ def configure_network_devices(nornir_devices: Nornir, task_func: callable, task_
         task_name (str): Název nornir úkolu
         dry_run (bool): argument, který rozhoduje, jestli má být konfigurace provedena v testovacím režimu
                             (obdržení konečných změn v konfiguraci bez jejich uložení do zařízení) - True. Defaultně False - uložení konečných změn.
+        task_runner (ResilientTaskRunner): objekt, který úkol při přechodné chybě opakuje a přeskakuje opakovaně selhávající zařízení (circuit breaker).
+                                           Defaultně None (úkol je spuštěn přímo, bez opakování).
     Returns:
         None
     """
-    result = nornir_devices.run(task=task_func, name=task_name, dry_run=dry_run)
+    if task_runner is not None:
+        result = task_runner.run(nornir_devices, task_func, name=task_name, dry_run=dry_run)
+    else:
+        result = nornir_devices.run(task=task_func, name=task_name, dry_run=dry_run)
     print_result(result)
 
 
+def export_device_configuration_shard(task: Task) -> None:
+    """
+    Nornir úkol pro ShardedRunner - export running konfigurace v pracovním procesu. Úkol musí jít serializovat pomocí pickle,
+    proto nelze předat metodu sdíleného exportéru (obsahuje spojení s SQLite úložištěm, zámky a zapisovací vlákno) - exportér
+    je vytvořen až v pracovním procesu.
+
+    Args:
+        task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
+
+    Returns:
+        None
+    """
+    NetworkInfoExporter(NetworkInfoCollector()).export_device_configuration(task)
+
+
 def main() -> None:
     """
     Hlavní funkce skriptu, která se zavolá po spuštění skriptu main.py
@@ -62,66 +98,102 @@ def main() -> None:
     Returns:
         None
     """
-    # Parsování inventáře
-    nornir_obj = setup_inventory()
-
-    # Filtrování Nornir objektů
-    routers = nornir_obj.filter(F(dev_type="router"))
-    juniper_devices = nornir_obj.filter(F(groups__contains="juniper"))
-    l3_switches = nornir_obj.filter(F(dev_type="L3_switch"))
-    cisco_routers = nornir_obj.filter(F(groups__contains="cisco") & F(dev_type="router"))
-    l3_cisco = nornir_obj.filter(F(groups__contains="cisco") & F(dev_type="router") | F(dev_type="L3_switch"))
-    l3_devices = nornir_obj.filter(F(dev_type="router") | F(dev_type="L3_switch"))
-    ubuntu_servers = nornir_obj.filter(F(dev_type="ubuntu_server") | F(groups__contains="linux"))
-    mls1 = nornir_obj.filter(F(name__contains="MLS1"))
-    mls1_r3 = nornir_obj.filter(F(name__contains="MLS1") | F(name__contains="R3"))
-
-    viewer = NetworkUtilityViewer()
-    exporter = NetworkInfoExporter(NetworkInfoCollector())
-
-    # Inicializace Configuration objektů
-    ospf_config = OSPFConfiguration()
-    eigrp_config = EIGRPConfiguration()
-    static_routing_config = StaticRoutingConfiguration()
-    interfaces_configuration = InterfacesConfiguration()
-    packet_filter = PacketFilterConfiguration()
-    linux_config = LinuxConfiguration()
-    nat_config = NATConfiguration()
-    delete_config = DeleteConfiguration()
-    static_routing_config = StaticRoutingConfiguration()
-
-    # Příklady konfigurace síťových zařízení
-    configure_network_devices(l3_devices, interfaces_configuration.configure_ipv4_interfaces, "IPv4 interfaces config",dry_run=False)
-    configure_network_devices(l3_devices, interfaces_configuration.configure_ipv6_interfaces, "IPv6 interfaces config",dry_run=False)
-    configure_network_devices(l3_switches, interfaces_configuration.configure_switching_interfaces,"Switching interfaces config", dry_run=False)
-    configure_network_devices(routers, ospf_config.configure_ospf, "OSPFv2 config", dry_run=False)
-    configure_network_devices(routers, ospf_config.configure_ospfv3, "OSPFv3 config", dry_run=False)
-    configure_network_devices(mls1_r3, eigrp_config.configure_eigrp_ipv4, "EIGRP config", dry_run=False)
-    configure_network_devices(mls1_r3, eigrp_config.configure_eigrp_ipv6, "EIGRP IPV6 config", dry_run=False)
-    configure_network_devices(mls1, packet_filter.configure_ipv4_packet_filters, "IPv4 packet filter config",dry_run=False)
-    configure_network_devices(mls1, packet_filter.configure_ipv6_packet_filters, "IPv6 packet filter config",dry_run=False)
-
-    # Mazání konfigurace
-    # configure_network_devices(l3_devices, delete_config.delete_configuration, "Delete Configuration", dry_run=False)
-
-    # Sběr a výpis dat
-    l3_switches.run(task=viewer.show_vlans, json_out=False)
-    l3_switches.run(task=viewer.show_vlans, json_out=True)
-    l3_devices.run(task=viewer.show_ospf_neighbors, ipv6=True)
-
-    # Export dat
-    l3_devices.run(task=exporter.export_device_configuration)
-    l3_devices.run(task=exporter.export_packet_filter_info)
-    l3_devices.run(task=exporter.export_ipv4_routes)
-    l3_devices.run(task=exporter.export_ipv6_routes)
-
-    # Tvorba Excel reportů
-    exporter.export_device_facts(l3_devices)
-    exporter.export_interfaces_packet_counters(l3_devices)
+    # Parsování inventáře a paralelní otevření všech spojení (nedostupná zařízení jsou vyřazena z dalších úkolů)
+    nornir_obj = ConnectionPrewarmer().prewarm(setup_inventory())
+
+    # Filtrování Nornir objektů (vyhodnoceno nad indexem inventáře - množinové operace místo průchodu všemi hosty)
+    inventory_index = InventoryIndex(nornir_obj)
+    routers = inventory_index.filter(F(dev_type="router"))
+    juniper_devices = inventory_index.filter(F(groups__contains="juniper"))
+    l3_switches = inventory_index.filter(F(dev_type="L3_switch"))
+    cisco_routers = inventory_index.filter(F(groups__contains="cisco") & F(dev_type="router"))
+    l3_cisco = inventory_index.filter(F(groups__contains="cisco") & F(dev_type="router") | F(dev_type="L3_switch"))
+    l3_devices = inventory_index.filter(F(dev_type="router") | F(dev_type="L3_switch"))
+    ubuntu_servers = inventory_index.filter(F(dev_type="ubuntu_server") | F(groups__contains="linux"))
+    mls1 = inventory_index.filter(F(name__contains="MLS1"))
+    mls1_r3 = inventory_index.filter(F(name__contains="MLS1") | F(name__contains="R3"))
+
+    command_cache = CommandCache(ttl=300)  # sdílená mezipaměť show příkazů - např. "show route" u Juniper routerů se čte pouze jednou
+    viewer = NetworkUtilityViewer(command_cache=command_cache)
+    snapshot_store = SnapshotStore(Path(Path.cwd() / "export" / "snapshots.sqlite"))  # lokální úložiště všech exportovaných dat
+    export_writer = ExportWriter(compression=None)  # asynchronní atomický zápis exportů (compression="gzip"/"zstd" pro komprimované exporty)
+    try:
+        exporter = NetworkInfoExporter(NetworkInfoCollector(), snapshot_store, command_cache=command_cache, export_writer=export_writer)
+
+        # Inicializace Configuration objektů
+        ospf_config = OSPFConfiguration()
+        eigrp_config = EIGRPConfiguration()
+        static_routing_config = StaticRoutingConfiguration()
+        interfaces_configuration = InterfacesConfiguration()
+        packet_filter = PacketFilterConfiguration()
+        linux_config = LinuxConfiguration()
+        nat_config = NATConfiguration()
+        delete_config = DeleteConfiguration()
+        static_routing_config = StaticRoutingConfiguration()
+
+        # Opakování přechodných chyb (exponenciální backoff s jitterem), přeskakování opakovaně selhávajících zařízení
+        # a deadline každého pokusu (visící zařízení neblokuje pracovní vlákno déle než deadline)
+        task_runner = ResilientTaskRunner(policies={"IPv4 packet filter config": RetryPolicy(max_attempts=2),
+                                                    "IPv6 packet filter config": RetryPolicy(max_attempts=2)},
+                                          default_policy=RetryPolicy(max_attempts=3, base_delay=2, max_delay=30),
+                                          circuit_breaker=CircuitBreaker(failure_threshold=2, cooldown=600),
+                                          deadline=TaskDeadline(deadlines={"Switching interfaces config": 300}, default_deadline=180))
+
+        # Příklady konfigurace síťových zařízení
+        configure_network_devices(l3_devices, interfaces_configuration.configure_ipv4_interfaces, "IPv4 interfaces config",dry_run=False, task_runner=task_runner)
+        configure_network_devices(l3_devices, interfaces_configuration.configure_ipv6_interfaces, "IPv6 interfaces config",dry_run=False, task_runner=task_runner)
+        configure_network_devices(l3_switches, interfaces_configuration.configure_switching_interfaces,"Switching interfaces config", dry_run=False, task_runner=task_runner)
+        configure_network_devices(routers, ospf_config.configure_ospf, "OSPFv2 config", dry_run=False, task_runner=task_runner)
+        configure_network_devices(routers, ospf_config.configure_ospfv3, "OSPFv3 config", dry_run=False, task_runner=task_runner)
+        configure_network_devices(mls1_r3, eigrp_config.configure_eigrp_ipv4, "EIGRP config", dry_run=False, task_runner=task_runner)
+        configure_network_devices(mls1_r3, eigrp_config.configure_eigrp_ipv6, "EIGRP IPV6 config", dry_run=False, task_runner=task_runner)
+        configure_network_devices(mls1, packet_filter.configure_ipv4_packet_filters, "IPv4 packet filter config",dry_run=False, task_runner=task_runner)
+        configure_network_devices(mls1, packet_filter.configure_ipv6_packet_filters, "IPv6 packet filter config",dry_run=False, task_runner=task_runner)
+
+        # Mazání konfigurace
+        # configure_network_devices(l3_devices, delete_config.delete_configuration, "Delete Configuration", dry_run=False)
+
+        # Sběr a výpis dat - výstup každého hosta je vypsán najednou po jeho dokončení (v pořadí inventáře)
+        l3_switches.with_processors([OrderedOutputProcessor(order="inventory")]).run(task=viewer.show_vlans, json_out=False)
+        l3_switches.with_processors([OrderedOutputProcessor(order="inventory")]).run(task=viewer.show_vlans, json_out=True)
+        l3_devices.with_processors([OrderedOutputProcessor(order="inventory")]).run(task=viewer.show_ospf_neighbors, ipv6=True)
+        # Strojově zpracovatelný výstup (jeden JSON řádek na hosta), např. python main.py | jq
+        # l3_devices.with_processors([OrderedOutputProcessor(ndjson=True)]).run(task=viewer.show_device_facts, json_out=True)
+
+        # Export dat - velká data výsledků (running konfigurace atd.) jsou po dokončení každého hosta uložena na disk (v paměti zůstává pouze reference)
+        l3_devices_streamed = l3_devices.with_processors([StreamingResultProcessor(Path(Path.cwd() / "export" / "spool"))])
+        l3_devices_streamed.run(task=exporter.export_device_configuration)
+        l3_devices_streamed.run(task=exporter.export_packet_filter_info)
+        l3_devices.run(task=exporter.export_packet_filter_analysis)  # zastíněné/nadbytečné záznamy ACL (výstup show příkazu je v mezipaměti)
+        # Vzorek počtů shod záznamů ACL (časová řada v lokálním úložišti) a záznamy bez shody za posledních 30 dní - kandidáti na odstranění
+        acl_hit_collector = AclHitCollector(snapshot_store)
+        mls1.run(task=acl_hit_collector.collect_acl_hits)
+        acl_hit_collector.print_unused_report(acl_hit_collector.get_unused_entries(datetime.timedelta(days=30)), datetime.timedelta(days=30))
+        l3_devices_streamed.run(task=exporter.export_ipv4_routes)
+        l3_devices_streamed.run(task=exporter.export_ipv6_routes)
+        l3_switches.run(task=exporter.export_vlans)
+        l3_devices.run(task=exporter.export_napalm_getters_json, getters=["interfaces_ip", "interfaces_counters"])
+
+        # Export dat ve více procesech (inventář rozdělen do shardů, každý proces má vlastní Nornir objekt a spojení)
+        # from modules.utility.sharded_runner import ShardedRunner
+        # sharded_runner = ShardedRunner(setup_inventory, num_processes=4)
+        # print_result(sharded_runner.run(l3_devices, task=export_device_configuration_shard))
+
+        # Tvorba Excel reportů
+        exporter.export_device_facts(l3_devices)
+        exporter.export_interfaces_packet_counters(l3_devices)
+        exporter.export_interfaces_packet_rates(l3_devices, CounterRateCalculator(), samples=2, interval=10)
+
+        # Opětovné vygenerování exportů (.txt, .conf, .xlsx) z lokálního úložiště - bez připojení k zařízením
+        # exporter.export_snapshot_views()
+    finally:
+        export_writer.close()  # zápis zbývajících exportů a souhrn (počet souborů, objem dat) i v případě výjimky (vlákno zapisovače je daemon)
+        export_writer.print_report()
 
     # Konfigurace Ubuntu serveru
-    ubuntu_servers.run(task=linux_config.send_commands, enable=True)
-    ubuntu_servers.run(task=linux_config.configure_vsftpd, enable=True)
+    ubuntu_servers_ordered = ubuntu_servers.with_processors([OrderedOutputProcessor()])
+    ubuntu_servers_ordered.run(task=linux_config.send_commands, enable=True)
+    ubuntu_servers_ordered.run(task=linux_config.configure_vsftpd, enable=True)
 
 
 if __name__ == "__main__":
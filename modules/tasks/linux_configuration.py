@@ -1,23 +1,32 @@
+import base64
+import hashlib
 import logging
-from pathlib import Path
-from typing import List, Dict, Union
+import posixpath
+import re
+import shlex
+import uuid
+from io import BytesIO
+from typing import List, Dict, Optional, Union
 from colorama import Fore
 from nornir.core import Task
 from nornir.core.exceptions import NornirSubTaskError
+from nornir.core.task import Result
 from nornir_jinja2.plugins.tasks import template_file
-from nornir_netmiko import netmiko_send_command, netmiko_file_transfer
+from nornir_netmiko import netmiko_send_command
 from nornir_utils.plugins.functions import print_result, print_title
 from nornir_utils.plugins.tasks.data import load_yaml
 
-from modules.utility.text_file_exporter import FileExporter
-
 
 class LinuxConfiguration:
     """
     Třída pro konfigurování Linux serverů. Konfigurace VSFTPD implementována pouze pro linuxovou distribuci Ubuntu (18.04).
     """
 
-    def send_commands(self, task: Task, commands: List[str] = None, enable: bool = False) -> None:
+    SCRIPT_MARKER = "__NR_"
+    SCRIPT_CHUNK_SIZE = 1000  # délka řádku s částí skriptu (base64) - výrazně pod limitem terminálu (4096 znaků)
+    VSFTPD_CONF_FILE = "/etc/vsftpd.conf"
+
+    def send_commands(self, task: Task, commands: List[str] = None, enable: bool = False, batched: bool = True) -> None:
         """
         Metoda, která slouží pro vykonání příkazů linuxovými servery pomocí knihovny Netmiko.
 
@@ -25,6 +34,8 @@ class LinuxConfiguration:
             task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
             commands (List[str]): Příkazy, které budou provedeny. Defaultně None (příkazy jsou obdrženy z inventáře).
             enable (bool): Argument, kterým lze specifikovat, jestli je nutný pro daný nornir úkol práv superuživatele (rootu). Defaultně je nastaveno na True (root práva).
+            batched (bool): jestli se mají příkazy provést najednou jako jeden skript (True - vrací stdout, stderr a návratový kód každého příkazu)
+                            nebo jednotlivě (False - jeden netmiko_send_command na příkaz). Defaultně True.
 
         Raises:
             NornirSubTaskError: Výjimka, která nastane, pokud nastana chyba v nornir úkolu nebo pokud provádíte
@@ -40,14 +51,14 @@ class LinuxConfiguration:
                 commands_key = "commands"
                 if commands_key in data[0].result:
                     commands = data[0].result[commands_key]
-                    print_title(f"Device {task.host.name}:")
-                    for command in commands:
-                        res = task.run(task=netmiko_send_command, command_string=command, enable=enable)
-                        print(res[0].result)
                 else:
                     print(f"{Fore.RED}Device {task.host.name}: Command list is empty.")
+                    return
+            print_title(f"Device {task.host.name}:")
+            if batched:
+                res = task.run(task=self.run_script, commands=commands, enable=enable)
+                self._print_script_results(res[0].result)
             else:
-                print_title(f"Device {task.host.name}:")
                 for command in commands:
                     res = task.run(task=netmiko_send_command, command_string=command, enable=enable)
                     print(res[0].result)
@@ -55,13 +66,199 @@ class LinuxConfiguration:
             print(f"{Fore.RED}Device {task.host.name}: invalid device type.")
             raise NornirSubTaskError("Invalid device type. Only Linux servers are supported.", task)
 
-    def configure_vsftpd(self, task: Task, enable: bool = True) -> None:
+    def run_script(self, task: Task, commands: List[str], enable: bool = False, read_timeout: float = 300) -> Result:
+        """
+        Nornir úkol, který provede všechny příkazy najednou jako jeden skript (jeden netmiko_send_command, bez detekce promptu po každém příkazu).
+        Skript je na server přenesen v base64 (příkazy tak nejsou interpretovány interaktivním shellem) a každý příkaz je ve výstupu ohraničen
+        značkami, podle kterých je výstup rozdělen na stdout, stderr a návratový kód jednotlivých příkazů.
+
+        Args:
+            task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
+            commands (List[str]): příkazy, které budou provedeny
+            enable (bool): jestli se mají příkazy provést s právy superuživatele (rootu). Defaultně False.
+            read_timeout (float): maximální doba běhu celého skriptu (v sekundách). Defaultně 300.
+
+        Returns:
+            Vrací Result objekt s listem slovníků (command, stdout, stderr, exit_status) - jeden slovník na příkaz.
+            Příkazy, jejichž výsledek nebyl nalezen (např. ukončení shellu příkazem exit), mají exit_status None.
+        """
+        res = task.run(task=netmiko_send_command, name="Run batched script", command_string=self._build_script(commands),
+                       enable=enable, expect_string=rf"{self.SCRIPT_MARKER}DONE__", read_timeout=read_timeout,
+                       cmd_verify=False, strip_prompt=False, strip_command=False, severity_level=logging.DEBUG)
+        return Result(host=task.host, result=self._parse_script_output(commands, res[0].result))
+
+    def _build_script(self, commands: List[str]) -> str:
+        """
+        Metoda, která z příkazů vytvoří skript a vrací řádky, které skript přenesou na server (base64 po částech) a spustí jej.
+        Značky jsou vypisovány přes printf s argumenty, takže se v echu odeslaných řádků nikdy nevyskytují v celé podobě.
+
+        Args:
+            commands (List[str]): příkazy, které budou provedeny
+
+        Returns:
+            Vrací řádky pro interaktivní shell (oddělené znakem nového řádku).
+        """
+        marker = self.SCRIPT_MARKER
+        script_lines = ['__nr_err=$(mktemp)']
+        for position, command in enumerate(commands):
+            script_lines.append(f"printf '\\n{marker}%s_%d__\\n' BEGIN {position}")
+            script_lines.append(f'{{\n{command}\n}} 2>"$__nr_err"')
+            script_lines.append('__nr_rc=$?')
+            script_lines.append(f"printf '\\n{marker}%s_%d__\\n' STDERR {position}")
+            script_lines.append('cat "$__nr_err"')
+            script_lines.append(f"printf '\\n{marker}%s_%d_%d__\\n' END {position} \"$__nr_rc\"")
+        script_lines.append('rm -f "$__nr_err"')
+        encoded = base64.b64encode("\n".join(script_lines).encode("utf-8")).decode("ascii")
+
+        lines = ['__nr_script=$(mktemp)']
+        for start in range(0, len(encoded), self.SCRIPT_CHUNK_SIZE):
+            lines.append(f"printf '%s' '{encoded[start:start + self.SCRIPT_CHUNK_SIZE]}' >> \"$__nr_script\"")
+        lines.append(f'base64 -d "$__nr_script" > "$__nr_script.sh"; bash "$__nr_script.sh"; '
+                     f'rm -f "$__nr_script" "$__nr_script.sh"; printf \'{marker}%s__\\n\' DONE')
+        return "\n".join(lines)
+
+    def _parse_script_output(self, commands: List[str], output: str) -> List[Dict[str, Union[str, int, None]]]:
+        """
+        Metoda, která rozdělí výstup skriptu na stdout, stderr a návratový kód jednotlivých příkazů.
+
+        Args:
+            commands (List[str]): provedené příkazy
+            output (str): výstup skriptu
+
+        Returns:
+            Vrací list slovníků (command, stdout, stderr, exit_status) ve stejném pořadí jako commands.
+        """
+        marker = re.escape(self.SCRIPT_MARKER)
+        pattern = re.compile(rf"{marker}BEGIN_(\d+)__\n(.*?)\n{marker}STDERR_\1__\n(.*?)\n{marker}END_\1_(\d+)__", re.DOTALL)
+        parsed = {int(match.group(1)): match for match in pattern.finditer(output.replace("\r\n", "\n"))}
+        results = []
+        for position, command in enumerate(commands):
+            match = parsed.get(position)
+            results.append({"command": command,
+                            "stdout": match.group(2).rstrip("\n") if match else "",
+                            "stderr": match.group(3).rstrip("\n") if match else "",
+                            "exit_status": int(match.group(4)) if match else None})
+        return results
+
+    def _print_script_results(self, results: List[Dict[str, Union[str, int, None]]]) -> None:
+        """
+        Metoda, která vypíše výsledky příkazů skriptu (stdout, u neúspěšných příkazů i stderr a návratový kód).
+
+        Args:
+            results (List[Dict[str, Union[str, int, None]]]): výsledky příkazů (command, stdout, stderr, exit_status)
+
+        Returns:
+            None
+        """
+        for result in results:
+            if result["stdout"]:
+                print(result["stdout"])
+            if result["exit_status"] != 0:
+                status = "not executed" if result["exit_status"] is None else f"exit status {result['exit_status']}"
+                print(f"{Fore.RED}{result['command']}: {status}{' - ' + result['stderr'] if result['stderr'] else ''}")
+
+    def push_file(self, task: Task, content: str, dest_file: str, owner: str = "root", group: str = "root",
+                  mode: str = "0644", enable: bool = True,
+                  probe: Optional[Dict[str, Union[str, int, None]]] = None) -> Result:
+        """
+        Nornir úkol, který nejprve jedním příkazem zjistí kontrolní součet (sha256), vlastníka, skupinu a práva cílového souboru.
+        Pokud se shodují s přenášeným obsahem, přenos je přeskočen (Result.changed=False). V opačném případě přenese obsah souboru přímo z paměti na server (SFTP kanál v rámci již otevřeného Netmiko SSH spojení)
+        do unikátního dočasného souboru a jedním příkazem jej umístí na cílovou cestu i s vlastníkem a právy. Soubor je nejprve
+        nainstalován vedle cílového souboru a poté přejmenován (mv), takže cílový soubor je nahrazen atomicky. Žádný sdílený soubor
+        na disku řídicího stroje se nevytváří, úkol je tak bezpečný i při paralelním běhu na více hostech.
+
+        Args:
+            task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
+            content (str): obsah souboru
+            dest_file (str): absolutní cesta k cílovému souboru na serveru
+            owner (str): vlastník cílového souboru. Defaultně root.
+            group (str): skupina cílového souboru. Defaultně root.
+            mode (str): práva cílového souboru. Defaultně 0644.
+            enable (bool): jestli se má soubor umístit s právy superuživatele (rootu). Defaultně True.
+            probe (Optional[Dict[str, Union[str, int, None]]]): výsledek příkazu probe_command(dest_file), který byl proveden
+                v rámci předchozího skriptu (run_script). Defaultně None (kontrolní součet zjistí úkol samostatným příkazem).
+
+        Returns:
+            Vrací Result objekt s cestou k cílovému souboru (changed=True, pokud byl soubor přenesen). Úkol je neúspěšný, pokud se soubor nepodařilo umístit.
+        """
+        data = content.encode("utf-8")
+        if probe is None:
+            res = task.run(task=self.run_script, name="Probe file checksum", commands=[self.probe_command(dest_file)],
+                           enable=enable, severity_level=logging.DEBUG)
+            probe = res[0].result[0]
+        if self._is_file_up_to_date(probe, data, owner, group, mode):
+            return Result(host=task.host, result=dest_file, changed=False)
+
+        tmp_file = f"/tmp/.nr_{task.host.name}_{uuid.uuid4().hex}"
+        conn = task.host.get_connection("netmiko", task.nornir.config)
+        sftp = conn.remote_conn_pre.open_sftp()
+        try:
+            sftp.putfo(BytesIO(data), tmp_file)
+        finally:
+            sftp.close()
+
+        dest_dir, dest_name = posixpath.split(dest_file)
+        staged_file = posixpath.join(dest_dir, f".{dest_name}.nr_tmp")
+        command = (f"install -o {shlex.quote(owner)} -g {shlex.quote(group)} -m {shlex.quote(mode)} "
+                   f"{shlex.quote(tmp_file)} {shlex.quote(staged_file)} && "
+                   f"mv -f {shlex.quote(staged_file)} {shlex.quote(dest_file)}; "
+                   f"__nr_rc=$?; rm -f {shlex.quote(tmp_file)}; (exit $__nr_rc)")
+        res = task.run(task=self.run_script, name="Place file", commands=[command], enable=enable, severity_level=logging.DEBUG)
+        placed = res[0].result[0]
+        if placed["exit_status"] != 0:
+            print(f"{Fore.RED}Device {task.host.name}: placing {dest_file} failed - {placed['stderr']}")
+        return Result(host=task.host, result=dest_file, changed=placed["exit_status"] == 0, failed=placed["exit_status"] != 0)
+
+    def probe_command(self, dest_file: str) -> str:
+        """
+        Metoda, která vrací příkaz, který zjistí kontrolní součet (sha256), vlastníka, skupinu a práva souboru na serveru.
+        Příkaz lze přidat na konec jiného skriptu (run_script) a jeho výsledek předat do push_file (bez další výměny se serverem).
+
+        Args:
+            dest_file (str): absolutní cesta k souboru na serveru
+
+        Returns:
+            Vrací příkaz pro shell.
+        """
+        return f"sha256sum {shlex.quote(dest_file)} && stat -c '%U %G %a' {shlex.quote(dest_file)}"
+
+    def _is_file_up_to_date(self, probe: Dict[str, Union[str, int, None]], data: bytes, owner: str, group: str,
+                            mode: str) -> bool:
+        """
+        Metoda, která porovná výsledek příkazu probe_command s přenášeným obsahem a požadovanými atributy.
+
+        Args:
+            probe (Dict[str, Union[str, int, None]]): výsledek příkazu probe_command (command, stdout, stderr, exit_status)
+            data (bytes): přenášený obsah souboru
+            owner (str): požadovaný vlastník
+            group (str): požadovaná skupina
+            mode (str): požadovaná práva (osmičkově)
+
+        Returns:
+            Vrací True, pokud soubor na serveru existuje a shoduje se obsahem i atributy, jinak False.
+        """
+        if probe["exit_status"] != 0:
+            return False  # soubor neexistuje (nebo jej nelze přečíst)
+        lines = probe["stdout"].split("\n")
+        if len(lines) != 2:
+            return False
+        remote_checksum = lines[0].split(" ", 1)[0]
+        remote_owner, remote_group, remote_mode = (lines[1].split() + ["", "", "0"])[:3]
+        return (remote_checksum == hashlib.sha256(data).hexdigest() and (remote_owner, remote_group) == (owner, group)
+                and int(remote_mode, 8) == int(mode, 8))
+
+    def configure_vsftpd(self, task: Task, enable: bool = True, batched: bool = True) -> None:
         """
         Metoda, která slouží pro konfiguraci vsftpd serveru (S)FTP.
 
         Args:
             task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
             enable (bool): Argument, kterým lze specifikovat, jestli je nutný pro daný nornir úkol práv superuživatele (rootu). Defaultně je nastaveno na True (root práva).
+            batched (bool): jestli se mají příkazy mezi přenosy konfigurace provést najednou jako jeden skript (True) nebo jednotlivě (False). Defaultně True.
+
+        Příkazy z klíče on_change (např. restart služby) jsou provedeny pouze tehdy, pokud se vsftpd.conf na serveru změnil.
+        Při dávkovém provedení je kontrolní součet vsftpd.conf zjištěn v rámci skriptu před přenosem (bez další výměny se serverem).
+        Příkazy v host datech musí být idempotentní (mkdir -p apod.) - provádí se při každém spuštění.
 
         Raises:
             NornirSubTaskError: Výjimka, která nastane, pokud nastana chyba v nornir úkolu nebo pokud provádíte
@@ -86,20 +283,38 @@ class LinuxConfiguration:
                              path=f"templates/{task.host['vendor']}/{task.host['dev_type']}",
                              severity_level=logging.DEBUG)
                 if not r.failed:
-                    file_path = Path(Path.cwd() / 'export' / "configuration" / "vsftpd.conf")
-                    exporter = FileExporter(file_path, content=r.result)
-                    exporter.export_to_file()
-                    for command in commands:
+                    changed = False
+                    batch = []
+                    probe = None
+                    for command in commands + [None]:
+                        if batched and command not in ("scp", None):
+                            batch.append(command)
+                            continue
+                        if batch:
+                            if command == "scp":
+                                batch.append(self.probe_command(self.VSFTPD_CONF_FILE))
+                            res = task.run(task=self.run_script, commands=batch, enable=enable, severity_level=logging.DEBUG)
+                            results = res[0].result
+                            probe = results.pop() if command == "scp" else None
+                            self._print_script_results([result for result in results if result["exit_status"] != 0])
+                            batch = []
+                        if command is None:
+                            break
                         if command == "scp":
-                            task.run(task=netmiko_file_transfer, source_file=file_path, dest_file=f"{file_path.name}",
-                                     severity_level=logging.DEBUG)
-                            task.run(task=netmiko_send_command, command_string=f"mv /var/tmp/vsftpd.conf /etc/",
-                                     enable=enable, severity_level=logging.DEBUG)
-                            task.run(task=netmiko_send_command, command_string=f"chown root:root /etc/vsftpd.conf",
-                                     enable=enable, severity_level=logging.DEBUG)
+                            pushed = task.run(task=self.push_file, name="Push vsftpd.conf", content=r.result,
+                                              dest_file=self.VSFTPD_CONF_FILE, enable=enable, probe=probe,
+                                              severity_level=logging.DEBUG)
+                            changed = changed or pushed[0].changed
+                            if not pushed[0].changed:
+                                print(f"{Fore.GREEN}Device {task.host.name}: {self.VSFTPD_CONF_FILE} is up to date - transfer skipped.")
                         else:
                             task.run(task=netmiko_send_command, command_string=command, enable=enable,
                                      severity_level=logging.DEBUG)
+                    on_change_commands = data[0].result[vsftpd_key].get("on_change", [])
+                    if changed and on_change_commands:
+                        res = task.run(task=self.run_script, name="Run on change commands", commands=on_change_commands,
+                                       enable=enable, severity_level=logging.DEBUG)
+                        self._print_script_results([result for result in res[0].result if result["exit_status"] != 0])
             else:
                 print(f"{Fore.RED}Device {task.host.name}: No {vsftpd_key} key was found in host data.")
         else:
@@ -0,0 +1,226 @@
+import bisect
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from colorama import Fore
+from nornir_utils.plugins.functions import print_title
+
+from modules.utility.acl_parser import AclEntry
+
+
+class AclAnalyzer:
+    """
+    Třída, která v normalizovaných paketových filtrech (viz AclParser) hledá problematické záznamy:
+
+    - shadowed - záznam je zcela pokryt dřívějším záznamem s opačnou akcí (nikdy se neuplatní, pravděpodobně chyba),
+    - redundant - záznam je zcela pokryt dřívějším záznamem se stejnou akcí, případně pozdějším záznamem se stejnou akcí,
+      mezi kterými není žádný překrývající se záznam s opačnou akcí (záznam lze odstranit),
+    - overlap - záznam se částečně překrývá s dřívějším záznamem s opačnou akcí (výsledek závisí na pořadí záznamů).
+
+    Každá dimenze záznamů (protokol, adresy, porty) je nahrazena pořadím hranic intervalů (rank compression - funguje i pro
+    128bitové IPv6 adresy), takže záznamy jednoho filtru tvoří matice intervalů v numpy a pokrytí/překryv jednoho záznamu
+    se všemi ostatními je vyhodnoceno vektorově. Pokrytí se posuzuje vůči jednotlivým záznamům (ne vůči sjednocení více záznamů).
+
+    Attributes:
+        DIMENSIONS (int): počet dimenzí záznamu.
+    """
+
+    DIMENSIONS = 5
+    TERMINATING_ACTIONS = ("permit", "deny")
+
+    def analyze(self, entries: List[AclEntry]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Metoda, která analyzuje všechny filtry (záznamy jsou seskupeny podle názvu ACL a verze IP).
+
+        Args:
+            entries (List[AclEntry]): záznamy v pořadí vyhodnocení (viz AclParser.parse)
+
+        Returns:
+            Vrací slovník název ACL -> list nálezů (viz analyze_acl).
+        """
+        acls: Dict[Tuple[str, int], List[AclEntry]] = {}
+        for entry in entries:
+            acls.setdefault((entry.acl, entry.family), []).append(entry)
+        return {acl: self.analyze_acl(acl_entries) for (acl, _), acl_entries in acls.items()}
+
+    def analyze_acl(self, entries: List[AclEntry]) -> List[Dict[str, Any]]:
+        """
+        Metoda, která analyzuje jeden filtr. Junos term rozložený na více záznamů je nahlášen pouze tehdy, pokud jsou
+        nahlášeny všechny jeho záznamy (záznamy stejného termu se navzájem nepokrývají).
+
+        Args:
+            entries (List[AclEntry]): záznamy jednoho filtru v pořadí vyhodnocení
+
+        Returns:
+            Vrací list nálezů - slovníků s klíči seq, type (shadowed, redundant, overlap), line, by (pořadová čísla
+            pokrývajících/překrývajících se záznamů) a by_lines.
+        """
+        if not entries:
+            return []
+        low, high = self._build_index(entries)
+        groups = np.array(self._group_ids(entries))
+        exact = np.array([entry.exact for entry in entries])
+        actions = np.array([entry.action for entry in entries])
+        terminating = np.isin(actions, self.TERMINATING_ACTIONS)
+        coverers = exact & terminating
+        box_findings: List[Optional[Tuple[str, int]]] = []
+        for j in range(len(entries)):
+            box_findings.append(self._analyze_box(j, low, high, groups, coverers, terminating, actions) if terminating[j] else None)
+        return self._aggregate(entries, groups, box_findings)
+
+    def print_report(self, host: str, analysis: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        Metoda, která vypíše nálezy analýzy filtrů jednoho zařízení.
+
+        Args:
+            host (str): název zařízení
+            analysis (Dict[str, List[Dict[str, Any]]]): výsledek analýzy (viz analyze)
+
+        Returns:
+            None
+        """
+        print_title(f"Packet filter analysis - {host}")
+        print("\n".join(self.format_report(analysis, colors=True)))
+
+    def format_report(self, analysis: Dict[str, List[Dict[str, Any]]], colors: bool = False) -> List[str]:
+        """
+        Metoda, která převede nálezy analýzy na řádky textu (výpis do konzole, export do souboru).
+
+        Args:
+            analysis (Dict[str, List[Dict[str, Any]]]): výsledek analýzy (viz analyze)
+            colors (bool): jestli mají řádky obsahovat barvy (colorama). Defaultně False.
+
+        Returns:
+            Vrací list řádků.
+        """
+        type_colors = {"shadowed": Fore.RED, "redundant": Fore.YELLOW, "overlap": Fore.CYAN}
+        lines = []
+        for acl, findings in analysis.items():
+            color = (Fore.GREEN if not findings else Fore.YELLOW) if colors else ""
+            lines.append(f"{color}{acl}: {len(findings)} findings")
+            for finding in findings:
+                color = type_colors[finding["type"]] if colors else ""
+                lines.append(f"{color}    {finding['type']}: {finding['seq']} {finding['line']}")
+                for seq, line in zip(finding["by"], finding["by_lines"]):
+                    lines.append(f"{color}        by {seq} {line}")
+        return lines
+
+    def _analyze_box(self, j: int, low: np.ndarray, high: np.ndarray, groups: np.ndarray, coverers: np.ndarray,
+                     terminating: np.ndarray, actions: np.ndarray) -> Optional[Tuple[str, int]]:
+        """
+        Metoda, která vyhodnotí jeden záznam vůči ostatním záznamům filtru. Nejprve jsou vybráni kandidáti podle nejselektivnější
+        dimenze (sloupce matic jsou seřazeny podle počtu různých hranic), ostatní dimenze se porovnávají už jen pro kandidáty.
+
+        Args:
+            j (int): index záznamu
+            low (np.ndarray): dolní hranice záznamů (DIMENSIONS x n)
+            high (np.ndarray): horní hranice záznamů (DIMENSIONS x n)
+            groups (np.ndarray): identifikátory termů (záznamy stejného termu se navzájem nevyhodnocují)
+            coverers (np.ndarray): záznamy, které mohou pokrývat jiné záznamy (exact a ukončující vyhodnocení)
+            terminating (np.ndarray): záznamy, které ukončují vyhodnocení filtru
+            actions (np.ndarray): akce záznamů
+
+        Returns:
+            Vrací dvojici (typ nálezu, index pokrývajícího/překrývajícího se záznamu) nebo None.
+        """
+        candidates = np.flatnonzero((low[0] <= high[0, j]) & (high[0] >= low[0, j]) & terminating & (groups != groups[j]))
+        overlaps = np.ones(candidates.size, dtype=bool)
+        covers = coverers[candidates]
+        generalizes = np.ones(candidates.size, dtype=bool)
+        for dimension in range(self.DIMENSIONS):
+            candidate_low, candidate_high = low[dimension, candidates], high[dimension, candidates]
+            overlaps &= (candidate_low <= high[dimension, j]) & (candidate_high >= low[dimension, j])
+            covers &= (candidate_low <= low[dimension, j]) & (candidate_high >= high[dimension, j])
+            generalizes &= (candidate_low >= low[dimension, j]) & (candidate_high <= high[dimension, j])
+        same_action = actions[candidates] == actions[j]
+        earlier = candidates < j
+        earlier_covers = candidates[covers & earlier]
+        if earlier_covers.size:
+            first = int(earlier_covers[0])
+            return ("redundant" if actions[first] == actions[j] else "shadowed"), first
+        later_conflicts = candidates[overlaps & ~same_action & ~earlier]
+        end = int(later_conflicts[0]) if later_conflicts.size else len(actions)
+        later_covers = candidates[covers & same_action & ~earlier & (candidates < end)]
+        if later_covers.size:
+            return "redundant", int(later_covers[0])
+        earlier_conflicts = candidates[overlaps & ~same_action & earlier & ~generalizes]
+        if earlier_conflicts.size:
+            return "overlap", int(earlier_conflicts[0])
+        return None
+
+    def _aggregate(self, entries: List[AclEntry], groups: np.ndarray,
+                   box_findings: List[Optional[Tuple[str, int]]]) -> List[Dict[str, Any]]:
+        """
+        Metoda, která sloučí nálezy záznamů stejného termu do jednoho nálezu.
+
+        Args:
+            entries (List[AclEntry]): záznamy jednoho filtru
+            groups (np.ndarray): identifikátory termů
+            box_findings (List[Optional[Tuple[str, int]]]): nálezy jednotlivých záznamů (viz _analyze_box)
+
+        Returns:
+            Vrací list nálezů.
+        """
+        findings = []
+        start = 0
+        while start < len(entries):
+            end = start
+            while end < len(entries) and groups[end] == groups[start]:
+                end += 1
+            term_findings = box_findings[start:end]
+            types = {finding[0] for finding in term_findings if finding is not None}
+            if "overlap" in types:
+                finding_type = "overlap"
+            elif all(finding is not None for finding in term_findings):
+                finding_type = "shadowed" if "shadowed" in types else "redundant"
+            else:
+                finding_type = None
+            if finding_type is not None:
+                by = sorted({finding[1] for finding in term_findings if finding is not None and
+                             (finding_type != "overlap" or finding[0] == "overlap")})
+                by_seqs = list(dict.fromkeys(entries[index].seq for index in by))
+                by_lines = list(dict.fromkeys(entries[index].line for index in by))
+                findings.append({"seq": entries[start].seq, "type": finding_type, "line": entries[start].line,
+                                 "by": by_seqs, "by_lines": by_lines})
+            start = end
+        return findings
+
+    def _build_index(self, entries: List[AclEntry]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Metoda, která převede rozsahy záznamů na matice pořadí hranic (rank compression). Pořadí zachovává uspořádání hranic,
+        takže porovnání intervalů v pořadích dává stejný výsledek jako porovnání původních hodnot. Řádky matic jsou dimenze
+        seřazené podle počtu různých hranic.
+
+        Args:
+            entries (List[AclEntry]): záznamy jednoho filtru
+
+        Returns:
+            Vrací dvojici matic (dolní hranice, horní hranice) o rozměru DIMENSIONS x n.
+        """
+        columns = []
+        for dimension in range(self.DIMENSIONS):
+            bounds = sorted({bound for entry in entries for bound in entry.ranges[dimension]})
+            columns.append((len(bounds),
+                            [bisect.bisect_left(bounds, entry.ranges[dimension][0]) for entry in entries],
+                            [bisect.bisect_left(bounds, entry.ranges[dimension][1]) for entry in entries]))
+        columns.sort(key=lambda column: column[0], reverse=True)  # nejselektivnější dimenze první (viz _analyze_box)
+        low = np.array([column[1] for column in columns], dtype=np.int64)
+        high = np.array([column[2] for column in columns], dtype=np.int64)
+        return low, high
+
+    def _group_ids(self, entries: List[AclEntry]) -> List[int]:
+        """
+        Metoda, která přiřadí záznamům identifikátory termů - po sobě jdoucí záznamy se stejným pořadovým číslem (názvem termu)
+        patří do stejného termu.
+
+        Args:
+            entries (List[AclEntry]): záznamy jednoho filtru
+
+        Returns:
+            Vrací list identifikátorů.
+        """
+        group_ids = []
+        for index, entry in enumerate(entries):
+            same_term = index > 0 and entries[index - 1].seq == entry.seq
+            group_ids.append(group_ids[-1] if same_term else index)
+        return group_ids
@@ -0,0 +1,165 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from colorama import Fore
+from nornir.core.exceptions import NornirSubTaskError
+from nornir.core.task import Result, Task
+from nornir_netmiko import netmiko_send_command
+from nornir_utils.plugins.functions import print_title
+
+from modules.utility.acl_parser import AclParser
+from modules.utility.snapshot_store import SnapshotStore
+
+
+class AclHitCollector:
+    """
+    Třída, která sbírá počty shod (matches) jednotlivých záznamů ACL z výstupu show access-lists (Cisco routery a L3 switche)
+    a ukládá je jako časovou řadu včetně přírůstků od předchozího vzorku do lokálního úložiště (SnapshotStore). Z časové řady
+    lze zjistit záznamy bez jediné shody za dané období - kandidáty na odstranění (kratší ACL = rychlejší filtrování paketů).
+
+    Záznam je identifikován dvojicí (název ACL, pořadové číslo) a textem záznamu - při změně textu začíná nová řada (přírůstek None).
+    Pokles počtu shod je považován za reset čítačů (clear access-list counters), přírůstkem je pak celý nový počet shod.
+
+    Args:
+        snapshot_store (Optional[SnapshotStore]): lokální úložiště časových řad. Defaultně None (přírůstky se počítají pouze v paměti).
+
+    Attributes:
+        snapshot_store (Optional[SnapshotStore]): lokální úložiště časových řad.
+        previous (Dict[str, Dict[Tuple[str, str], Dict[str, Any]]]): poslední vzorek každého hosta - (ACL, pořadové číslo) -> {"line", "hits"}.
+        lock (threading.Lock): zámek pro přístup k previous z více vláken (nornir runner).
+    """
+
+    def __init__(self, snapshot_store: Optional[SnapshotStore] = None):
+        self._snapshot_store = snapshot_store
+        self._previous: Dict[str, Dict[Tuple[str, str], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def collect_acl_hits(self, task: Task) -> Result:
+        """
+        Nornir úkol, který přečte počty shod záznamů ACL zařízení, spočítá přírůstky od předchozího vzorku a vzorek uloží
+        do lokálního úložiště (pokud je definováno). Výstup show příkazu se vždy čte ze zařízení (čítače se nesmí číst z mezipaměti).
+
+        Args:
+            task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
+
+        Raises:
+            NornirSubTaskError: Výjimka, která nastane, pokud nastane chyba v nornir úkolu nebo pokud výrobce/typ zařízení
+                není podporován (počty shod jsou dostupné pouze u Cisco zařízení).
+
+        Returns:
+            Vrací Result objekt se slovníkem collected_at (čas sběru, ISO formát) a samples (list slovníků acl, seq, line, hits, delta).
+        """
+        if task.host['vendor'] != "cisco" or task.host['dev_type'] not in ("router", "L3_switch"):
+            print(f"{Fore.RED}ACL hit collection failed for host {task.host.name} - not implemented for that vendor.")
+            raise NornirSubTaskError(f"Function was not implemented for vendor {task.host.name}.", task)
+        result = task.run(task=netmiko_send_command, name="Get ACL hit counters", command_string="show access-lists")
+        collected_at = datetime.now().isoformat(timespec="seconds")
+        samples = self.compute_deltas(task.host.name, self.parse_hit_counters(result[0].result))
+        if self._snapshot_store:
+            self._snapshot_store.write_acl_hits(task.host.name, collected_at, samples)
+        return Result(host=task.host, result={"collected_at": collected_at, "samples": samples})
+
+    def parse_hit_counters(self, output: str) -> List[Dict[str, Any]]:
+        """
+        Metoda, která z výstupu show access-lists získá počet shod každého záznamu ("(N matches)", resp. "(1 match)").
+        Záznamy bez počtu shod mají nula shod (IOS počet shod u nepoužitých záznamů nevypisuje). Na rozdíl od AclParser nevyžaduje normalizaci záznamu, takže
+        zahrnuje i záznamy s object-group, neq apod.
+
+        Args:
+            output (str): výstup show access-lists
+
+        Returns:
+            Vrací list slovníků acl, seq, line (bez počtu shod) a hits.
+        """
+        samples = []
+        acl = None
+        position = 0
+        for raw_line in output.splitlines():
+            header = AclParser.CISCO_SHOW_HEADER.match(raw_line)
+            if header:
+                acl, position = header.group(2), 0
+                continue
+            line = raw_line.strip()
+            if acl is None or not line or not raw_line[:1].isspace():
+                continue
+            position += 1
+            matches = AclParser.CISCO_MATCHES.search(line)
+            line = AclParser.CISCO_MATCHES.sub("", line)
+            sequence = AclParser.CISCO_SEQUENCE.search(line)
+            first_token = line.split(" ", 1)[0]
+            seq = sequence.group(1) if sequence else first_token if first_token.isdigit() else str(position * 10)
+            samples.append({"acl": acl, "seq": seq, "line": line, "hits": int(matches.group(1)) if matches else 0})
+        return samples
+
+    def compute_deltas(self, host: str, samples: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Metoda, která ke vzorkům doplní přírůstek počtu shod od předchozího vzorku hosta (klíč delta). Předchozí vzorek je
+        uložen v paměti, při prvním sběru po spuštění je načten z lokálního úložiště.
+
+        Args:
+            host (str): jméno hosta
+            samples (List[Dict[str, Any]]): vzorky (viz parse_hit_counters)
+
+        Returns:
+            Vrací vzorky s doplněným klíčem delta (None, pokud předchozí vzorek záznamu neexistuje nebo se změnil text záznamu).
+        """
+        with self._lock:
+            previous = self._previous.get(host)
+        if previous is None:
+            previous = self._snapshot_store.get_latest_acl_hits(host) if self._snapshot_store else {}
+        current = {}
+        for sample in samples:
+            key = (sample["acl"], sample["seq"])
+            last = previous.get(key)
+            if last is None or last["line"] != sample["line"]:
+                sample["delta"] = None
+            else:
+                sample["delta"] = sample["hits"] - last["hits"] if sample["hits"] >= last["hits"] else sample["hits"]
+            current[key] = {"line": sample["line"], "hits": sample["hits"]}
+        with self._lock:
+            self._previous[host] = current
+        return samples
+
+    def get_unused_entries(self, window: timedelta, host: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Metoda, která vrací záznamy ACL bez jediné shody za dané období (viz SnapshotStore.find_unused_acl_entries).
+        Záznamy sledované kratší dobu než je období nejsou zahrnuty.
+
+        Args:
+            window (timedelta): sledované období (např. timedelta(days=30))
+            host (Optional[str]): jméno hosta. Defaultně None (všichni hosti).
+
+        Raises:
+            ValueError: Výjimka, která nastane, pokud není definováno lokální úložiště.
+
+        Returns:
+            Vrací list slovníků (host, acl_name, seq, line, hits, first_seen).
+        """
+        if self._snapshot_store is None:
+            raise ValueError("Unused ACL entries can be found only with snapshot_store defined.")
+        since = (datetime.now() - window).isoformat(timespec="seconds")
+        return self._snapshot_store.find_unused_acl_entries(since, host)
+
+    def print_unused_report(self, unused_entries: List[Dict[str, Any]], window: timedelta) -> None:
+        """
+        Metoda, která vypíše záznamy ACL bez jediné shody za dané období (seskupené podle hosta a ACL).
+
+        Args:
+            unused_entries (List[Dict[str, Any]]): nepoužité záznamy (viz get_unused_entries)
+            window (timedelta): sledované období
+
+        Returns:
+            None
+        """
+        print_title(f"ACL entries without hits in the last {window.total_seconds() / 86400:g} days")
+        if not unused_entries:
+            print(f"{Fore.GREEN}No unused ACL entries found (or entries were not monitored for the whole period).")
+            return
+        current = None
+        for entry in unused_entries:
+            if (entry["host"], entry["acl_name"]) != current:
+                current = (entry["host"], entry["acl_name"])
+                print(f"{Fore.YELLOW}{entry['host']} {entry['acl_name']}:")
+            print(f"    {entry['line']} (total hits {entry['hits']}, monitored since {entry['first_seen']})")
+        print(f"Unused entries: {len(unused_entries)}")
@@ -0,0 +1,376 @@
+import ipaddress
+import itertools
+import re
+from typing import Dict, List, Optional, Tuple
+
+from modules.utility.config_tree import ConfigNode, ConfigTreeParser
+
+Range = Tuple[int, int]
+
+
+class AclEntry:
+    """
+    Normalizovaný záznam paketového filtru (Cisco ACE nebo jedna kombinace hodnot Junos termu). Záznam je popsán rozsahy
+    v pěti dimenzích - protokol, zdrojová adresa, cílová adresa, zdrojový port a cílový port (každá dimenze je interval <od, do>),
+    takže vztahy mezi záznamy (pokrytí, překryv) lze vyhodnotit porovnáním intervalů.
+
+    Args:
+        acl (str): název ACL / filtru.
+        seq (str): pořadové číslo záznamu (Cisco) nebo název termu (Junos).
+        action (str): permit, deny nebo next (Junos term, který neukončuje vyhodnocení filtru).
+        ranges (List[Range]): rozsahy (protokol, zdrojová adresa, cílová adresa, zdrojový port, cílový port).
+        line (str): text záznamu bez pořadového čísla a počtu shod (Cisco) nebo popis termu (Junos).
+        exact (bool): jestli záznam odpovídá přesně svým rozsahům a ukončuje vyhodnocení filtru (False - např. ICMP typ, established,
+                      nesouvislá wildcard maska, Junos except nebo next term). Záznam, který není exact, nikdy nepokrývá jiné záznamy.
+        family (int): verze IP (4 nebo 6).
+        hits (Optional[int]): počet shod (matches) z výstupu show access-lists. Defaultně None (není k dispozici).
+
+    Attributes:
+        acl (str): název ACL / filtru.
+        seq (str): pořadové číslo záznamu nebo název termu.
+        action (str): permit, deny nebo next.
+        ranges (List[Range]): rozsahy v pěti dimenzích.
+        line (str): text záznamu (Cisco) nebo popis termu (Junos).
+        exact (bool): jestli záznam odpovídá přesně svým rozsahům.
+        family (int): verze IP.
+        hits (Optional[int]): počet shod.
+    """
+
+    def __init__(self, acl: str, seq: str, action: str, ranges: List[Range], line: str, exact: bool = True,
+                 family: int = 4, hits: Optional[int] = None):
+        self.acl = acl
+        self.seq = seq
+        self.action = action
+        self.ranges = ranges
+        self.line = line
+        self.exact = exact
+        self.family = family
+        self.hits = hits
+
+    def __repr__(self) -> str:
+        return f"AclEntry({self.acl!r}, {self.seq!r}, {self.action!r}, exact={self.exact})"
+
+
+class AclParser:
+    """
+    Třída, která převádí paketové filtry na list normalizovaných záznamů (AclEntry). Podporované vstupy:
+    Cisco - výstup show access-lists (včetně počtu shod) i running konfigurace (ip access-list, ipv6 access-list, access-list <číslo>),
+    Juniper - výstup show configuration firewall nebo running konfigurace (firewall filtry rodiny inet a inet6).
+    Nepodporované záznamy (např. object-group, neq) jsou přeskočeny a vráceny v unparsed.
+
+    Attributes:
+        unparsed (List[str]): řádky (termy), které se nepodařilo převést na AclEntry.
+    """
+
+    FULL_PORTS = (0, 65535)
+    FULL_PROTOCOLS = (0, 255)
+    PROTOCOLS = {"icmp": 1, "igmp": 2, "tcp": 6, "udp": 17, "gre": 47, "esp": 50, "ahp": 51, "ah": 51, "icmpv6": 58,
+                 "eigrp": 88, "ospf": 89, "pim": 103, "vrrp": 112, "sctp": 132}
+    PORTS = {"echo": 7, "discard": 9, "ftp-data": 20, "ftp": 21, "ssh": 22, "telnet": 23, "smtp": 25, "domain": 53,
+             "dns": 53, "bootps": 67, "bootpc": 68, "tftp": 69, "www": 80, "http": 80, "pop3": 110, "sunrpc": 111,
+             "ntp": 123, "netbios-ns": 137, "netbios-dgm": 138, "netbios-ss": 139, "snmp": 161, "snmptrap": 162,
+             "bgp": 179, "ldap": 389, "https": 443, "syslog": 514, "dhcpv6-client": 546, "dhcpv6-server": 547}
+    CISCO_IGNORED_OPTIONS = {"log", "log-input"}
+    CISCO_SHOW_HEADER = re.compile(r"^(?:Standard|Extended|Reflexive)?\s*(IP|IPv6)\s+access list\s+(\S+)")
+    CISCO_CONFIG_HEADER = re.compile(r"^(ip|ipv6) access-list (?:(standard|extended) )?(\S+)")
+    CISCO_NUMBERED = re.compile(r"^access-list (\d+) (.*)$")
+    CISCO_MATCHES = re.compile(r"\s*\((\d+) match(?:es)?\)")  # IOS vypisuje "(1 match)" i "(N matches)"
+    CISCO_SEQUENCE = re.compile(r"\s+sequence (\d+)$")
+
+    def __init__(self):
+        self._unparsed: List[str] = []
+
+    @property
+    def unparsed(self) -> List[str]:
+        return list(self._unparsed)
+
+    def parse(self, text: str, vendor: str) -> List[AclEntry]:
+        """
+        Metoda, která převede paketové filtry daného výrobce na normalizované záznamy.
+
+        Args:
+            text (str): výstup show access-lists / show configuration firewall nebo running konfigurace
+            vendor (str): výrobce (cisco nebo juniper)
+
+        Raises:
+            ValueError: Výjimka, která nastane, pokud výrobce není podporován.
+
+        Returns:
+            Vrací list záznamů v pořadí vyhodnocení.
+        """
+        if vendor == "cisco":
+            return self.parse_cisco(text)
+        if vendor == "juniper":
+            return self.parse_junos(text)
+        raise ValueError(f"Packet filter parsing is not implemented for vendor {vendor}.")
+
+    def parse_cisco(self, text: str) -> List[AclEntry]:
+        """
+        Metoda, která převede Cisco ACL (výstup show access-lists nebo running konfiguraci) na normalizované záznamy.
+
+        Args:
+            text (str): výstup show access-lists nebo running konfigurace
+
+        Returns:
+            Vrací list záznamů v pořadí vyhodnocení.
+        """
+        entries = []
+        acl, family, standard, position = None, 4, False, 0
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+            show_header = self.CISCO_SHOW_HEADER.match(raw_line)
+            config_header = self.CISCO_CONFIG_HEADER.match(raw_line)
+            numbered = self.CISCO_NUMBERED.match(raw_line)
+            if show_header:
+                acl, family, position = show_header.group(2), 6 if show_header.group(1) == "IPv6" else 4, 0
+                standard = raw_line.startswith("Standard")
+                continue
+            if config_header:
+                acl, family, position = config_header.group(3), 6 if config_header.group(1) == "ipv6" else 4, 0
+                standard = config_header.group(2) == "standard"
+                continue
+            if numbered:
+                number = int(numbered.group(1))
+                if numbered.group(1) != acl:
+                    acl, family, position = numbered.group(1), 4, 0
+                standard = number < 100 or 1300 <= number < 2000
+                line = numbered.group(2)
+            elif not line:
+                continue
+            elif not raw_line[:1].isspace():
+                acl = None  # konec ACL (jiný příkaz konfigurace)
+                continue
+            elif acl is None:
+                continue
+            position += 1
+            entry = self._parse_cisco_entry(acl, line, family, standard, position)
+            if entry is not None:
+                entries.append(entry)
+        return entries
+
+    def parse_junos(self, text: str) -> List[AclEntry]:
+        """
+        Metoda, která převede Junos firewall filtry (výstup show configuration firewall nebo running konfiguraci) na normalizované záznamy.
+        Term s více hodnotami (např. více source-address) je rozložen na více záznamů se stejným názvem termu.
+
+        Args:
+            text (str): výstup show configuration firewall nebo running konfigurace
+
+        Returns:
+            Vrací list záznamů v pořadí vyhodnocení.
+        """
+        tree = ConfigTreeParser().parse_junos(text)
+        firewall = tree.get("firewall") or tree
+        filters: List[Tuple[ConfigNode, int]] = [(node, 4) for node in firewall.find_children(r"^filter ")]
+        for family_node in firewall.find_children(r"^family (inet|inet6)$"):
+            family = 6 if family_node.text == "family inet6" else 4
+            filters.extend((node, family) for node in family_node.find_children(r"^filter "))
+        entries = []
+        for filter_node, family in filters:
+            for term in filter_node.find_children(r"^term "):
+                entries.extend(self._parse_junos_term(filter_node.text.split(" ", 1)[1], term, family))
+        return entries
+
+    def _parse_cisco_entry(self, acl: str, line: str, family: int, standard: bool, position: int) -> Optional[AclEntry]:
+        """
+        Metoda, která převede jeden Cisco ACE na AclEntry.
+
+        Args:
+            acl (str): název ACL
+            line (str): řádek ACE (bez odsazení)
+            family (int): verze IP
+            standard (bool): jestli jde o standardní ACL (pouze zdrojová adresa)
+            position (int): pořadí záznamu v ACL (pokud řádek neobsahuje pořadové číslo)
+
+        Returns:
+            Vrací AclEntry nebo None (řádek není ACE nebo jej nelze převést).
+        """
+        hits = None
+        matches = self.CISCO_MATCHES.search(line)
+        if matches:
+            hits = int(matches.group(1))
+            line = self.CISCO_MATCHES.sub("", line)
+        seq = str(position * 10)
+        sequence = self.CISCO_SEQUENCE.search(line)
+        if sequence:
+            seq, line = sequence.group(1), self.CISCO_SEQUENCE.sub("", line)
+        first, _, remainder = line.strip().partition(" ")
+        if first.isdigit():
+            seq, line = first, remainder  # pořadové číslo není součástí textu záznamu (stejně jako "sequence N" u IPv6)
+        tokens = line.replace(",", " ").split()
+        if not tokens or tokens[0] not in ("permit", "deny"):
+            if tokens and tokens[0] != "remark":
+                self._unparsed.append(f"{acl}: {line}")
+            return None
+        try:
+            if standard:
+                source, rest, exact = self._parse_cisco_address(tokens[1:], family)
+                exact = exact and all(token in self.CISCO_IGNORED_OPTIONS for token in rest)
+                ranges = [self.FULL_PROTOCOLS, source, self._full_addresses(family), self.FULL_PORTS, self.FULL_PORTS]
+            else:
+                protocol = self._parse_protocol(tokens[1], family)
+                source, rest, source_exact = self._parse_cisco_address(tokens[2:], family)
+                source_ports, rest = self._parse_cisco_ports(rest, protocol)
+                destination, rest, destination_exact = self._parse_cisco_address(rest, family)
+                destination_ports, rest = self._parse_cisco_ports(rest, protocol)
+                exact = source_exact and destination_exact and all(token in self.CISCO_IGNORED_OPTIONS for token in rest)
+                ranges = [protocol, source, destination, source_ports, destination_ports]
+        except (ValueError, IndexError):
+            self._unparsed.append(f"{acl}: {line}")
+            return None
+        return AclEntry(acl, seq, tokens[0], ranges, line.strip(), exact, family, hits)
+
+    def _parse_cisco_address(self, tokens: List[str], family: int) -> Tuple[Range, List[str], bool]:
+        """
+        Metoda, která převede Cisco specifikaci adresy (any, host A, A W, A wildcard bits W, prefix/délka) na rozsah.
+
+        Args:
+            tokens (List[str]): tokeny od začátku specifikace adresy
+            family (int): verze IP
+
+        Raises:
+            ValueError: Výjimka, která nastane, pokud specifikace adresy není podporována (např. object-group).
+
+        Returns:
+            Vrací trojici (rozsah, zbývající tokeny, jestli rozsah odpovídá přesně - False u nesouvislé wildcard masky).
+        """
+        if tokens[0] == "any":
+            return self._full_addresses(family), tokens[1:], True
+        if tokens[0] == "host":
+            address = int(ipaddress.ip_address(tokens[1]))
+            return (address, address), tokens[2:], True
+        if "/" in tokens[0]:
+            network = ipaddress.ip_network(tokens[0], strict=False)
+            return (int(network.network_address), int(network.broadcast_address)), tokens[1:], True
+        address = int(ipaddress.IPv4Address(tokens[0]))
+        if tokens[1:3] == ["wildcard", "bits"]:
+            tokens = [tokens[0]] + tokens[3:]  # standardní ACL ve výstupu show access-lists - "A, wildcard bits W"
+        if len(tokens) > 1 and re.match(r"^\d+\.\d+\.\d+\.\d+$", tokens[1]):
+            wildcard = int(ipaddress.IPv4Address(tokens[1]))
+            contiguous = (wildcard & (wildcard + 1)) == 0
+            return (address & ~wildcard & 0xFFFFFFFF, address | wildcard), tokens[2:], contiguous
+        return (address, address), tokens[1:], True  # standardní ACL bez wildcard masky - jedna adresa
+
+    def _parse_cisco_ports(self, tokens: List[str], protocol: Range) -> Tuple[Range, List[str]]:
+        """
+        Metoda, která převede Cisco specifikaci portů (eq, lt, gt, range) na rozsah.
+
+        Args:
+            tokens (List[str]): tokeny za specifikací adresy
+            protocol (Range): rozsah protokolu
+
+        Raises:
+            ValueError: Výjimka, která nastane, pokud specifikace portů není podporována (neq, více portů u eq).
+
+        Returns:
+            Vrací dvojici (rozsah portů, zbývající tokeny).
+        """
+        if not tokens or tokens[0] not in ("eq", "lt", "gt", "range", "neq"):
+            return self.FULL_PORTS, tokens
+        if protocol not in ((6, 6), (17, 17)):
+            raise ValueError("Ports are supported only for tcp and udp.")
+        if tokens[0] == "eq":
+            port = self._parse_port(tokens[1])
+            if len(tokens) > 2 and self._is_port(tokens[2]):
+                raise ValueError("Multiple ports are not supported.")
+            return (port, port), tokens[2:]
+        if tokens[0] == "lt":
+            return (0, self._parse_port(tokens[1]) - 1), tokens[2:]
+        if tokens[0] == "gt":
+            return (self._parse_port(tokens[1]) + 1, 65535), tokens[2:]
+        if tokens[0] == "range":
+            return (self._parse_port(tokens[1]), self._parse_port(tokens[2])), tokens[3:]
+        raise ValueError("Operator neq is not supported.")
+
+    def _parse_junos_term(self, acl: str, term: ConfigNode, family: int) -> List[AclEntry]:
+        """
+        Metoda, která převede Junos term na záznamy (kartézský součin hodnot from podmínek).
+
+        Args:
+            acl (str): název filtru
+            term (ConfigNode): uzel termu
+            family (int): verze IP
+
+        Returns:
+            Vrací list záznamů termu (prázdný list, pokud term nelze převést).
+        """
+        name = term.text.split(" ", 1)[1]
+        values: Dict[str, List[str]] = {}
+        from_node = term.get("from")
+        exact = True
+        for condition in (from_node.children if from_node else []):
+            key, _, value = condition.text.partition(" ")
+            if condition.children:
+                items = [child.text for child in condition.children]
+                exact = exact and not any(item.endswith(" except") for item in items)
+                values[key] = [item.replace(" except", "") for item in items if not item.endswith(" except")]
+            else:
+                values[key] = value.strip("[] ").split()
+        then_node = term.get("then")
+        then_lines = term.find_children(r"^then ")
+        if then_node is not None:
+            actions = [child.text for child in then_node.children]
+        else:
+            actions = [then_lines[0].text.split(" ", 1)[1]] if then_lines else ["accept"]
+        action = "permit" if "accept" in actions else "deny" if {"discard", "reject"} & set(actions) else None
+        if action is None:
+            exact = False
+            action = "next"  # next term / pouze počítadlo - term neukončuje vyhodnocení filtru
+        supported = {"source-address", "destination-address", "address", "protocol", "next-header", "source-port",
+                     "destination-port", "port"}
+        exact = exact and all(key in supported for key in values)
+        try:
+            protocols = [self._parse_protocol(value, family) for value in values.get("protocol", values.get("next-header", []))] \
+                or [self.FULL_PROTOCOLS]
+            sources = [self._parse_prefix(value) for value in values.get("source-address", values.get("address", []))] \
+                or [self._full_addresses(family)]
+            destinations = [self._parse_prefix(value) for value in values.get("destination-address", values.get("address", []))] \
+                or [self._full_addresses(family)]
+            source_ports = [self._parse_port_range(value) for value in values.get("source-port", values.get("port", []))] \
+                or [self.FULL_PORTS]
+            destination_ports = [self._parse_port_range(value) for value in values.get("destination-port", values.get("port", []))] \
+                or [self.FULL_PORTS]
+        except ValueError:
+            self._unparsed.append(f"{acl}: term {name}")
+            return []
+        if "address" in values or "port" in values:
+            exact = False  # address/port odpovídá zdroji NEBO cíli - nelze vyjádřit jedním záznamem
+        conditions = [f"{condition.text} [ {' '.join(child.text for child in condition.children)} ]" if condition.children
+                      else condition.text for condition in (from_node.children if from_node else [])]
+        description = f"term {name} from {{{'; '.join(conditions)}}} then {'; '.join(actions)}"
+        return [AclEntry(acl, name, action, list(ranges), description, exact, family)
+                for ranges in itertools.product(protocols, sources, destinations, source_ports, destination_ports)]
+
+    def _parse_protocol(self, value: str, family: int) -> Range:
+        if value in ("ip", "ipv6"):
+            return self.FULL_PROTOCOLS
+        if value == "icmp" and family == 6:
+            value = "icmpv6"
+        number = int(value) if value.isdigit() else self.PROTOCOLS.get(value)
+        if number is None:
+            raise ValueError(f"Unknown protocol {value}.")
+        return number, number
+
+    def _parse_prefix(self, value: str) -> Range:
+        network = ipaddress.ip_network(value, strict=False)
+        return int(network.network_address), int(network.broadcast_address)
+
+    def _parse_port_range(self, value: str) -> Range:
+        if "-" in value and not value.startswith("-"):
+            start, end = value.split("-", 1)
+            return self._parse_port(start), self._parse_port(end)
+        port = self._parse_port(value)
+        return port, port
+
+    def _parse_port(self, value: str) -> int:
+        if value.isdigit():
+            return int(value)
+        if value in self.PORTS:
+            return self.PORTS[value]
+        raise ValueError(f"Unknown port {value}.")
+
+    def _is_port(self, value: str) -> bool:
+        return value.isdigit() or value in self.PORTS
+
+    def _full_addresses(self, family: int) -> Range:
+        return (0, 2 ** 32 - 1) if family == 4 else (0, 2 ** 128 - 1)
@@ -0,0 +1,187 @@
+import heapq
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class AdaptivePollScheduler:
+    """
+    Třída, která plánuje sběr monitorovaných dat zvlášť pro každé zařízení. Zařízení s kolísající nebo alarmující hodnotou
+    sledované metriky (např. vytížení CPU) jsou dotazována častěji, stabilní zařízení méně často - vždy v rozmezí min_interval až max_interval.
+    Plánované časy jsou uloženy v haldě, takže nalezení zařízení k dotázání nezávisí lineárně na velikosti inventáře.
+
+    Args:
+        min_interval (float): minimální interval dotazování (v sekundách). Defaultně 5.
+        max_interval (float): maximální interval dotazování (v sekundách). Defaultně 120.
+        initial_interval (float): počáteční interval dotazování (v sekundách). Defaultně 10.
+        speedup (float): koeficient zkrácení intervalu u kolísajících/alarmujících zařízení. Defaultně 0.5.
+        slowdown (float): koeficient prodloužení intervalu u stabilních zařízení. Defaultně 1.5.
+        volatility_threshold (float): změna metriky mezi dvěma vzorky, od které je zařízení považováno za kolísající. Defaultně 5.
+        alarm_threshold (float): hodnota metriky, od které je zařízení považováno za alarmující. Defaultně 80.
+
+    Attributes:
+        intervals (Dict[str, float]): aktuální interval dotazování jednotlivých zařízení.
+        next_poll (Dict[str, float]): plánovaný čas příštího dotazu (unix timestamp).
+        last_values (Dict[str, float]): poslední hodnota sledované metriky.
+        heap (List[Tuple[float, str]]): halda (plánovaný čas, host) - neplatné záznamy jsou přeskočeny.
+        lock (threading.Lock): zámek pro přístup z více vláken.
+    """
+
+    def __init__(self, min_interval: float = 5, max_interval: float = 120, initial_interval: float = 10,
+                 speedup: float = 0.5, slowdown: float = 1.5, volatility_threshold: float = 5,
+                 alarm_threshold: float = 80):
+        if not 0 < min_interval <= initial_interval <= max_interval:
+            raise ValueError("Intervals must satisfy 0 < min_interval <= initial_interval <= max_interval.")
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._initial_interval = initial_interval
+        self._speedup = speedup
+        self._slowdown = slowdown
+        self._volatility_threshold = volatility_threshold
+        self._alarm_threshold = alarm_threshold
+        self._intervals: Dict[str, float] = {}
+        self._next_poll: Dict[str, float] = {}
+        self._last_values: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def add_hosts(self, hosts: Iterable[str], now: float) -> None:
+        """
+        Metoda, která zaregistruje hosty (dosud neregistrovaní hosti jsou naplánováni k okamžitému dotazu).
+
+        Args:
+            hosts (Iterable[str]): jména hostů
+            now (float): aktuální čas (unix timestamp)
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for host in hosts:
+                if host not in self._intervals:
+                    self._intervals[host] = self._initial_interval
+                    self._next_poll[host] = now
+                    heapq.heappush(self._heap, (now, host))
+
+    def remove_host(self, host: str) -> None:
+        """
+        Metoda, která odebere hosta z plánování.
+
+        Args:
+            host (str): jméno hosta
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._intervals.pop(host, None)
+            self._next_poll.pop(host, None)
+            self._last_values.pop(host, None)
+
+    def get_due_hosts(self, now: float) -> List[str]:
+        """
+        Metoda, která vrací hosty, u kterých už nastal čas dotazu. Vrácení hosti jsou záložně přeplánováni za max_interval -
+        pokud výsledek dotazu nikdy nedorazí (report ani report_failure), host se z plánování neztratí. Výsledek dotazu
+        záložní plán nahradí.
+
+        Args:
+            now (float): aktuální čas (unix timestamp)
+
+        Returns:
+            Vrací list jmen hostů k dotázání.
+        """
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                poll_time, host = heapq.heappop(self._heap)
+                if self._next_poll.get(host) == poll_time:
+                    due.append(host)
+            for host in due:
+                fallback_time = now + self._max_interval
+                self._next_poll[host] = fallback_time
+                heapq.heappush(self._heap, (fallback_time, host))
+        return due
+
+    def time_until_next(self, now: float) -> float:
+        """
+        Metoda, která vrací počet sekund do nejbližšího plánovaného dotazu.
+
+        Args:
+            now (float): aktuální čas (unix timestamp)
+
+        Returns:
+            Vrací počet sekund (0 = některý host už čeká na dotaz, max_interval = nic není naplánováno).
+        """
+        with self._lock:
+            while self._heap and self._next_poll.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return self._max_interval
+            return max(0.0, self._heap[0][0] - now)
+
+    def report(self, host: str, value: Optional[float], now: float) -> float:
+        """
+        Metoda, která zpracuje novou hodnotu sledované metriky, upraví interval dotazování hosta a naplánuje další dotaz.
+
+        Args:
+            host (str): jméno hosta
+            value (Optional[float]): hodnota sledované metriky (None = metrika není k dispozici, interval se nemění)
+            now (float): čas získání hodnoty (unix timestamp)
+
+        Returns:
+            Vrací nový interval dotazování hosta (v sekundách).
+        """
+        with self._lock:
+            interval = self._intervals.get(host, self._initial_interval)
+            if value is not None:
+                last_value = self._last_values.get(host)
+                volatile = last_value is not None and abs(value - last_value) >= self._volatility_threshold
+                if volatile or value >= self._alarm_threshold:
+                    interval = max(self._min_interval, interval * self._speedup)
+                else:
+                    interval = min(self._max_interval, interval * self._slowdown)
+                self._last_values[host] = value
+            self._intervals[host] = interval
+            self._schedule(host, now)
+            return interval
+
+    def report_failure(self, host: str, now: float) -> float:
+        """
+        Metoda, která zpracuje neúspěšný sběr dat (interval se prodlouží, aby se nedostupné zařízení zbytečně nedotazovalo).
+
+        Args:
+            host (str): jméno hosta
+            now (float): aktuální čas (unix timestamp)
+
+        Returns:
+            Vrací nový interval dotazování hosta (v sekundách).
+        """
+        with self._lock:
+            interval = min(self._max_interval, self._intervals.get(host, self._initial_interval) * self._slowdown)
+            self._intervals[host] = interval
+            self._schedule(host, now)
+            return interval
+
+    def get_intervals(self) -> Dict[str, float]:
+        """
+        Metoda, která vrací aktuální intervaly dotazování.
+
+        Returns:
+            Vrací slovník host -> interval v sekundách.
+        """
+        with self._lock:
+            return dict(self._intervals)
+
+    def _schedule(self, host: str, now: float) -> None:
+        """
+        Metoda, která naplánuje další dotaz hosta (volá se pod zámkem).
+
+        Args:
+            host (str): jméno hosta
+            now (float): aktuální čas (unix timestamp)
+
+        Returns:
+            None
+        """
+        poll_time = now + self._intervals[host]
+        self._next_poll[host] = poll_time
+        heapq.heappush(self._heap, (poll_time, host))
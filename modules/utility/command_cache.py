@@ -0,0 +1,150 @@
+import copy
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from nornir.core.task import Result, Task
+from nornir_napalm.plugins.tasks import napalm_get
+from nornir_netmiko import netmiko_send_command
+
+
+class CommandCache:
+    """
+    Třída, která slouží jako mezipaměť výstupů show příkazů (netmiko_send_command) a NAPALM getterů (napalm_get) v rámci jednoho běhu skriptu.
+    Klíčem je (host, příkaz), resp. (host, getter). Opakované čtení stejného výstupu (např. "show route" u Juniper zařízení pro IPv4 i IPv6
+    export a zobrazení) tak proběhne pouze jednou, další čtení jsou obsloužena z paměti. Metody netmiko_send_command a napalm_get jsou
+    nornir úkoly se stejnými argumenty jako původní úkoly - task.run(task=cache.netmiko_send_command, command_string="show route").
+
+    Výsledky jsou vraceny jako hluboké kopie, takže jejich úprava volajícím neovlivní uložená data. Neúspěšné úkoly se neukládají.
+
+    Args:
+        ttl (Optional[float]): doba platnosti uloženého výstupu v sekundách. Defaultně None (platí po celou dobu života objektu - jeden běh).
+        volatile_getters (Optional[List[str]]): NAPALM gettery, které se nikdy neukládají (např. čítače). Defaultně None (VOLATILE_GETTERS).
+
+    Attributes:
+        ttl (Optional[float]): doba platnosti uloženého výstupu v sekundách.
+        volatile_getters (List[str]): NAPALM gettery, které se nikdy neukládají.
+        entries (Dict[Tuple, Tuple[float, Any]]): klíč -> (čas uložení, výstup).
+        hits (int): počet čtení obsloužených z paměti.
+        misses (int): počet čtení ze zařízení.
+        lock (threading.Lock): zámek pro přístup z více vláken (nornir runner).
+    """
+
+    VOLATILE_GETTERS = ["interfaces_counters"]
+
+    def __init__(self, ttl: Optional[float] = None, volatile_getters: Optional[List[str]] = None):
+        self._ttl = ttl
+        self._volatile_getters = volatile_getters if volatile_getters is not None else list(self.VOLATILE_GETTERS)
+        self._entries: Dict[Tuple, Tuple[float, Any]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def netmiko_send_command(self, task: Task, command_string: str, **kwargs) -> Result:
+        """
+        Nornir úkol, který vrací výstup příkazu z mezipaměti, případně příkaz pošle na zařízení (netmiko_send_command) a výstup uloží.
+
+        Args:
+            task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
+            command_string (str): příkaz, který bude proveden
+            **kwargs: další argumenty netmiko_send_command (např. use_textfsm) - jsou součástí klíče
+
+        Returns:
+            Vrací Result objekt s výstupem příkazu.
+        """
+        key = (task.host.name, "netmiko", command_string, self._freeze(kwargs))
+        found, output = self._get(key)
+        if not found:
+            output = netmiko_send_command(task, command_string=command_string, **kwargs).result
+            self._set(key, output)
+        return Result(host=task.host, result=copy.deepcopy(output))
+
+    def napalm_get(self, task: Task, getters: List[str], **kwargs) -> Result:
+        """
+        Nornir úkol, který vrací data NAPALM getterů z mezipaměti. Ze zařízení (napalm_get) jsou jedním voláním načteny pouze
+        gettery, které v mezipaměti nejsou (nebo jsou volatilní).
+
+        Args:
+            task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
+            getters (List[str]): NAPALM gettery
+            **kwargs: další argumenty napalm_get (např. getters_options) - jsou součástí klíče
+
+        Returns:
+            Vrací Result objekt se slovníkem getter -> data (stejně jako napalm_get).
+        """
+        options = self._freeze(kwargs)
+        result: Dict[str, Any] = {}
+        missing = []
+        for getter in getters:
+            found, data = self._get((task.host.name, "napalm", getter, options)) if getter not in self._volatile_getters else (False, None)
+            if found:
+                result[getter] = data
+            else:
+                missing.append(getter)
+        if missing:
+            fetched = napalm_get(task, getters=missing, **kwargs).result
+            for getter, data in fetched.items():
+                if getter not in self._volatile_getters:
+                    self._set((task.host.name, "napalm", getter, options), data)
+                result[getter] = data
+        return Result(host=task.host, result=copy.deepcopy(result))
+
+    def invalidate(self, host: Optional[str] = None) -> None:
+        """
+        Metoda, která odstraní uložené výstupy (např. po změně konfigurace zařízení).
+
+        Args:
+            host (Optional[str]): jméno hosta, jehož výstupy budou odstraněny. Defaultně None (všechny výstupy).
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if host is None:
+                self._entries.clear()
+            else:
+                self._entries = {key: entry for key, entry in self._entries.items() if key[0] != host}
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Metoda, která vrací statistiky mezipaměti.
+
+        Returns:
+            Vrací slovník s počtem uložených výstupů (entries), čtení z paměti (hits) a čtení ze zařízení (misses).
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+    def _get(self, key: Tuple) -> Tuple[bool, Any]:
+        """
+        Metoda, která vrací uložený výstup, pokud existuje a ještě nevypršela jeho platnost.
+
+        Args:
+            key (Tuple): klíč výstupu
+
+        Returns:
+            Vrací dvojici (nalezeno, výstup).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self._ttl is None or time.monotonic() - entry[0] < self._ttl):
+                self._hits += 1
+                return True, entry[1]
+            self._misses += 1
+            return False, None
+
+    def _set(self, key: Tuple, output: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(output))
+
+    def _freeze(self, kwargs: Dict[str, Any]) -> Hashable:
+        """
+        Metoda, která převede argumenty úkolu na hashovatelnou část klíče.
+
+        Args:
+            kwargs (Dict[str, Any]): argumenty úkolu
+
+        Returns:
+            Vrací seřazenou n-tici (název, repr hodnoty).
+        """
+        return tuple(sorted((name, repr(value)) for name, value in kwargs.items()))
@@ -0,0 +1,304 @@
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+from colorama import Fore
+from nornir_utils.plugins.functions import print_title
+
+from modules.utility.config_tree import ConfigNode, ConfigTreeParser
+from modules.utility.json_serializer import JSONSerializer
+from modules.utility.text_file_exporter import FileExporter
+
+
+class ComplianceChecker:
+    """
+    Třída, která kontroluje soulad (compliance) nejnovějších záloh konfigurací s pravidly deklarovanými v YAML souboru
+    (pravidla pro výrobce a typ zařízení - must_contain, must_not_contain, section_matches, viz compliance/rules.yml).
+    Konfigurace jsou převedeny na strom (ConfigTreeParser - každá unikátní konfigurace je parsována pouze jednou) a vyhodnocovány
+    paralelně ve více procesech (ProcessPoolExecutor) - hosti jsou procesům předáváni po dávkách, takže i kontrola tisíců zařízení
+    trvá řádově sekundy a lze ji spouštět po každém backupu.
+
+    Args:
+        rules_file (Path): cesta k YAML souboru s pravidly.
+        cache_dir (Optional[Path]): složka cache zparsovaných stromů. Defaultně None (výchozí složka ConfigTreeParser).
+        max_workers (Optional[int]): počet procesů. Defaultně None (počet CPU). Hodnota 1 - vyhodnocení v aktuálním procesu.
+        chunk_size (int): počet hostů v jedné dávce předané procesu. Defaultně 200.
+
+    Attributes:
+        rules (List[Dict[str, Any]]): načtená pravidla.
+        cache_dir (Optional[Path]): složka cache zparsovaných stromů.
+        max_workers (Optional[int]): počet procesů.
+        chunk_size (int): počet hostů v jedné dávce.
+    """
+
+    RULE_TYPES = ["must_contain", "must_not_contain", "section_matches"]
+    BACKUP_FILE_PATTERN = re.compile(r"^(?P<host>.+)_(?P<date>\d{4}-\d{2}-\d{2})\.conf$")
+
+    def __init__(self, rules_file: Path, cache_dir: Optional[Path] = None, max_workers: Optional[int] = None,
+                 chunk_size: int = 200):
+        self._rules = self._load_rules(rules_file)
+        self._cache_dir = cache_dir
+        self._max_workers = max_workers
+        self._chunk_size = chunk_size
+
+    @property
+    def rules(self) -> List[Dict[str, Any]]:
+        return self._rules
+
+    def get_latest_backups(self, backup_dir: Path) -> Dict[str, Path]:
+        """
+        Metoda, která vrací nejnovější zálohu konfigurace každého hosta (backups/{host}/{host}_{datum}.conf).
+
+        Args:
+            backup_dir (Path): složka se zálohami
+
+        Returns:
+            Vrací slovník host -> cesta k nejnovější záloze.
+        """
+        latest: Dict[str, Tuple[str, Path]] = {}
+        for file_path in backup_dir.glob("*/*.conf"):
+            match = self.BACKUP_FILE_PATTERN.match(file_path.name)
+            if match and match.group("host") == file_path.parent.name:
+                host, date = match.group("host"), match.group("date")
+                if host not in latest or date > latest[host][0]:
+                    latest[host] = (date, file_path)
+        return {host: file_path for host, (date, file_path) in latest.items()}
+
+    def check_fleet(self, hosts: Dict[str, Dict[str, str]], backup_dir: Path) -> Dict[str, Dict[str, Any]]:
+        """
+        Metoda, která zkontroluje nejnovější zálohy konfigurací všech hostů.
+
+        Args:
+            hosts (Dict[str, Dict[str, str]]): host -> údaje hosta (vendor, dev_type) - např. z nornir inventáře
+            backup_dir (Path): složka se zálohami
+
+        Returns:
+            Vrací slovník host -> výsledek (backup - cesta k záloze nebo None, passed - True/False, rules - výsledky jednotlivých pravidel).
+        """
+        backups = self.get_latest_backups(backup_dir)
+        items = [(host, str(backups[host]), data.get("vendor"), data.get("dev_type"))
+                 for host, data in sorted(hosts.items()) if host in backups]
+        report = {host: {"backup": None, "passed": False, "rules": []} for host in hosts if host not in backups}
+        chunks = [items[start:start + self._chunk_size] for start in range(0, len(items), self._chunk_size)]
+        if self._max_workers == 1 or len(chunks) <= 1:
+            results = [self._check_chunk(chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+                results = list(executor.map(self._check_chunk, chunks))
+        for chunk_result in results:
+            report.update(chunk_result)
+        return dict(sorted(report.items()))
+
+    def check_config(self, tree: ConfigNode, vendor: Optional[str], dev_type: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Metoda, která vyhodnotí pravidla platná pro daného výrobce a typ zařízení nad stromem konfigurace.
+
+        Args:
+            tree (ConfigNode): kořen stromu konfigurace
+            vendor (Optional[str]): výrobce zařízení
+            dev_type (Optional[str]): typ zařízení
+
+        Returns:
+            Vrací list výsledků pravidel (rule, passed, details).
+        """
+        results = []
+        texts: Dict[int, str] = {}  # texty podstromů sdílené všemi pravidly - každá sekce je spojena do textu pouze jednou
+        for rule in self._rules:
+            if not self._rule_applies(rule, vendor, dev_type):
+                continue
+            passed, details = self._evaluate_rule(rule, tree, texts)
+            results.append({"rule": rule["name"], "passed": passed, "details": details})
+        return results
+
+    def print_report(self, report: Dict[str, Dict[str, Any]], elapsed: Optional[float] = None) -> None:
+        """
+        Metoda, která vypíše výsledek kontroly každého zařízení (PASS/FAIL, nesplněná pravidla) a souhrn.
+
+        Args:
+            report (Dict[str, Dict[str, Any]]): výsledek kontroly (viz check_fleet)
+            elapsed (Optional[float]): doba kontroly v sekundách. Defaultně None (nevypisuje se).
+
+        Returns:
+            None
+        """
+        print_title("Compliance report")
+        for host, result in report.items():
+            if result["backup"] is None:
+                print(f"{Fore.RED}{host}: FAIL - no backup found")
+            elif result["passed"]:
+                print(f"{Fore.GREEN}{host}: PASS ({len(result['rules'])} rules)")
+            else:
+                failed = [rule for rule in result["rules"] if not rule["passed"]]
+                print(f"{Fore.RED}{host}: FAIL ({len(failed)}/{len(result['rules'])} rules)")
+                for rule in failed:
+                    print(f"{Fore.RED}    {rule['rule']}: {rule['details']}")
+        passed = sum(result["passed"] for result in report.values())
+        summary = f"Compliant devices: {passed}/{len(report)}"
+        print(summary + (f", check took {elapsed:.2f} s." if elapsed is not None else "."))
+
+    def export_report(self, report: Dict[str, Dict[str, Any]], file_path: Path, serializer: JSONSerializer = None) -> None:
+        """
+        Metoda, která exportuje výsledek kontroly do .json souboru.
+
+        Args:
+            report (Dict[str, Dict[str, Any]]): výsledek kontroly (viz check_fleet)
+            file_path (Path): cesta k .json souboru
+            serializer (JSONSerializer): objekt pro serializaci. Defaultně None (orjson, pokud je nainstalován, jinak json).
+
+        Returns:
+            None
+        """
+        serializer = serializer or JSONSerializer()
+        FileExporter(file_path, serializer.dumps(report, indent=True)).export_to_file()
+
+    def run(self, hosts: Dict[str, Dict[str, str]], backup_dir: Path,
+            report_file: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Metoda, která zkontroluje všechny hosty, vypíše report a případně jej exportuje.
+
+        Args:
+            hosts (Dict[str, Dict[str, str]]): host -> údaje hosta (vendor, dev_type)
+            backup_dir (Path): složka se zálohami
+            report_file (Optional[Path]): cesta k .json souboru s reportem. Defaultně None (report se neexportuje).
+
+        Returns:
+            Vrací výsledek kontroly (viz check_fleet).
+        """
+        started = time.perf_counter()
+        report = self.check_fleet(hosts, backup_dir)
+        self.print_report(report, time.perf_counter() - started)
+        if report_file is not None:
+            self.export_report(report, report_file)
+        return report
+
+    def _check_chunk(self, chunk: List[Tuple[str, str, Optional[str], Optional[str]]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Metoda, která zkontroluje dávku hostů (běží v procesu ProcessPoolExecutoru).
+
+        Args:
+            chunk (List[Tuple[str, str, Optional[str], Optional[str]]]): list (host, cesta k záloze, vendor, dev_type)
+
+        Returns:
+            Vrací slovník host -> výsledek kontroly.
+        """
+        parser = ConfigTreeParser(cache_dir=self._cache_dir)
+        report = {}
+        for host, backup, vendor, dev_type in chunk:
+            tree = parser.parse_file(Path(backup), vendor)
+            results = self.check_config(tree, vendor, dev_type)
+            report[host] = {"backup": backup, "passed": all(result["passed"] for result in results), "rules": results}
+        return report
+
+    def _evaluate_rule(self, rule: Dict[str, Any], tree: ConfigNode, texts: Dict[int, str]) -> Tuple[bool, str]:
+        """
+        Metoda, která vyhodnotí jedno pravidlo nad stromem konfigurace.
+
+        Args:
+            rule (Dict[str, Any]): pravidlo
+            tree (ConfigNode): kořen stromu konfigurace
+            texts (Dict[int, str]): cache textů podstromů (id uzlu -> text) v rámci jednoho stromu
+
+        Returns:
+            Vrací dvojici (pravidlo splněno, popis nesplnění - prázdný string, pokud je pravidlo splněno).
+        """
+        sections = self._find_sections(tree, rule.get("section", []))
+        section_name = " > ".join(rule.get("section", []))
+        if rule["type"] == "must_contain":
+            if any(self._search(section, rule["pattern"], texts) for section in sections):
+                return True, ""
+            return False, f"missing line matching '{rule['pattern']}'" + (f" in section {section_name}" if section_name else "")
+        if rule["type"] == "must_not_contain":
+            found = [line for section in sections for line in self._search(section, rule["pattern"], texts, find_all=True)]
+            return (not found), (f"forbidden lines found: {', '.join(found)}" if found else "")
+        if not sections:
+            return bool(rule.get("optional", False)), ("" if rule.get("optional", False) else f"section {section_name} not found")
+        problems = []
+        for section in sections:
+            if any(self._search(section, pattern, texts) for pattern in rule.get("skip_if", [])):
+                continue
+            missing = [pattern for pattern in rule.get("must_contain", []) if not self._search(section, pattern, texts)]
+            forbidden = [pattern for pattern in rule.get("must_not_contain", []) if self._search(section, pattern, texts)]
+            if missing or forbidden:
+                problems.append(f"{section.text} ({', '.join([f'missing {p}' for p in missing] + [f'forbidden {p}' for p in forbidden])})")
+        return (not problems), "; ".join(problems)
+
+    def _search(self, section: ConfigNode, pattern: str, texts: Dict[int, str], find_all: bool = False) -> List[str]:
+        """
+        Metoda, která v podstromu sekce vyhledá řádky odpovídající vzoru. Řádky podstromu jsou spojeny do jednoho textu, který je
+        prohledán jedním průchodem regulárního výrazu (re.MULTILINE - ^ a $ označují začátek a konec řádku).
+
+        Args:
+            section (ConfigNode): sekce (uzel stromu)
+            pattern (str): regulární výraz
+            texts (Dict[int, str]): cache textů podstromů (id uzlu -> text) v rámci jednoho stromu
+            find_all (bool): jestli se mají vrátit všechny nalezené řádky. Defaultně False (pouze první).
+
+        Returns:
+            Vrací list nalezených řádků (prázdný list, pokud vzor nebyl nalezen).
+        """
+        text = texts.get(id(section))
+        if text is None:
+            text = texts[id(section)] = "\n".join(node.text for path, node in section.walk())
+        found = []
+        for match in re.finditer(pattern, text, re.MULTILINE):
+            start = text.rfind("\n", 0, match.start()) + 1
+            end = text.find("\n", match.end())
+            found.append(text[start:end if end >= 0 else len(text)])
+            if not find_all:
+                break
+        return found
+
+    def _find_sections(self, tree: ConfigNode, section_path: List[str]) -> List[ConfigNode]:
+        """
+        Metoda, která vrací všechny sekce odpovídající cestě vzorů (jeden vzor pro každou úroveň stromu).
+
+        Args:
+            tree (ConfigNode): kořen stromu konfigurace
+            section_path (List[str]): cesta vzorů. Prázdná cesta - celý strom.
+
+        Returns:
+            Vrací list nalezených sekcí.
+        """
+        sections = [tree]
+        for pattern in section_path:
+            sections = [child for section in sections for child in section.find_children(pattern)]
+        return sections
+
+    def _rule_applies(self, rule: Dict[str, Any], vendor: Optional[str], dev_type: Optional[str]) -> bool:
+        for key, value in (("vendor", vendor), ("dev_type", dev_type)):
+            allowed = rule.get(key)
+            if allowed is not None and value not in (allowed if isinstance(allowed, list) else [allowed]):
+                return False
+        return True
+
+    def _load_rules(self, rules_file: Path) -> List[Dict[str, Any]]:
+        """
+        Metoda, která načte a zvaliduje pravidla z YAML souboru (regulární výrazy jsou zkompilovány již při načtení).
+
+        Args:
+            rules_file (Path): cesta k YAML souboru s pravidly
+
+        Raises:
+            ValueError: Výjimka, která nastane, pokud pravidlo nemá název, má neznámý typ, chybí mu vzor nebo obsahuje nevalidní regulární výraz.
+
+        Returns:
+            Vrací list pravidel.
+        """
+        with open(rules_file, "r") as reader:
+            rules = (yaml.safe_load(reader) or {}).get("rules", [])
+        for rule in rules:
+            if "name" not in rule or rule.get("type") not in self.RULE_TYPES:
+                raise ValueError(f"Invalid compliance rule {rule} - name and type ({', '.join(self.RULE_TYPES)}) are required.")
+            if rule["type"] != "section_matches" and "pattern" not in rule:
+                raise ValueError(f"Compliance rule {rule['name']} has no pattern.")
+            if rule["type"] == "section_matches" and not rule.get("section"):
+                raise ValueError(f"Compliance rule {rule['name']} has no section.")
+            for pattern in [rule.get("pattern", "")] + rule.get("section", []) + rule.get("must_contain", []) + rule.get("must_not_contain", []) + rule.get("skip_if", []):
+                try:
+                    re.compile(pattern)
+                except re.error as err:
+                    raise ValueError(f"Compliance rule {rule['name']} has invalid pattern {pattern}: {err}")
+        return rules
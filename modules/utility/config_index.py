@@ -0,0 +1,366 @@
+import hashlib
+import ipaddress
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+
+class ConfigIndex:
+    """
+    Třída, která udržuje invertovaný index (SQLite) nad zálohovanými a exportovanými konfiguracemi. Indexovány jsou řádky konfigurace,
+    jejich tokeny (slova) a IP adresy/prefixy (IPv4 i IPv6, včetně masky nebo wildcard masky v následujícím tokenu). Dotazy typu
+    "která zařízení mají access-list 101" nebo "kde je nakonfigurován prefix 10.1.1.0/24" jsou tak zodpovězeny z indexu, bez procházení souborů.
+
+    Index je aktualizován inkrementálně - soubor (resp. konfigurace) se stejným obsahem (sha256) se znovu neindexuje.
+
+    Args:
+        db_path (Path): cesta k SQLite databázi indexu. Složky jsou vytvořeny, pokud neexistují.
+
+    Attributes:
+        db_path (Path): cesta k SQLite databázi indexu.
+        conn (sqlite3.Connection): spojení s databází (sdílené vlákny nornir runneru).
+        lock (threading.Lock): zámek, který serializuje přístup z více vláken.
+    """
+
+    BACKUP_FILE_PATTERN = re.compile(r"^(?P<host>.+)_(?P<date>\d{4}-\d{2}-\d{2})$")
+    TOKEN_PATTERN = re.compile(r"[^\s;{}\[\]\"]+")
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT NOT NULL UNIQUE,
+            host TEXT NOT NULL,
+            date TEXT NOT NULL,
+            sha256 TEXT NOT NULL,
+            mtime REAL,
+            size INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS documents_host_idx ON documents (host, date);
+        CREATE TABLE IF NOT EXISTS lines (
+            doc_id INTEGER NOT NULL REFERENCES documents(id),
+            line_no INTEGER NOT NULL,
+            line TEXT NOT NULL,
+            PRIMARY KEY (doc_id, line_no)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS postings (
+            term TEXT NOT NULL,
+            doc_id INTEGER NOT NULL REFERENCES documents(id),
+            line_no INTEGER NOT NULL,
+            PRIMARY KEY (term, doc_id, line_no)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS ip_ranges (
+            version INTEGER NOT NULL,
+            range_start TEXT NOT NULL,
+            range_end TEXT NOT NULL,
+            doc_id INTEGER NOT NULL REFERENCES documents(id),
+            line_no INTEGER NOT NULL,
+            PRIMARY KEY (version, range_start, range_end, doc_id, line_no)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS postings_doc_idx ON postings (doc_id);
+        CREATE INDEX IF NOT EXISTS ip_ranges_doc_idx ON ip_ranges (doc_id);
+    """
+
+    def __init__(self, db_path: Path):
+        self._db_path = db_path
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+            self._conn.commit()
+
+    def close(self) -> None:
+        """
+        Metoda pro uzavření spojení s databází.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._conn.close()
+
+    def index_config(self, path: Path, host: str, date: str, config: str) -> bool:
+        """
+        Metoda, která zaindexuje konfiguraci (např. právě zálohovanou running konfiguraci). Předchozí index stejného souboru je nahrazen.
+
+        Args:
+            path (Path): cesta k souboru s konfigurací (identifikátor dokumentu)
+            host (str): jméno hosta
+            date (str): datum konfigurace (YYYY-MM-DD)
+            config (str): konfigurace
+
+        Returns:
+            Vrací True, pokud byla konfigurace zaindexována, nebo False, pokud se obsah od posledního indexování nezměnil.
+        """
+        return self._index_document(path, host, date, config)
+
+    def index_file(self, path: Path, host: Optional[str] = None, date: Optional[str] = None) -> bool:
+        """
+        Metoda, která zaindexuje soubor s konfigurací. Nezměněné soubory (stejný čas změny a velikost) nejsou znovu čteny.
+
+        Args:
+            path (Path): cesta k souboru s konfigurací
+            host (Optional[str]): jméno hosta. Defaultně None (ze jména souboru - {host}_{datum}.conf nebo {host}.conf).
+            date (Optional[str]): datum konfigurace. Defaultně None (ze jména souboru, jinak datum poslední změny souboru).
+
+        Returns:
+            Vrací True, pokud byl soubor zaindexován, jinak False.
+        """
+        stat = path.stat()
+        row = self._query("SELECT mtime, size FROM documents WHERE path = ?", (str(path),))
+        if row and row[0]["mtime"] == stat.st_mtime and row[0]["size"] == stat.st_size:
+            return False
+        match = self.BACKUP_FILE_PATTERN.match(path.stem)
+        if host is None:
+            host = match.group("host") if match else path.stem
+        if date is None:
+            date = match.group("date") if match else datetime.fromtimestamp(stat.st_mtime).date().isoformat()
+        config = path.read_text(encoding="utf-8", errors="replace")
+        return self._index_document(path, host, date, config, stat.st_mtime, stat.st_size)
+
+    def index_directories(self, directories: Iterable[Path], pattern: str = "*.conf") -> int:
+        """
+        Metoda, která zaindexuje všechny konfigurace v daných složkách (rekurzivně) a odstraní z indexu soubory, které už neexistují.
+
+        Args:
+            directories (Iterable[Path]): složky s konfiguracemi (např. backups a export/running_configuration)
+            pattern (str): vzor jmen souborů s konfiguracemi. Defaultně *.conf.
+
+        Returns:
+            Vrací počet nově zaindexovaných (nebo přeindexovaných) souborů.
+        """
+        indexed = 0
+        existing: Set[str] = set()
+        directories = list(directories)
+        for directory in directories:
+            for path in sorted(directory.rglob(pattern)):
+                existing.add(str(path))
+                indexed += self.index_file(path)
+        prefixes = tuple(str(directory) for directory in directories)
+        with self._lock:
+            stale = [row["id"] for row in self._conn.execute("SELECT id, path FROM documents").fetchall()
+                     if row["path"].startswith(prefixes) and row["path"] not in existing]
+            for doc_id in stale:
+                self._delete_document(doc_id)
+            self._conn.commit()
+        return indexed
+
+    def search(self, query: str, host: Optional[str] = None, latest: bool = False,
+               limit: Optional[int] = None) -> List[Dict[str, Union[str, int]]]:
+        """
+        Metoda, která vyhledá řádky konfigurací, které obsahují všechny tokeny dotazu ve stejném pořadí (fráze, bez ohledu na velikost písmen
+        a počet mezer) - např. "access-list 101".
+
+        Args:
+            query (str): hledaná fráze
+            host (Optional[str]): omezení na jednoho hosta. Defaultně None (všichni hosti).
+            latest (bool): jestli se má hledat pouze v nejnovější konfiguraci každého hosta. Defaultně False (všechny konfigurace).
+            limit (Optional[int]): maximální počet vrácených řádků. Defaultně None (bez omezení).
+
+        Returns:
+            Vrací list slovníků (host, date, path, line_no, line) seřazený podle hosta, data a čísla řádku.
+        """
+        terms = self._tokenize(query)
+        if not terms:
+            return []
+        joins = " ".join(f"JOIN postings p{position} ON p{position}.term = ? AND p{position}.doc_id = l.doc_id "
+                         f"AND p{position}.line_no = l.line_no" for position in range(len(set(terms))))
+        rows = self._search_rows(f"SELECT d.host, d.date, d.path, l.line_no, l.line FROM lines l {joins} "
+                                 f"JOIN documents d ON d.id = l.doc_id", list(dict.fromkeys(terms)), host, latest)
+        phrase = " ".join(terms)
+        results = [row for row in rows if f" {phrase} " in f" {' '.join(self._tokenize(row['line']))} "]
+        return results[:limit] if limit is not None else results
+
+    def search_ip(self, prefix: str, host: Optional[str] = None, latest: bool = False,
+                  limit: Optional[int] = None) -> List[Dict[str, Union[str, int]]]:
+        """
+        Metoda, která vyhledá řádky konfigurací s IP adresou nebo prefixem uvnitř daného prefixu (např. 10.1.1.0/24 najde
+        "ip address 10.1.1.1 255.255.255.0", "network 10.1.1.0 0.0.0.255 area 0" i "address 10.1.1.1/24").
+
+        Args:
+            prefix (str): hledaný prefix nebo adresa (IPv4 nebo IPv6)
+            host (Optional[str]): omezení na jednoho hosta. Defaultně None (všichni hosti).
+            latest (bool): jestli se má hledat pouze v nejnovější konfiguraci každého hosta. Defaultně False (všechny konfigurace).
+            limit (Optional[int]): maximální počet vrácených řádků. Defaultně None (bez omezení).
+
+        Raises:
+            ValueError: Výjimka, která nastane, pokud prefix není validní IP adresa nebo prefix.
+
+        Returns:
+            Vrací list slovníků (host, date, path, line_no, line) seřazený podle hosta, data a čísla řádku.
+        """
+        network = ipaddress.ip_network(prefix, strict=False)
+        rows = self._search_rows("SELECT DISTINCT d.host, d.date, d.path, l.line_no, l.line FROM ip_ranges r "
+                                 "JOIN lines l ON l.doc_id = r.doc_id AND l.line_no = r.line_no "
+                                 "JOIN documents d ON d.id = r.doc_id "
+                                 "WHERE r.version = ? AND r.range_start >= ? AND r.range_end <= ?",
+                                 [network.version, self._encode_address(network.network_address),
+                                  self._encode_address(network.broadcast_address)], host, latest, where=True)
+        return rows[:limit] if limit is not None else rows
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Metoda, která vrací velikost indexu.
+
+        Returns:
+            Vrací slovník s počtem dokumentů (documents), hostů (hosts), řádků (lines) a termů (terms).
+        """
+        row = self._query("SELECT (SELECT COUNT(*) FROM documents) AS documents, "
+                          "(SELECT COUNT(DISTINCT host) FROM documents) AS hosts, "
+                          "(SELECT COUNT(*) FROM lines) AS lines, "
+                          "(SELECT COUNT(DISTINCT term) FROM postings) AS terms")[0]
+        return dict(row)
+
+    def _search_rows(self, query: str, params: List, host: Optional[str], latest: bool,
+                     where: bool = False) -> List[Dict[str, Union[str, int]]]:
+        """
+        Metoda, která k dotazu přidá omezení na hosta a nejnovější konfigurace, provede jej a vrátí seřazené výsledky.
+
+        Args:
+            query (str): SQL dotaz (tabulka documents musí mít alias d)
+            params (List): parametry dotazu
+            host (Optional[str]): omezení na jednoho hosta
+            latest (bool): jestli se má hledat pouze v nejnovější konfiguraci každého hosta
+            where (bool): jestli dotaz už obsahuje klauzuli WHERE. Defaultně False.
+
+        Returns:
+            Vrací list slovníků (host, date, path, line_no, line).
+        """
+        conditions = []
+        params = list(params)
+        if host is not None:
+            conditions.append("d.host = ?")
+            params.append(host)
+        if latest:
+            conditions.append("d.date = (SELECT MAX(date) FROM documents latest WHERE latest.host = d.host)")
+        if conditions:
+            query += (" AND " if where else " WHERE ") + " AND ".join(conditions)
+        query += " ORDER BY d.host, d.date, d.path, l.line_no"
+        return [dict(row) for row in self._query(query, tuple(params))]
+
+    def _index_document(self, path: Path, host: str, date: str, config: str, mtime: Optional[float] = None,
+                        size: Optional[int] = None) -> bool:
+        """
+        Metoda, která nahradí index dokumentu (řádky, tokeny a IP rozsahy). Dokument se stejným sha256 se znovu neindexuje.
+
+        Args:
+            path (Path): cesta k souboru s konfigurací
+            host (str): jméno hosta
+            date (str): datum konfigurace
+            config (str): konfigurace
+            mtime (Optional[float]): čas poslední změny souboru. Defaultně None.
+            size (Optional[int]): velikost souboru. Defaultně None.
+
+        Returns:
+            Vrací True, pokud byl dokument zaindexován, jinak False.
+        """
+        sha256 = hashlib.sha256(config.encode("utf-8")).hexdigest()
+        lines = config.splitlines()
+        postings: List[Tuple[str, int]] = []
+        ip_ranges: List[Tuple[int, str, str, int]] = []
+        for line_no, line in enumerate(lines, start=1):
+            tokens = self._tokenize(line)
+            postings.extend((term, line_no) for term in set(tokens))
+            ip_ranges.extend((*ip_range, line_no) for ip_range in self._extract_ip_ranges(tokens))
+        with self._lock:
+            row = self._conn.execute("SELECT id, sha256 FROM documents WHERE path = ?", (str(path),)).fetchone()
+            if row is not None and row["sha256"] == sha256:
+                self._conn.execute("UPDATE documents SET host = ?, date = ?, mtime = ?, size = ? WHERE id = ?",
+                                   (host, date, mtime, size, row["id"]))
+                self._conn.commit()
+                return False
+            if row is not None:
+                self._delete_document(row["id"])
+            doc_id = self._conn.execute("INSERT INTO documents (path, host, date, sha256, mtime, size) VALUES (?, ?, ?, ?, ?, ?)",
+                                        (str(path), host, date, sha256, mtime, size)).lastrowid
+            self._conn.executemany("INSERT INTO lines (doc_id, line_no, line) VALUES (?, ?, ?)",
+                                   [(doc_id, line_no, line) for line_no, line in enumerate(lines, start=1)])
+            self._conn.executemany("INSERT INTO postings (term, doc_id, line_no) VALUES (?, ?, ?)",
+                                   [(term, doc_id, line_no) for term, line_no in postings])
+            self._conn.executemany("INSERT OR IGNORE INTO ip_ranges (version, range_start, range_end, doc_id, line_no) "
+                                   "VALUES (?, ?, ?, ?, ?)",
+                                   [(version, start, end, doc_id, line_no) for version, start, end, line_no in ip_ranges])
+            self._conn.commit()
+        return True
+
+    def _delete_document(self, doc_id: int) -> None:
+        for table in ("lines", "postings", "ip_ranges"):
+            self._conn.execute(f"DELETE FROM {table} WHERE doc_id = ?", (doc_id,))
+        self._conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+    def _tokenize(self, line: str) -> List[str]:
+        return self.TOKEN_PATTERN.findall(line.lower())
+
+    def _extract_ip_ranges(self, tokens: List[str]) -> List[Tuple[int, str, str]]:
+        """
+        Metoda, která z tokenů řádku získá rozsahy IP adres - samotnou adresu a případně i síť (prefix, maska nebo wildcard maska
+        v následujícím tokenu).
+
+        Args:
+            tokens (List[str]): tokeny řádku
+
+        Returns:
+            Vrací list trojic (verze, začátek rozsahu, konec rozsahu) - adresy zakódované pomocí _encode_address.
+        """
+        ip_ranges = []
+        mask_positions = set()
+        for position, token in enumerate(tokens):
+            if position in mask_positions or not any(char in token for char in ".:") or not token[0].isalnum():
+                continue
+            try:
+                interface = ipaddress.ip_interface(token)
+            except ValueError:
+                continue
+            networks = [ipaddress.ip_network(interface.ip)]
+            if "/" in token:
+                networks.append(interface.network)
+            elif interface.version == 4 and position + 1 < len(tokens):
+                mask_network = self._get_masked_network(interface.ip, tokens[position + 1])
+                if mask_network is not None:
+                    networks.append(mask_network)
+                    mask_positions.add(position + 1)
+            for network in networks:
+                ip_ranges.append((network.version, self._encode_address(network.network_address),
+                                  self._encode_address(network.broadcast_address)))
+        return ip_ranges
+
+    def _get_masked_network(self, address: ipaddress.IPv4Address,
+                            mask: str) -> Optional[ipaddress.IPv4Network]:
+        """
+        Metoda, která vrací síť dané adresy, pokud je následující token maska (255.255.255.0) nebo wildcard maska (0.0.0.255).
+
+        Args:
+            address (ipaddress.IPv4Address): IPv4 adresa
+            mask (str): následující token
+
+        Returns:
+            Vrací síť nebo None (token není maska).
+        """
+        if mask.count(".") != 3:
+            return None
+        try:
+            return ipaddress.ip_network(f"{address}/{mask}", strict=False)  # ipaddress podporuje masku i wildcard masku
+        except ValueError:
+            return None
+
+    def _encode_address(self, address: Union[ipaddress.IPv4Address, ipaddress.IPv6Address]) -> str:
+        return f"{int(address):032x}"  # IPv6 adresy se nevejdou do INTEGER - hex string se stejnou délkou zachovává pořadí
+
+    def _query(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """
+        Metoda, která provede SQL dotaz.
+
+        Args:
+            query (str): SQL dotaz
+            params (tuple): parametry dotazu
+
+        Returns:
+            Vrací list řádků výsledku.
+        """
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
@@ -0,0 +1,281 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from modules.utility.json_serializer import JSONSerializer
+
+
+class ConfigNode:
+    """
+    Uzel hierarchického stromu konfigurace - řádek konfigurace (např. "interface FastEthernet0/0", "unit 0")
+    a jeho podřízené řádky. Kořen stromu má prázdný text.
+
+    Args:
+        text (str): text řádku (bez odsazení, u Junos bez ";" a "{").
+        children (Optional[List[ConfigNode]]): podřízené uzly. Defaultně None (bez podřízených uzlů).
+
+    Attributes:
+        text (str): text řádku.
+        children (List[ConfigNode]): podřízené uzly.
+    """
+
+    def __init__(self, text: str = "", children: Optional[List["ConfigNode"]] = None):
+        self.text = text
+        self.children = children if children is not None else []
+
+    def get(self, *path: str) -> Optional["ConfigNode"]:
+        """
+        Metoda, která vrací uzel podle cesty přesných textů - např. root.get("interfaces", "em0", "unit 0").
+
+        Args:
+            *path (str): texty uzlů od tohoto uzlu dolů
+
+        Returns:
+            Vrací nalezený uzel nebo None.
+        """
+        node = self
+        for text in path:
+            node = next((child for child in node.children if child.text == text), None)
+            if node is None:
+                return None
+        return node
+
+    def find_children(self, pattern: str) -> List["ConfigNode"]:
+        """
+        Metoda, která vrací přímé podřízené uzly, jejichž text odpovídá regulárnímu výrazu (re.search) - např. root.find_children(r"^interface ").
+
+        Args:
+            pattern (str): regulární výraz
+
+        Returns:
+            Vrací list nalezených uzlů.
+        """
+        regex = re.compile(pattern)
+        return [child for child in self.children if regex.search(child.text)]
+
+    def find(self, pattern: str) -> List[Tuple[Tuple[str, ...], "ConfigNode"]]:
+        """
+        Metoda, která v celém podstromu vyhledá uzly, jejichž text odpovídá regulárnímu výrazu (re.search).
+
+        Args:
+            pattern (str): regulární výraz
+
+        Returns:
+            Vrací list dvojic (cesta k uzlu - texty nadřazených uzlů včetně uzlu samotného, uzel).
+        """
+        regex = re.compile(pattern)
+        return [(path, node) for path, node in self.walk() if regex.search(node.text)]
+
+    def walk(self) -> Iterator[Tuple[Tuple[str, ...], "ConfigNode"]]:
+        """
+        Metoda, která prochází podstrom do hloubky (bez tohoto uzlu).
+
+        Returns:
+            Vrací iterátor dvojic (cesta k uzlu, uzel).
+        """
+        stack = [((child.text,), child) for child in reversed(self.children)]
+        while stack:
+            path, node = stack.pop()
+            yield path, node
+            stack.extend((path + (child.text,), child) for child in reversed(node.children))
+
+    def to_lines(self, indent: str = " ", level: int = 0) -> List[str]:
+        """
+        Metoda, která převede podstrom zpět na odsazené řádky (bez tohoto uzlu).
+
+        Args:
+            indent (str): odsazení jedné úrovně. Defaultně jedna mezera (IOS).
+            level (int): počáteční úroveň odsazení. Defaultně 0.
+
+        Returns:
+            Vrací list řádků.
+        """
+        lines = []
+        for path, node in self.walk():
+            lines.append(f"{indent * (level + len(path) - 1)}{node.text}")
+        return lines
+
+    def to_dict(self) -> Dict[str, Any]:
+        node = {"text": self.text}
+        if self.children:
+            node["children"] = [child.to_dict() for child in self.children]
+        return node
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConfigNode":
+        return cls(data["text"], [cls.from_dict(child) for child in data.get("children", [])])
+
+    def __repr__(self) -> str:
+        return f"ConfigNode({self.text!r}, children={len(self.children)})"
+
+
+class ConfigTreeParser:
+    """
+    Třída, která převádí running konfigurace (Cisco IOS - odsazení, Juniper Junos - složené závorky) na hierarchický strom (ConfigNode).
+    Zparsované stromy jsou ukládány na disk (JSON) pod sha256 hashem konfigurace, takže každá unikátní konfigurace je parsována
+    pouze jednou - opakované dotazy (compliance, offline diff, kontrola idempotence) načítají strom z cache.
+
+    Args:
+        cache_dir (Optional[Path]): složka cache zparsovaných stromů. Defaultně None (./export/config_trees).
+        serializer (JSONSerializer): objekt pro (de)serializaci stromů. Defaultně None (orjson, pokud je nainstalován, jinak json).
+
+    Attributes:
+        cache_dir (Path): složka cache zparsovaných stromů.
+        serializer (JSONSerializer): objekt pro (de)serializaci stromů.
+        memory_cache (Dict[str, ConfigNode]): stromy zparsované (načtené) tímto objektem - hash -> strom.
+        lock (threading.Lock): zámek pro přístup k memory_cache z více vláken.
+    """
+
+    PARSER_VERSION = 1  # součást klíče cache - po změně parseru se konfigurace zparsují znovu
+    IOS_SKIPPED_LINES = re.compile(r"^(!.*|end|Building configuration.*|Current configuration.*)$")
+    IOS_BANNER = re.compile(r"^banner \S+ (\^C|\S)(.*)$")
+    JUNOS_COMMENT = re.compile(r"\s*##.*$")
+
+    def __init__(self, cache_dir: Optional[Path] = None, serializer: JSONSerializer = None):
+        self._cache_dir = cache_dir or Path(Path.cwd() / "export" / "config_trees")
+        self._serializer = serializer or JSONSerializer(sort_keys=False)
+        self._memory_cache: Dict[str, ConfigNode] = {}
+        self._lock = threading.Lock()
+
+    def parse(self, config: str, vendor: Optional[str] = None) -> ConfigNode:
+        """
+        Metoda, která vrací strom konfigurace - z cache (paměť, disk), případně konfiguraci zparsuje a strom uloží do cache.
+
+        Args:
+            config (str): running konfigurace
+            vendor (Optional[str]): výrobce (cisco nebo juniper). Defaultně None (určen podle syntaxe konfigurace).
+
+        Returns:
+            Vrací kořen stromu konfigurace.
+        """
+        vendor = vendor or self.detect_vendor(config)
+        key = hashlib.sha256(f"{self.PARSER_VERSION}\n{vendor}\n{config}".encode("utf-8")).hexdigest()
+        with self._lock:
+            tree = self._memory_cache.get(key)
+        if tree is not None:
+            return tree
+        cache_file = self._cache_dir / key[:2] / f"{key}.json"
+        if cache_file.exists():
+            tree = ConfigNode.from_dict(self._serializer.loads(cache_file.read_bytes()))
+        else:
+            tree = self.parse_junos(config) if vendor == "juniper" else self.parse_ios(config)
+            self._write_cache(cache_file, tree)
+        with self._lock:
+            self._memory_cache[key] = tree
+        return tree
+
+    def parse_file(self, file_path: Path, vendor: Optional[str] = None) -> ConfigNode:
+        """
+        Metoda, která vrací strom konfigurace uložené v souboru (např. backups/R1/R1_2021-04-07.conf).
+
+        Args:
+            file_path (Path): cesta k souboru s konfigurací
+            vendor (Optional[str]): výrobce (cisco nebo juniper). Defaultně None (určen podle syntaxe konfigurace).
+
+        Returns:
+            Vrací kořen stromu konfigurace.
+        """
+        return self.parse(file_path.read_text(encoding="utf-8", errors="replace"), vendor)
+
+    def detect_vendor(self, config: str) -> str:
+        """
+        Metoda, která podle syntaxe určí výrobce - Junos konfigurace obsahuje sekce ukončené "{".
+
+        Args:
+            config (str): running konfigurace
+
+        Returns:
+            Vrací juniper nebo cisco.
+        """
+        return "juniper" if re.search(r"^\S.*\{\s*$", config, re.MULTILINE) else "cisco"
+
+    def parse_ios(self, config: str) -> ConfigNode:
+        """
+        Metoda, která zparsuje Cisco IOS konfiguraci podle odsazení. Řádky "!" a "end" jsou vynechány, bannery jsou uloženy
+        jako jeden uzel s řádky banneru jako podřízenými uzly.
+
+        Args:
+            config (str): running konfigurace
+
+        Returns:
+            Vrací kořen stromu konfigurace.
+        """
+        root = ConfigNode()
+        stack: List[Tuple[int, ConfigNode]] = [(-1, root)]
+        lines = iter(config.splitlines())
+        for line in lines:
+            text = line.strip()
+            if not text or self.IOS_SKIPPED_LINES.match(text):
+                continue
+            indent = len(line) - len(line.lstrip(" "))
+            while stack[-1][0] >= indent:
+                stack.pop()
+            node = ConfigNode(text)
+            stack[-1][1].children.append(node)
+            stack.append((indent, node))
+            banner = self.IOS_BANNER.match(text) if indent == 0 else None
+            if banner and banner.group(1) not in banner.group(2):
+                for banner_line in lines:  # obsah banneru se neparsuje (může obsahovat "!" i libovolné odsazení)
+                    if banner.group(1) in banner_line:
+                        head = banner_line.split(banner.group(1), 1)[0]
+                        if head:
+                            node.children.append(ConfigNode(head))
+                        break
+                    node.children.append(ConfigNode(banner_line))
+        return root
+
+    def parse_junos(self, config: str) -> ConfigNode:
+        """
+        Metoda, která zparsuje Juniper Junos konfiguraci podle složených závorek. Komentáře (/* */, #, ##) jsou vynechány.
+
+        Args:
+            config (str): running konfigurace
+
+        Returns:
+            Vrací kořen stromu konfigurace.
+        """
+        root = ConfigNode()
+        stack = [root]
+        in_comment = False
+        for line in config.splitlines():
+            text = line.strip()
+            if in_comment:
+                in_comment = "*/" not in text
+                continue
+            if text.startswith("/*"):
+                in_comment = "*/" not in text
+                continue
+            if not text or text.startswith("#"):
+                continue
+            text = self.JUNOS_COMMENT.sub("", text)
+            if text == "}":
+                if len(stack) > 1:
+                    stack.pop()
+            elif text.endswith("{"):
+                node = ConfigNode(text[:-1].rstrip())
+                stack[-1].children.append(node)
+                stack.append(node)
+            else:
+                stack[-1].children.append(ConfigNode(text.rstrip(";").rstrip()))
+        return root
+
+    def _write_cache(self, cache_file: Path, tree: ConfigNode) -> None:
+        """
+        Metoda, která atomicky uloží strom do cache (dočasný soubor a os.replace - souběžné procesy nikdy nenačtou rozepsaný soubor).
+
+        Args:
+            cache_file (Path): cesta k souboru cache
+            tree (ConfigNode): kořen stromu konfigurace
+
+        Returns:
+            None
+        """
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(cache_file.parent), prefix=f".{cache_file.name}.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+            tmp_file.write(self._serializer.dumps(tree.to_dict()))
+        os.replace(tmp_path, str(cache_file))
@@ -0,0 +1,134 @@
+import time
+from typing import Dict, List, Optional, Union
+
+from colorama import Fore
+from nornir.core import Nornir
+from nornir.core.task import Result, Task
+from nornir_utils.plugins.functions import print_title
+
+from modules.utility.metrics_endpoint import MetricsStore
+
+
+class ConnectionPrewarmer:
+    """
+    Třída, která před samotnými nornir úkoly paralelně otevře všechna potřebná spojení (NAPALM, Netmiko) ke všem zařízením.
+    Latence SSH a autentizace se tak nezapočítává do konfiguračních úkolů a nedostupná zařízení jsou odhalena ještě před nimi.
+    Pro každého hosta a plugin je zaznamenána doba navázání spojení. Nedostupní hosti jsou z dalších úkolů vyřazeni.
+
+    Otevřená spojení zůstávají uložena v Host objektech, takže je využívají všechny Nornir objekty vzniklé filtrováním.
+
+    Args:
+        connections (Optional[Dict[str, List[str]]]): slovník platforma -> potřebné connection pluginy. Defaultně None (CONNECTIONS).
+        metrics_store (Optional[MetricsStore]): úložiště metrik, do kterého se zapisují doby navázání spojení. Defaultně None.
+
+    Attributes:
+        connections (Dict[str, List[str]]): slovník platforma -> potřebné connection pluginy (klíč "default" pro ostatní platformy).
+        metrics_store (Optional[MetricsStore]): úložiště metrik.
+        latencies (Dict[str, Dict[str, Union[float, str]]]): host -> plugin -> doba navázání spojení v sekundách (nebo chybová zpráva).
+    """
+
+    CONNECTIONS = {
+        "linux": ["netmiko"],
+        "default": ["napalm", "netmiko"],
+    }
+
+    def __init__(self, connections: Optional[Dict[str, List[str]]] = None, metrics_store: Optional[MetricsStore] = None):
+        self._connections = connections or dict(self.CONNECTIONS)
+        self._metrics_store = metrics_store
+        self._latencies: Dict[str, Dict[str, Union[float, str]]] = {}
+
+    def prewarm(self, nornir_devices: Nornir) -> Nornir:
+        """
+        Metoda, která paralelně otevře spojení ke všem zařízením, vypíše report a vrátí Nornir objekt bez nedostupných zařízení.
+
+        Args:
+            nornir_devices (Nornir): Nornir objekt, umožňující volat paralelně nornir úkoly (tasky) a agregovat výsledky z jednotlivých tasků pro daná zařízení.
+
+        Returns:
+            Vrací Nornir objekt, který obsahuje pouze zařízení, ke kterým se podařilo otevřít všechna potřebná spojení.
+        """
+        started = time.perf_counter()
+        nornir_devices.run(task=self.open_connections, name="Pre-warm connections")
+        elapsed = time.perf_counter() - started
+        unreachable = set(self.get_unreachable_hosts())
+        self.print_report(elapsed)
+        return nornir_devices.filter(filter_func=lambda host: host.name not in unreachable)
+
+    def open_connections(self, task: Task) -> Result:
+        """
+        Nornir úkol, který otevře všechna potřebná spojení k hostovi a změří dobu jejich navázání.
+
+        Args:
+            task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
+
+        Returns:
+            Vrací Result objekt se slovníkem plugin -> doba navázání spojení (nebo chybová zpráva). Úkol je neúspěšný, pokud se nepodařilo otevřít některé spojení.
+        """
+        plugins = self._connections.get(task.host.platform, self._connections.get("default", []))
+        latencies: Dict[str, Union[float, str]] = {}
+        for plugin in plugins:
+            started = time.perf_counter()
+            try:
+                task.host.get_connection(plugin, task.nornir.config)
+            except Exception as err:
+                latencies[plugin] = f"{type(err).__name__}: {err}"
+                break  # nedostupné zařízení - další pluginy by čekaly na stejný timeout
+            latencies[plugin] = time.perf_counter() - started
+            if self._metrics_store is not None:
+                self._metrics_store.set("connect_latency_seconds", latencies[plugin],
+                                        {"host": task.host.name, "plugin": plugin},
+                                        "Time needed to open the connection to the device.")
+        self._latencies[task.host.name] = latencies
+        failed = any(isinstance(latency, str) for latency in latencies.values())
+        return Result(host=task.host, result=latencies, failed=failed)
+
+    def get_latencies(self) -> Dict[str, Dict[str, Union[float, str]]]:
+        """
+        Metoda, která vrací doby navázání spojení.
+
+        Returns:
+            Vrací slovník host -> plugin -> doba navázání spojení v sekundách (nebo chybová zpráva).
+        """
+        return {host: dict(latencies) for host, latencies in self._latencies.items()}
+
+    def get_unreachable_hosts(self) -> List[str]:
+        """
+        Metoda, která vrací hosty, ke kterým se nepodařilo otevřít některé spojení.
+
+        Returns:
+            Vrací list jmen nedostupných hostů.
+        """
+        return [host for host, latencies in self._latencies.items()
+                if any(isinstance(latency, str) for latency in latencies.values())]
+
+    def print_report(self, elapsed: Optional[float] = None) -> None:
+        """
+        Metoda, která vypíše doby navázání spojení jednotlivých hostů, nedostupné hosty a souhrn (medián a maximum) pro každý plugin.
+
+        Args:
+            elapsed (Optional[float]): celková doba pre-warm fáze v sekundách. Defaultně None (nevypisuje se).
+
+        Returns:
+            None
+        """
+        print_title("Connection pre-warm report")
+        plugin_latencies: Dict[str, List[float]] = {}
+        for host in sorted(self._latencies):
+            latencies = self._latencies[host]
+            errors = {plugin: latency for plugin, latency in latencies.items() if isinstance(latency, str)}
+            timings = ", ".join(f"{plugin} {latency:.2f} s" for plugin, latency in latencies.items()
+                                if not isinstance(latency, str))
+            for plugin, latency in latencies.items():
+                if not isinstance(latency, str):
+                    plugin_latencies.setdefault(plugin, []).append(latency)
+            if errors:
+                reasons = "; ".join(f"{plugin}: {error}" for plugin, error in errors.items())
+                print(f"{Fore.RED}{host}: unreachable - excluded from next tasks ({reasons})")
+            else:
+                print(f"{Fore.GREEN}{host}: {timings}")
+        for plugin, values in sorted(plugin_latencies.items()):
+            values.sort()
+            print(f"{plugin}: {len(values)} connections, median {values[len(values) // 2]:.2f} s, max {values[-1]:.2f} s")
+        unreachable = self.get_unreachable_hosts()
+        summary = f"Reachable hosts: {len(self._latencies) - len(unreachable)}/{len(self._latencies)}"
+        print(summary + (f", pre-warm took {elapsed:.2f} s." if elapsed is not None else "."))
@@ -0,0 +1,197 @@
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class CounterRateCalculator:
+    """
+    Třída, která z kumulativních statistik rozhraní (NAPALM getter interfaces_counters) počítá rychlosti za sekundu.
+    Předchozí vzorky jsou uloženy v NumPy polích indexovaných dvojicí (host, rozhraní) a statistikou, takže výpočet
+    rychlostí včetně detekce přetečení (32/64 bitových) čítačů a jejich resetu probíhá vektorově pro celou síť najednou.
+
+    Args:
+        counters (List[str]): názvy statistik, pro které se počítají rychlosti. Defaultně None (všechny statistiky NAPALM getteru interfaces_counters).
+        max_rate (Optional[float]): maximální uvěřitelná rychlost (za sekundu). Vyšší rychlost je považována za reset čítače. Defaultně None (bez omezení).
+
+    Attributes:
+        counters (List[str]): názvy statistik, pro které se počítají rychlosti.
+        max_rate (Optional[float]): maximální uvěřitelná rychlost.
+        rows (Dict[Tuple[str, str], int]): mapování (host, rozhraní) -> řádek v polích values a times.
+        host_rows (Dict[str, Tuple[Tuple[str, ...], np.ndarray]]): cache - rozhraní hosta a jejich řádky (při nezměněných rozhraních se index nepřepočítává).
+        values (np.ndarray): poslední vzorky čítačů (řádky = (host, rozhraní), sloupce = statistiky).
+        present (np.ndarray): určuje, jestli je v poli values platný vzorek (False = bez vzorku nebo nepodporovaná statistika).
+        times (np.ndarray): časy posledních vzorků (unix timestamp) pro jednotlivé řádky.
+    """
+
+    COUNTERS = ["rx_broadcast_packets", "rx_discards", "rx_errors", "rx_multicast_packets", "rx_octets",
+                "rx_unicast_packets", "tx_broadcast_packets", "tx_discards", "tx_errors", "tx_multicast_packets",
+                "tx_octets", "tx_unicast_packets"]
+
+    _MAX32 = np.uint64(2 ** 32 - 1)
+    _WRAP32 = np.uint64(2 ** 32)
+    _HALF32 = np.uint64(2 ** 31)
+    _HALF64 = np.uint64(2 ** 63)
+
+    def __init__(self, counters: Optional[List[str]] = None, max_rate: Optional[float] = None):
+        self._counters = counters or list(self.COUNTERS)
+        self._max_rate = max_rate
+        self._getter = itemgetter(*self._counters)
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self._host_rows: Dict[str, Tuple[Tuple[str, ...], np.ndarray]] = {}
+        self._values = np.zeros((0, len(self._counters)), dtype=np.uint64)
+        self._present = np.zeros((0, len(self._counters)), dtype=bool)
+        self._times = np.zeros(0, dtype=np.float64)
+
+    @property
+    def counters(self) -> List[str]:
+        return list(self._counters)
+
+    def update(self, samples: Dict[str, Dict[str, Dict[str, int]]],
+               timestamps: Dict[str, float]) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Metoda, která zpracuje nové vzorky čítačů a vrátí rychlosti za sekundu vůči předchozím vzorkům.
+
+        Args:
+            samples (Dict[str, Dict[str, Dict[str, int]]]): slovník host -> výstup NAPALM getteru interfaces_counters (rozhraní -> statistiky).
+            timestamps (Dict[str, float]): slovník host -> čas získání vzorku (unix timestamp).
+
+        Returns:
+            Vrací slovník host -> rozhraní -> statistika -> rychlost za sekundu. Rozhraní bez předchozího vzorku
+            a nepodporované statistiky (hodnota -1) nejsou ve výsledku obsaženy.
+        """
+        if not samples:
+            return {}
+        hosts = list(samples.keys())
+        rows = np.concatenate([self._get_host_rows(host, samples[host]) for host in hosts])
+        row_times = np.concatenate([np.full(len(self._host_rows[host][1]), timestamps[host], dtype=np.float64)
+                                    for host in hosts])
+        current, current_present = self._flatten(samples, hosts)
+
+        rates, valid = self.compute_rates(self._values[rows], self._present[rows], current, current_present,
+                                          row_times - self._times[rows])
+
+        self._values[rows] = current
+        self._present[rows] = current_present
+        self._times[rows] = row_times
+        return self._to_dict(hosts, rates, valid)
+
+    def compute_rates(self, previous: np.ndarray, previous_present: np.ndarray, current: np.ndarray,
+                      current_present: np.ndarray, elapsed: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Metoda, která vektorově spočítá rychlosti čítačů. Pokles hodnoty čítače je vyhodnocen jako přetečení
+        (32 bitového čítače, pokud se předchozí hodnota vejde do 32 bitů, jinak 64 bitového). Pokud by přetečení
+        znamenalo nárůst o více než polovinu rozsahu čítače (nebo rychlost vyšší než max_rate), jde o reset čítače a
+        jako přírůstek je použita aktuální hodnota.
+
+        Args:
+            previous (np.ndarray): předchozí hodnoty čítačů (uint64).
+            previous_present (np.ndarray): platnost předchozích hodnot.
+            current (np.ndarray): aktuální hodnoty čítačů (uint64).
+            current_present (np.ndarray): platnost aktuálních hodnot.
+            elapsed (np.ndarray): uplynulý čas (v sekundách) od předchozího vzorku pro každý řádek.
+
+        Returns:
+            Vrací dvojici (rates, valid) - pole rychlostí za sekundu a pole booleovských hodnot, které určuje platné rychlosti.
+        """
+        elapsed = elapsed.reshape(-1, 1)
+        valid = previous_present & current_present & (elapsed > 0)
+        prev = np.where(valid, previous, np.uint64(0))
+        cur = np.where(valid, current, np.uint64(0))
+
+        delta = cur - prev  # uint64 aritmetika = přetečení 64 bitového čítače je ošetřeno automaticky
+        decreased = cur < prev
+        counter32 = prev <= self._MAX32
+        delta = np.where(decreased & counter32, (self._WRAP32 - prev) + cur, delta)
+        reset = decreased & np.where(counter32, delta > self._HALF32, delta > self._HALF64)
+        delta = np.where(reset, cur, delta)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = delta.astype(np.float64) / elapsed
+        if self._max_rate is not None:
+            implausible = decreased & (rates > self._max_rate)
+            rates = np.where(implausible, cur.astype(np.float64) / elapsed, rates)
+        return rates, valid
+
+    def _get_host_rows(self, host: str, interfaces: Dict[str, Dict[str, int]]) -> np.ndarray:
+        """
+        Metoda, která vrací řádky polí values/times pro rozhraní hosta. Pokud se rozhraní hosta nezměnila, je použit
+        cachovaný index. Nová rozhraní jsou do polí přidána.
+
+        Args:
+            host (str): jméno hosta
+            interfaces (Dict[str, Dict[str, int]]): statistiky rozhraní hosta
+
+        Returns:
+            Vrací pole indexů řádků (ve stejném pořadí jako interfaces).
+        """
+        interface_names = tuple(interfaces.keys())
+        cached = self._host_rows.get(host)
+        if cached is not None and cached[0] == interface_names:
+            return cached[1]
+        new_keys = [(host, name) for name in interface_names if (host, name) not in self._rows]
+        if new_keys:
+            start = len(self._rows)
+            for offset, key in enumerate(new_keys):
+                self._rows[key] = start + offset
+            self._values = np.vstack([self._values, np.zeros((len(new_keys), len(self._counters)), dtype=np.uint64)])
+            self._present = np.vstack([self._present, np.zeros((len(new_keys), len(self._counters)), dtype=bool)])
+            self._times = np.concatenate([self._times, np.zeros(len(new_keys), dtype=np.float64)])
+        rows = np.fromiter((self._rows[(host, name)] for name in interface_names), dtype=np.int64,
+                           count=len(interface_names))
+        self._host_rows[host] = (interface_names, rows)
+        return rows
+
+    def _flatten(self, samples: Dict[str, Dict[str, Dict[str, int]]], hosts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Metoda, která převede vzorky na 2D pole (řádky = (host, rozhraní), sloupce = statistiky).
+
+        Args:
+            samples (Dict[str, Dict[str, Dict[str, int]]]): slovník host -> rozhraní -> statistiky
+            hosts (List[str]): pořadí hostů
+
+        Returns:
+            Vrací dvojici 2D polí - hodnoty čítačů (uint64) a jejich platnost (NAPALM vrací -1 pro nepodporované statistiky).
+        """
+        getter = self._getter if len(self._counters) > 1 else (lambda data: (self._getter(data),))
+        flat = list(chain.from_iterable(getter(data) for host in hosts for data in samples[host].values()))
+        shape = (-1, len(self._counters))
+        try:
+            values = np.array(flat, dtype=np.int64)
+            present = values >= 0
+            values = np.where(present, values, 0).astype(np.uint64)
+        except OverflowError:
+            # hodnoty 64 bitových čítačů nad 2^63 se do int64 nevejdou
+            present = np.array([value >= 0 for value in flat], dtype=bool)
+            values = np.array([value if value >= 0 else 0 for value in flat], dtype=np.uint64)
+        return values.reshape(shape), present.reshape(shape)
+
+    def _to_dict(self, hosts: List[str], rates: np.ndarray,
+                 valid: np.ndarray) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Metoda, která převede pole rychlostí zpět na slovník.
+
+        Args:
+            hosts (List[str]): pořadí hostů
+            rates (np.ndarray): rychlosti za sekundu
+            valid (np.ndarray): platné rychlosti
+
+        Returns:
+            Vrací slovník host -> rozhraní -> statistika -> rychlost za sekundu.
+        """
+        result = {}
+        position = 0
+        rates_lst = rates.tolist()
+        valid_lst = valid.tolist()
+        for host in hosts:
+            interface_names = self._host_rows[host][0]
+            host_rates = {}
+            for name in interface_names:
+                row_rates = {counter: rate for counter, rate, ok in
+                             zip(self._counters, rates_lst[position], valid_lst[position]) if ok}
+                if row_rates:
+                    host_rates[name] = row_rates
+                position += 1
+            result[host] = host_rates
+        return result
@@ -0,0 +1,247 @@
+import gzip
+import os
+import queue
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from colorama import Fore
+from nornir_utils.plugins.functions import print_title
+
+try:
+    import zstandard
+except ImportError:  # zstandard je volitelná závislost - bez ní je k dispozici pouze komprese gzip
+    zstandard = None
+
+
+class ExportWriter:
+    """
+    Třída, která zapisuje exportovaná data na disk v samostatném zapisovacím vlákně. Pracovní vlákna nornir runneru data pouze vloží
+    do fronty (submit) a pokračují v komunikaci se zařízeními - pomalý disk tak nikdy nebrzdí nornir úkoly. Každý soubor je zapsán
+    atomicky (nejprve do dočasného souboru ve stejné složce, poté přejmenován pomocí os.replace), takže čtenář nikdy neuvidí
+    rozepsaný soubor. Data lze volitelně komprimovat (gzip, zstd - ke jménu souboru je přidána přípona .gz/.zst).
+
+    Args:
+        compression (Optional[str]): komprese zapisovaných souborů (gzip nebo zstd). Defaultně None (bez komprese).
+        compression_level (Optional[int]): úroveň komprese. Defaultně None (výchozí úroveň dané komprese).
+
+    Attributes:
+        compression (Optional[str]): komprese zapisovaných souborů.
+        compression_level (Optional[int]): úroveň komprese.
+        queue (queue.Queue): fronta souborů čekajících na zápis (cesta, data, append).
+        thread (Optional[threading.Thread]): zapisovací vlákno (None = writer neběží).
+        files (int): počet zapsaných souborů.
+        bytes_in (int): velikost zapsaných dat před kompresí (v bajtech).
+        bytes_out (int): velikost zapsaných souborů (v bajtech).
+        errors (List[Tuple[Path, str]]): soubory, které se nepodařilo zapsat (cesta, chybová zpráva).
+        started (float): čas spuštění writeru.
+        lock (threading.Lock): zámek pro přístup ke statistikám.
+    """
+
+    COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+    def __init__(self, compression: Optional[str] = None, compression_level: Optional[int] = None):
+        if compression is not None and compression not in self.COMPRESSIONS:
+            raise ValueError(f"Unknown compression {compression}. Supported compressions: {', '.join(self.COMPRESSIONS)}.")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("Compression zstd requires the zstandard package.")
+        self._compression = compression
+        self._compression_level = compression_level
+        self._queue: "queue.Queue[Optional[Tuple[Path, bytes, bool]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._files = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._errors: List[Tuple[Path, str]] = []
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        """
+        Metoda, která spustí zapisovací vlákno.
+
+        Returns:
+            None
+        """
+        if self.running:
+            return
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._write_loop, name="export-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, file_path: Path, content: Union[str, bytes], append: bool = False) -> Path:
+        """
+        Metoda, která vloží data do fronty k zápisu a ihned se vrátí (zápis proběhne v zapisovacím vlákně).
+        Pokud writer ještě neběží, je spuštěn.
+
+        Args:
+            file_path (Path): cesta k cílovému souboru (bez přípony komprese)
+            content (Union[str, bytes]): zapisovaná data (string je zakódován v UTF-8)
+            append (bool): jestli se mají data přidat na konec existujícího souboru. Defaultně False.
+
+        Raises:
+            ValueError: Výjimka, která nastane, pokud je požadováno přidání dat do komprimovaného souboru.
+
+        Returns:
+            Vrací výslednou cestu k souboru (včetně přípony komprese).
+        """
+        if append and self._compression is not None:
+            raise ValueError("Appending to compressed export files is not supported.")
+        self.start()
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        self._queue.put((file_path, data, append))
+        return self.get_output_path(file_path)
+
+    def get_output_path(self, file_path: Path) -> Path:
+        """
+        Metoda, která vrací výslednou cestu k souboru (včetně přípony komprese).
+
+        Args:
+            file_path (Path): cesta k cílovému souboru (bez přípony komprese)
+
+        Returns:
+            Vrací výslednou cestu k souboru.
+        """
+        if self._compression is None:
+            return file_path
+        return file_path.with_name(file_path.name + self.COMPRESSIONS[self._compression])
+
+    def flush(self) -> None:
+        """
+        Metoda, která počká, než jsou zapsána všechna data vložená do fronty.
+
+        Returns:
+            None
+        """
+        if self.running:
+            self._queue.join()
+
+    def close(self) -> None:
+        """
+        Metoda, která zapíše zbývající data a ukončí zapisovací vlákno.
+
+        Returns:
+            None
+        """
+        if not self.running:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def get_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Metoda, která vrací statistiky zápisu.
+
+        Returns:
+            Vrací slovník s počtem zapsaných souborů (files), velikostí dat před kompresí (bytes_in), velikostí zapsaných souborů (bytes_out),
+            počtem chyb (errors) a dobou běhu writeru v sekundách (elapsed).
+        """
+        with self._lock:
+            return {"files": self._files, "bytes_in": self._bytes_in, "bytes_out": self._bytes_out,
+                    "errors": len(self._errors), "elapsed": time.perf_counter() - self._started}
+
+    def get_errors(self) -> List[Tuple[Path, str]]:
+        """
+        Metoda, která vrací soubory, které se nepodařilo zapsat (úplný seznam je k dispozici až po flush/close).
+
+        Returns:
+            Vrací list dvojic (cesta, chybová zpráva).
+        """
+        with self._lock:
+            return list(self._errors)
+
+    def print_report(self) -> None:
+        """
+        Metoda, která vypíše souhrn zápisu (počet souborů, objem dat, kompresní poměr) a soubory, které se nepodařilo zapsat.
+
+        Returns:
+            None
+        """
+        stats = self.get_stats()
+        print_title("Export writer report")
+        errors = self.get_errors()
+        for file_path, error in errors:
+            print(f"{Fore.RED}Export of {file_path} failed - {error}")
+        summary = f"Exported {stats['files']} files, {stats['bytes_in']} B"
+        if self._compression is not None:
+            ratio = stats["bytes_out"] / stats["bytes_in"] if stats["bytes_in"] else 1.0
+            summary += f" ({stats['bytes_out']} B {self._compression}, ratio {ratio:.2f})"
+        print(f"{Fore.GREEN if not errors else Fore.RED}{summary} in {stats['elapsed']:.2f} s.")
+
+    def _write_loop(self) -> None:
+        """
+        Metoda zapisovacího vlákna - postupně zapisuje data z fronty, dokud nedostane None.
+
+        Returns:
+            None
+        """
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                file_path, data, append = item
+                try:
+                    written = self._write_file(file_path, data, append)
+                except Exception as err:  # např. OSError nebo chyba komprese - zapisovací vlákno musí běžet dál
+                    with self._lock:
+                        self._errors.append((file_path, f"{type(err).__name__}: {err}"))
+                else:
+                    with self._lock:
+                        self._files += 1
+                        self._bytes_in += len(data)
+                        self._bytes_out += written
+            finally:
+                self._queue.task_done()
+
+    def _write_file(self, file_path: Path, data: bytes, append: bool) -> int:
+        """
+        Metoda, která atomicky zapíše (případně zkomprimovaná) data do souboru - dočasný soubor ve stejné složce a os.replace.
+
+        Args:
+            file_path (Path): cesta k cílovému souboru (bez přípony komprese)
+            data (bytes): zapisovaná data
+            append (bool): jestli se mají data přidat na konec existujícího souboru
+
+        Returns:
+            Vrací velikost zapsaného souboru v bajtech.
+        """
+        output_path = self.get_output_path(file_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if append and output_path.exists():
+            data = output_path.read_bytes() + data
+        data = self._compress(data)
+        tmp_path = str(output_path.parent / f".{output_path.name}.{uuid.uuid4().hex}.tmp")
+        # práva 0666 omezená umask procesu (stejně jako při open()) - umask se nečte ani nemění (sdílí ji všechna vlákna)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, str(output_path))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return len(data)
+
+    def _compress(self, data: bytes) -> bytes:
+        if self._compression == "gzip":
+            return gzip.compress(data, compresslevel=self._compression_level if self._compression_level is not None else 9)
+        if self._compression == "zstd":
+            level = self._compression_level if self._compression_level is not None else 3
+            return zstandard.ZstdCompressor(level=level).compress(data)
+        return data
+
+    def __enter__(self) -> "ExportWriter":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,285 @@
+import copy
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from nornir.core import Nornir
+from nornir.core.filter import AND, F, F_BASE, NOT_F, OR
+from nornir.core.inventory import Host, Hosts, Inventory
+
+
+class IndexedHosts(Hosts):
+    """
+    Rozšíření nornir Hosts slovníku, které při každé změně (přidání, odebrání hosta) notifikuje InventoryIndex.
+    Díky tomu je index vždy aktuální a není nutné ho ručně přestavovat.
+
+    Args:
+        hosts (Hosts): původní slovník hostů z inventáře.
+        on_add (Callable[[Host], None]): funkce volaná po přidání (nebo nahrazení) hosta.
+        on_remove (Callable[[str], None]): funkce volaná po odebrání hosta.
+    """
+
+    def __init__(self, hosts: Hosts, on_add: Callable[[Host], None], on_remove: Callable[[str], None]):
+        super().__init__(hosts)
+        self._on_add = on_add
+        self._on_remove = on_remove
+
+    def __setitem__(self, name: str, host: Host) -> None:
+        if name in self:
+            self._on_remove(name)
+        super().__setitem__(name, host)
+        self._on_add(host)
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        self._on_remove(name)
+
+    def pop(self, name: str, *args: Any) -> Host:
+        present = name in self
+        host = super().pop(name, *args)
+        if present:
+            self._on_remove(name)
+        return host
+
+    def popitem(self):
+        name, host = super().popitem()
+        self._on_remove(name)
+        return name, host
+
+    def setdefault(self, name: str, host: Host = None) -> Host:
+        if name not in self:
+            self[name] = host
+        return self[name]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for name, host in dict(*args, **kwargs).items():
+            self[name] = host
+
+    def clear(self) -> None:
+        for name in list(self.keys()):
+            del self[name]
+
+
+class InventoryIndex:
+    """
+    Třída, která udržuje index nad atributy hostů v inventáři (vendor, dev_type, image, platform, groups).
+    Filtrování pomocí nornir F objektů je pak vyhodnoceno jako množinové operace nad indexem místo lineárního průchodu všemi hosty.
+    Index se automaticky aktualizuje při přidání nebo odebrání hosta z inventáře (viz IndexedHosts).
+
+    Args:
+        nornir_obj (Nornir): Nornir objekt se zparsovaným inventářem, nad kterým bude index vytvořen.
+
+    Attributes:
+        nornir_obj (Nornir): Nornir objekt, jehož inventář je indexován.
+        index (Dict[str, Dict[Any, Set[str]]]): slovník atribut -> hodnota -> množina jmen hostů.
+        positions (Dict[str, int]): pořadí hostů v inventáři (zachování pořadí ve filtrovaných Nornir objektech).
+        lock (threading.Lock): zámek pro bezpečnou aktualizaci indexu z více vláken.
+    """
+
+    INDEXED_ATTRIBUTES = ["vendor", "dev_type", "image", "platform", "groups"]
+
+    def __init__(self, nornir_obj: Nornir):
+        self._nornir_obj = nornir_obj
+        self._index: Dict[str, Dict[Any, Set[str]]] = {}
+        self._positions: Dict[str, int] = {}
+        self._next_position = 0
+        self._lock = threading.Lock()
+        hosts = nornir_obj.inventory.hosts
+        if not isinstance(hosts, IndexedHosts):
+            nornir_obj.inventory.hosts = IndexedHosts(hosts, self._add_host, self._remove_host)
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """
+        Metoda, která kompletně přestaví index (např. po hromadné změně dat hostů).
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._index = {attribute: {} for attribute in self.INDEXED_ATTRIBUTES}
+            self._positions = {}
+            self._next_position = 0
+        for host in self._nornir_obj.inventory.hosts.values():
+            self._add_host(host)
+
+    def refresh_host(self, host_name: str) -> None:
+        """
+        Metoda, která přeindexuje konkrétního hosta (např. po změně jeho dat přímo v Host objektu).
+
+        Args:
+            host_name (str): jméno hosta
+
+        Returns:
+            None
+        """
+        host = self._nornir_obj.inventory.hosts.get(host_name)
+        self._remove_host(host_name)
+        if host is not None:
+            self._add_host(host)
+
+    def get_host_names(self, filter_obj: Optional[F_BASE] = None, **kwargs: Any) -> Set[str]:
+        """
+        Metoda, která vrací jména hostů odpovídající filtru. Filtr lze zadat jako nornir F objekt nebo jako klíčové argumenty (stejně jako u F).
+
+        Args:
+            filter_obj (F_BASE): nornir filtr (F, AND, OR, NOT_F). Defaultně None (použijí se klíčové argumenty).
+            **kwargs (Any): podmínky filtru ve formátu nornir F objektu (např. dev_type="router", groups__contains="cisco").
+
+        Returns:
+            Vrací množinu jmen hostů, které odpovídají filtru.
+        """
+        if filter_obj is None:
+            filter_obj = F(**kwargs)
+        return self._evaluate(filter_obj)
+
+    def filter(self, filter_obj: Optional[F_BASE] = None, **kwargs: Any) -> Nornir:
+        """
+        Metoda, která slouží jako náhrada za Nornir.filter. Vrací nový Nornir objekt s hosty odpovídajícími filtru,
+        přičemž vyhodnocení filtru probíhá nad indexem.
+
+        Args:
+            filter_obj (F_BASE): nornir filtr (F, AND, OR, NOT_F). Defaultně None (použijí se klíčové argumenty).
+            **kwargs (Any): podmínky filtru ve formátu nornir F objektu.
+
+        Returns:
+            Vrací filtrovaný Nornir objekt (sdílí konfiguraci, runner a skupiny s původním Nornir objektem).
+        """
+        return self.filter_names(self.get_host_names(filter_obj, **kwargs))
+
+    def filter_names(self, host_names: Iterable[str]) -> Nornir:
+        """
+        Metoda, která vrací Nornir objekt obsahující pouze zadané hosty (v pořadí dle inventáře).
+
+        Args:
+            host_names (Iterable[str]): jména hostů
+
+        Returns:
+            Vrací filtrovaný Nornir objekt.
+        """
+        inventory = self._nornir_obj.inventory
+        names = [name for name in host_names if name in self._positions]
+        names.sort(key=self._positions.__getitem__)
+        filtered = copy.copy(self._nornir_obj)
+        filtered.inventory = Inventory(hosts=Hosts({name: inventory.hosts[name] for name in names}),
+                                       groups=inventory.groups, defaults=inventory.defaults)
+        return filtered
+
+    def _get_host_values(self, host: Host, attribute: str) -> List[Any]:
+        """
+        Metoda, která vrací indexované hodnoty daného atributu hosta.
+
+        Args:
+            host (Host): nornir Host objekt
+            attribute (str): název indexovaného atributu
+
+        Returns:
+            Vrací list hodnot (u skupin jména všech přímých skupin hosta, jinak jednoprvkový list).
+        """
+        if attribute == "groups":
+            return [group.name for group in host.groups]
+        value = host.get(attribute)
+        try:
+            hash(value)
+        except TypeError:
+            return []
+        return [value]
+
+    def _add_host(self, host: Host) -> None:
+        """
+        Metoda, která přidá hosta do indexu.
+
+        Args:
+            host (Host): nornir Host objekt
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if host.name not in self._positions:
+                self._positions[host.name] = self._next_position
+                self._next_position += 1
+            for attribute in self.INDEXED_ATTRIBUTES:
+                for value in self._get_host_values(host, attribute):
+                    self._index[attribute].setdefault(value, set()).add(host.name)
+
+    def _remove_host(self, host_name: str) -> None:
+        """
+        Metoda, která odebere hosta z indexu.
+
+        Args:
+            host_name (str): jméno hosta
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._positions.pop(host_name, None)
+            for values in self._index.values():
+                for value in [value for value, names in values.items() if host_name in names]:
+                    values[value].discard(host_name)
+                    if not values[value]:
+                        del values[value]
+
+    def _evaluate(self, filter_obj: F_BASE) -> Set[str]:
+        """
+        Metoda, která rekurzivně vyhodnotí nornir filtr pomocí množinových operací.
+
+        Args:
+            filter_obj (F_BASE): nornir filtr (F, AND, OR, NOT_F nebo vlastní F_BASE objekt).
+
+        Returns:
+            Vrací množinu jmen hostů, které odpovídají filtru.
+        """
+        if isinstance(filter_obj, AND):
+            return self._evaluate(filter_obj.op1) & self._evaluate(filter_obj.op2)
+        if isinstance(filter_obj, OR):
+            return self._evaluate(filter_obj.op1) | self._evaluate(filter_obj.op2)
+        if isinstance(filter_obj, NOT_F):
+            matched = set()
+            for key, value in filter_obj.filters.items():
+                matched |= self._evaluate_rule(key, value)
+            return set(self._positions) - matched
+        if isinstance(filter_obj, F):
+            result = set(self._positions)
+            for key, value in filter_obj.filters.items():
+                result &= self._evaluate_rule(key, value)
+            return result
+        return self._scan(filter_obj)
+
+    def _evaluate_rule(self, key: str, value: Any) -> Set[str]:
+        """
+        Metoda, která vyhodnotí jedno pravidlo F objektu (např. dev_type="router"). Nepodporovaná pravidla
+        jsou vyhodnocena klasickým průchodem přes hosty.
+
+        Args:
+            key (str): klíč pravidla (např. dev_type, groups__contains, name__contains)
+            value (Any): požadovaná hodnota
+
+        Returns:
+            Vrací množinu jmen hostů, které pravidlu odpovídají.
+        """
+        rule = key.split("__")
+        if rule == ["name"]:
+            return {value} & set(self._positions)
+        if rule == ["name", "contains"] and isinstance(value, str):
+            return {name for name in self._positions if value in name}
+        if rule == ["groups", "contains"] and isinstance(value, str):
+            return set(self._index["groups"].get(value, set()))
+        if len(rule) == 1 and rule[0] in self.INDEXED_ATTRIBUTES and rule[0] != "groups":
+            try:
+                return set(self._index[rule[0]].get(value, set()))
+            except TypeError:
+                pass
+        return self._scan(F(**{key: value}))
+
+    def _scan(self, filter_obj: F_BASE) -> Set[str]:
+        """
+        Metoda, která vyhodnotí filtr lineárním průchodem přes hosty (fallback pro neindexované atributy).
+
+        Args:
+            filter_obj (F_BASE): nornir filtr
+
+        Returns:
+            Vrací množinu jmen hostů, které odpovídají filtru.
+        """
+        return {name for name, host in self._nornir_obj.inventory.hosts.items() if filter_obj(host)}
@@ -0,0 +1,160 @@
+import json
+from datetime import date, datetime, time
+from typing import Any, Iterable, Optional, TextIO, Union
+
+try:
+    import orjson
+except ImportError:  # orjson je volitelná závislost - bez ní se použije standardní modul json
+    orjson = None
+
+
+class JSONSerializer:
+    """
+    Třída pro serializaci dat (např. výsledků NAPALM getterů) do JSON. Backend je volitelný - pokud je nainstalována knihovna orjson,
+    je použita (výrazně rychlejší serializace velkých výstupů, např. interfaces_counters, interfaces_ip nebo konfigurací), jinak standardní modul json.
+    Obě varianty nativně podporují datetime/date/time (ISO 8601), množiny a n-tice převádí na list a ostatní neserializovatelné objekty na string.
+
+    Args:
+        backend (Optional[str]): použitý backend (orjson nebo json). Defaultně None (orjson, pokud je nainstalován).
+        sort_keys (bool): jestli se mají klíče slovníků seřadit. Defaultně True.
+
+    Attributes:
+        backend (str): použitý backend.
+        sort_keys (bool): jestli se řadí klíče slovníků.
+    """
+
+    BACKENDS = ["orjson", "json"]
+
+    def __init__(self, backend: Optional[str] = None, sort_keys: bool = True):
+        if backend is None:
+            backend = "orjson" if orjson is not None else "json"
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown JSON backend {backend}. Supported backends: {', '.join(self.BACKENDS)}.")
+        if backend == "orjson" and orjson is None:
+            raise ValueError("JSON backend orjson is not installed.")
+        self._backend = backend
+        self._sort_keys = sort_keys
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    def dumps(self, data: Any, indent: bool = False) -> str:
+        """
+        Metoda, která převede data na JSON string.
+
+        Args:
+            data (Any): serializovaná data
+            indent (bool): jestli se má výstup formátovat (odsazení 2 mezery v obou backendech). Defaultně False (kompaktní výstup).
+
+        Returns:
+            Vrací JSON string.
+        """
+        if self._backend == "orjson":
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            if self._sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(data, default=self._default, option=option).decode("utf-8")
+            except TypeError:
+                pass  # např. celé číslo větší než 64 bitů nebo klíče různých typů - použije se standardní modul json
+        try:
+            return self._json_dumps(data, indent)
+        except TypeError:
+            # klíče různých typů nelze v modulu json seřadit - klíče jsou převedeny na string stejně jako v orjson (OPT_NON_STR_KEYS)
+            return self._json_dumps(self._stringify_keys(data), indent)
+
+    def _json_dumps(self, data: Any, indent: bool) -> str:
+        return json.dumps(data, default=self._default, sort_keys=self._sort_keys, indent=2 if indent else None,
+                          separators=None if indent else (",", ":"), ensure_ascii=False)
+
+    def _stringify_keys(self, data: Any) -> Any:
+        """
+        Metoda, která rekurzivně převede klíče slovníků na string (stejně jako orjson - True/False/None jako true/false/null,
+        datum a čas v ISO 8601).
+
+        Args:
+            data (Any): serializovaná data
+
+        Returns:
+            Vrací data se string klíči.
+        """
+        if isinstance(data, dict):
+            return {self._stringify_key(key): self._stringify_keys(value) for key, value in data.items()}
+        if isinstance(data, (list, tuple)):
+            return [self._stringify_keys(value) for value in data]
+        return data
+
+    def _stringify_key(self, key: Any) -> str:
+        if isinstance(key, str):
+            return key
+        if isinstance(key, bool) or key is None:
+            return json.dumps(key)
+        if isinstance(key, (int, float)):
+            return str(key)
+        return str(self._default(key))
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """
+        Metoda, která převede JSON string zpět na data.
+
+        Args:
+            data (Union[str, bytes]): JSON string
+
+        Returns:
+            Vrací deserializovaná data.
+        """
+        if self._backend == "orjson":
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def dumps_line(self, data: Any) -> str:
+        """
+        Metoda, která převede data na jeden JSON řádek (NDJSON).
+
+        Args:
+            data (Any): serializovaná data
+
+        Returns:
+            Vrací kompaktní JSON string ukončený znakem nového řádku.
+        """
+        return self.dumps(data) + "\n"
+
+    def dump_lines(self, records: Iterable[Any], stream: TextIO) -> int:
+        """
+        Metoda, která průběžně zapíše záznamy do streamu - každý záznam jako jeden JSON řádek (NDJSON).
+        Záznamy nemusí být najednou v paměti (např. generátor výsledků jednotlivých hostů).
+
+        Args:
+            records (Iterable[Any]): serializované záznamy
+            stream (TextIO): stream, do kterého se záznamy zapisují (soubor, sys.stdout)
+
+        Returns:
+            Vrací počet zapsaných záznamů.
+        """
+        count = 0
+        for record in records:
+            stream.write(self.dumps_line(record))
+            count += 1
+        stream.flush()
+        return count
+
+    def _default(self, obj: Any) -> Any:
+        """
+        Metoda, která převede objekty, které backend neumí serializovat.
+
+        Args:
+            obj (Any): neserializovatelný objekt
+
+        Returns:
+            Vrací serializovatelnou reprezentaci objektu.
+        """
+        if isinstance(obj, (datetime, date, time)):
+            return obj.isoformat()
+        if isinstance(obj, (set, frozenset, tuple)):
+            return list(obj)
+        if isinstance(obj, bytes):
+            return obj.decode("utf-8", errors="replace")
+        return str(obj)
@@ -0,0 +1,258 @@
+import atexit
+import logging
+import queue
+import traceback
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Any, List, Optional
+
+from modules.utility.json_serializer import JSONSerializer
+
+
+class JSONLinesFormatter(logging.Formatter):
+    """
+    Formatter, který převede log záznam na jeden JSON řádek (čas, úroveň, logger, vlákno, funkce, zpráva, traceback a případné
+    extra položky - např. logger.info("...", extra={"host": "R1"})).
+
+    Args:
+        serializer (JSONSerializer): objekt pro serializaci záznamů. Defaultně None (orjson, pokud je nainstalován, jinak json).
+
+    Attributes:
+        serializer (JSONSerializer): objekt pro serializaci záznamů.
+    """
+
+    STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+    def __init__(self, serializer: JSONSerializer = None):
+        super().__init__()
+        self._serializer = serializer or JSONSerializer(sort_keys=False)
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "function": record.funcName,
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in self.STANDARD_ATTRIBUTES})
+        if record.exc_info:
+            entry["exception"] = "".join(traceback.format_exception(*record.exc_info))
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return self._serializer.dumps(entry)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler, který v pracovním vlákně pouze vloží záznam do fronty. Na rozdíl od výchozího QueueHandleru záznam neformátuje
+    (formátování i zápis na disk probíhá ve vlákně QueueListeneru) - pouze spojí zprávu s argumenty, aby se pozdější změna
+    argumentů neprojevila v logu.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class ProcessQueueHandler(StructuredQueueHandler):
+    """
+    StructuredQueueHandler pracovního procesu - záznam se přenáší mezi procesy (pickle), proto je traceback převeden na text
+    již v pracovním procesu (objekt tracebacku nelze přenést).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info))
+            record.exc_info = None
+        return record
+
+
+class LogPipeline:
+    """
+    Třída, která nahrazuje synchronní logování nornir do nornir.log. Pracovní vlákna pouze vkládají strukturované záznamy do fronty
+    (StructuredQueueHandler), jediné zapisovací vlákno (QueueListener) je formátuje a zapisuje do souboru s rotací podle velikosti
+    (RotatingFileHandler). Zápis na disk tak nikdy neblokuje nornir úkoly.
+
+    Args:
+        log_file (Path): cesta k log souboru. Defaultně nornir.log.
+        level (str): minimální úroveň logovaných záznamů. Defaultně INFO.
+        loggers (List[str]): loggery, které jsou připojeny k frontě. Defaultně None (["nornir"]).
+        json_lines (bool): jestli se mají záznamy zapisovat jako JSON řádky (True) nebo jako text ve formátu nornir (False). Defaultně True.
+        max_bytes (int): velikost log souboru (v bajtech), po které je soubor rotován. Defaultně 10 MB.
+        backup_count (int): počet uchovávaných rotovaných souborů. Defaultně 20.
+        forward_queue (Optional[Any]): fronta rodičovského procesu (multiprocessing.Queue), do které pracovní proces přeposílá
+                                       záznamy. Defaultně None (záznamy zapisuje vlastní zapisovací vlákno do log_file).
+
+    Attributes:
+        log_file (Path): cesta k log souboru.
+        level (str): minimální úroveň logovaných záznamů.
+        loggers (List[str]): loggery, které jsou připojeny k frontě.
+        queue (queue.SimpleQueue): fronta log záznamů.
+        queue_handler (StructuredQueueHandler): handler, který záznamy vkládá do fronty.
+        file_handler (RotatingFileHandler): handler zapisovacího vlákna.
+        listener (Optional[QueueListener]): zapisovací vlákno (None = pipeline neběží nebo záznamy přeposílá).
+        forward_queue (Optional[Any]): fronta rodičovského procesu, do které jsou záznamy přeposílány.
+        forwarding (bool): jestli pipeline přeposílá záznamy do fronty rodičovského procesu.
+        source_listeners (List[QueueListener]): vlákna, která do pipeline předávají záznamy pracovních procesů (viz listen).
+    """
+
+    TEXT_FORMAT = "%(asctime)s - %(name)12s - %(levelname)8s - %(funcName)10s() - %(message)s"
+
+    def __init__(self, log_file: Path = Path("nornir.log"), level: str = "INFO", loggers: Optional[List[str]] = None,
+                 json_lines: bool = True, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 20,
+                 forward_queue: Optional[Any] = None):
+        self._log_file = log_file
+        self._level = level
+        self._loggers = loggers or ["nornir"]
+        self._queue = queue.SimpleQueue()
+        self._queue_handler = StructuredQueueHandler(self._queue)
+        self._file_handler = RotatingFileHandler(str(log_file), maxBytes=max_bytes, backupCount=backup_count,
+                                                 encoding="utf-8", delay=True)
+        self._file_handler.setFormatter(JSONLinesFormatter() if json_lines else logging.Formatter(self.TEXT_FORMAT))
+        self._listener: Optional[QueueListener] = None
+        self._forward_queue = forward_queue
+        self._forwarding = False
+        self._source_listeners: List[QueueListener] = []
+
+    @property
+    def running(self) -> bool:
+        return self._listener is not None or self._forwarding
+
+    def start(self) -> None:
+        """
+        Metoda, která spustí zapisovací vlákno (případně přeposílání do fronty rodičovského procesu) a připojí loggery k frontě.
+
+        Returns:
+            None
+        """
+        if self.running:
+            return
+        if self._forward_queue is not None:
+            self._queue_handler = ProcessQueueHandler(self._forward_queue)
+            self._forwarding = True
+        else:
+            self._listener = QueueListener(self._queue, self._file_handler, respect_handler_level=True)
+            self._listener.start()
+        for logger_name in self._loggers:
+            logger = logging.getLogger(logger_name)
+            logger.setLevel(self._level)
+            logger.propagate = False
+            logger.addHandler(self._queue_handler)
+
+    def stop(self) -> None:
+        """
+        Metoda, která odpojí loggery od fronty, zapíše zbývající záznamy a ukončí zapisovací vlákno.
+
+        Returns:
+            None
+        """
+        if not self.running:
+            return
+        for source_listener in self._source_listeners:
+            source_listener.stop()
+        self._source_listeners = []
+        self.detach()
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+            self._file_handler.close()
+
+    def detach(self) -> None:
+        """
+        Metoda, která pouze odpojí loggery od fronty a ukončí přeposílání (zapisovací vlákno běží dál - ukončuje jej stop).
+        Používá se také v pracovním procesu vytvořeném pomocí fork - proces zdědí pipeline rodičovského procesu, jejíž záznamy
+        by zůstaly ve frontě a nikdy se nezapsaly (viz setup_worker_log_pipeline).
+
+        Returns:
+            None
+        """
+        for logger_name in self._loggers:
+            logging.getLogger(logger_name).removeHandler(self._queue_handler)
+        self._forwarding = False
+
+    def listen(self, source_queue: Any) -> None:
+        """
+        Metoda, která spustí vlákno předávající záznamy pracovních procesů (source_queue - multiprocessing.Queue) do této pipeline.
+        Do log souboru tak zapisuje pouze rodičovský proces (pracovní procesy nesoupeří o zápis ani o rotaci souboru).
+        Vlákno je ukončeno metodou stop_listening nebo stop.
+
+        Args:
+            source_queue (Any): fronta, do které pracovní procesy přeposílají záznamy (viz setup_worker_log_pipeline)
+
+        Returns:
+            None
+        """
+        source_listener = QueueListener(source_queue, self._queue_handler)
+        source_listener.start()
+        self._source_listeners.append(source_listener)
+
+    def stop_listening(self, source_queue: Any) -> None:
+        """
+        Metoda, která předá zbývající záznamy z fronty pracovních procesů a ukončí předávající vlákno (viz listen).
+
+        Args:
+            source_queue (Any): fronta pracovních procesů
+
+        Returns:
+            None
+        """
+        for source_listener in [listener for listener in self._source_listeners if listener.queue is source_queue]:
+            source_listener.stop()
+            self._source_listeners.remove(source_listener)
+
+    def __enter__(self) -> "LogPipeline":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+_log_pipeline: Optional[LogPipeline] = None
+
+
+def setup_log_pipeline(log_file: Path = Path("nornir.log"), **kwargs) -> LogPipeline:
+    """
+    Funkce, která spustí (jednu sdílenou) logovací pipeline. Opakované volání (např. z více setup_inventory) vrací již běžící pipeline.
+    Pipeline je ukončena (včetně zápisu zbývajících záznamů) při ukončení interpretu.
+
+    Args:
+        log_file (Path): cesta k log souboru. Defaultně nornir.log.
+        **kwargs: další argumenty LogPipeline (level, loggers, json_lines, max_bytes, backup_count).
+
+    Returns:
+        Vrací běžící LogPipeline.
+    """
+    global _log_pipeline
+    if _log_pipeline is None or not _log_pipeline.running:
+        _log_pipeline = LogPipeline(log_file, **kwargs)
+        _log_pipeline.start()
+        atexit.register(_log_pipeline.stop)
+    return _log_pipeline
+
+
+def setup_worker_log_pipeline(log_queue: Any, **kwargs) -> LogPipeline:
+    """
+    Funkce pro pracovní proces (např. ShardedRunner) - odpojí pipeline zděděnou od rodičovského procesu (fork) a spustí pipeline,
+    která záznamy přeposílá do fronty rodičovského procesu (viz LogPipeline.listen). Následná volání setup_log_pipeline
+    (např. z setup_inventory) v pracovním procesu vrací tuto pipeline.
+
+    Args:
+        log_queue (Any): fronta rodičovského procesu (multiprocessing.Queue)
+        **kwargs: další argumenty LogPipeline (level, loggers)
+
+    Returns:
+        Vrací běžící LogPipeline.
+    """
+    global _log_pipeline
+    if _log_pipeline is not None:
+        _log_pipeline.detach()
+        _log_pipeline._listener = None  # zapisovací vlákno rodičovského procesu v pracovním procesu (fork) neexistuje
+    _log_pipeline = LogPipeline(forward_queue=log_queue, **kwargs)
+    _log_pipeline.start()
+    return _log_pipeline
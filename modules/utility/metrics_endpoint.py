@@ -0,0 +1,192 @@
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import time
+from typing import Dict, Optional, Tuple
+
+
+class MetricsStore:
+    """
+    Třída, která uchovává poslední hodnoty monitorovaných metrik (např. cpu_usage, uptime, rychlosti rozhraní) v paměti.
+    Hodnoty jsou plněny monitorovací smyčkou (DBHandler) a vystaveny ve formátu Prometheus pomocí MetricsEndpoint.
+
+    Args:
+        prefix (str): prefix názvů metrik. Defaultně "nornir".
+        max_age (Optional[float]): maximální stáří hodnoty (v sekundách). Starší hodnoty nejsou vystaveny (např. nedostupná zařízení). Defaultně None (bez omezení).
+
+    Attributes:
+        prefix (str): prefix názvů metrik.
+        max_age (Optional[float]): maximální stáří hodnoty v sekundách.
+        metrics (Dict[str, Dict[Tuple[Tuple[str, str], ...], Tuple[float, float]]]): metrika -> labely -> (hodnota, čas zápisu).
+        help (Dict[str, str]): popisy metrik.
+        lock (threading.Lock): zámek pro přístup z monitorovací smyčky a HTTP serveru.
+    """
+
+    def __init__(self, prefix: str = "nornir", max_age: Optional[float] = None):
+        self._prefix = prefix
+        self._max_age = max_age
+        self._metrics: Dict[str, Dict[Tuple[Tuple[str, str], ...], Tuple[float, float]]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def set(self, metric: str, value: float, labels: Dict[str, str], help_text: str = "") -> None:
+        """
+        Metoda, která uloží poslední hodnotu metriky.
+
+        Args:
+            metric (str): název metriky (bez prefixu), např. cpu_usage
+            value (float): hodnota metriky
+            labels (Dict[str, str]): labely metriky (např. {"host": "R1"})
+            help_text (str): popis metriky. Defaultně prázdný string.
+
+        Returns:
+            None
+        """
+        name = f"{self._prefix}_{metric}" if self._prefix else metric
+        key = tuple(sorted((str(label), str(label_value)) for label, label_value in labels.items()))
+        with self._lock:
+            self._metrics.setdefault(name, {})[key] = (float(value), time())
+            if help_text:
+                self._help[name] = help_text
+
+    def remove_host(self, host: str) -> None:
+        """
+        Metoda, která odstraní všechny hodnoty daného hosta (např. po jeho odebrání z inventáře).
+
+        Args:
+            host (str): jméno hosta
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for series in self._metrics.values():
+                for key in [key for key in series if ("host", host) in key]:
+                    del series[key]
+
+    def render(self) -> str:
+        """
+        Metoda, která vrací všechny metriky ve formátu Prometheus (text exposition format).
+
+        Returns:
+            Vrací metriky jako string.
+        """
+        now = time()
+        lines = []
+        with self._lock:
+            for name in sorted(self._metrics):
+                series = [(key, value) for key, (value, updated) in self._metrics[name].items()
+                          if self._max_age is None or now - updated <= self._max_age]
+                if not series:
+                    continue
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} gauge")
+                for key, value in sorted(series):
+                    labels = ",".join(f'{label}="{self._escape(label_value)}"' for label, label_value in key)
+                    value = self._format_value(value)
+                    lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def _format_value(self, value: float) -> str:
+        """
+        Metoda, která převede hodnotu metriky na text dle formátu Prometheus (nekonečno a NaN jako +Inf, -Inf a NaN).
+
+        Args:
+            value (float): hodnota metriky
+
+        Returns:
+            Vrací hodnotu jako string.
+        """
+        if isinstance(value, float) and math.isnan(value):
+            return "NaN"
+        if isinstance(value, float) and math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+
+    def _escape(self, value: str) -> str:
+        """
+        Metoda, která escapuje hodnotu labelu dle formátu Prometheus.
+
+        Args:
+            value (str): hodnota labelu
+
+        Returns:
+            Vrací escapovanou hodnotu.
+        """
+        return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsEndpoint:
+    """
+    Třída, která vystaví MetricsStore jako HTTP endpoint (/metrics) ve formátu Prometheus. Server běží v samostatném vlákně,
+    scrapery si data stahují samy (pull) a monitorovací smyčka nemusí pro každý datový bod provádět HTTP zápis.
+
+    Args:
+        metrics_store (MetricsStore): úložiště posledních hodnot metrik.
+        host (str): adresa, na které server naslouchá. Defaultně 0.0.0.0.
+        port (int): port serveru. Defaultně 9100.
+
+    Attributes:
+        metrics_store (MetricsStore): úložiště posledních hodnot metrik.
+        server (ThreadingHTTPServer): HTTP server.
+        thread (Optional[threading.Thread]): vlákno, ve kterém server běží.
+    """
+
+    def __init__(self, metrics_store: MetricsStore, host: str = "0.0.0.0", port: int = 9100):
+        self._metrics_store = metrics_store
+        self._server = ThreadingHTTPServer((host, port), self._create_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        """
+        Metoda, která spustí HTTP server v samostatném (daemon) vlákně.
+
+        Returns:
+            None
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-endpoint", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Metoda, která zastaví HTTP server.
+
+        Returns:
+            None
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def _create_handler(self) -> type:
+        """
+        Metoda, která vytvoří třídu HTTP handleru s přístupem k MetricsStore.
+
+        Returns:
+            Vrací třídu odvozenou od BaseHTTPRequestHandler.
+        """
+        metrics_store = self._metrics_store
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] not in ["/metrics", "/"]:
+                    self.send_error(404)
+                    return
+                body = metrics_store.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return MetricsHandler
@@ -1,15 +1,23 @@
+import time
 from pathlib import Path
+from typing import Dict, List, Optional
 from colorama import Fore
 from nornir.core import Nornir
 from nornir.core.exceptions import NornirSubTaskError, NornirExecutionError
 from nornir.core.task import Task, AggregatedResult
 from nornir_napalm.plugins.tasks import napalm_get
-from nornir_netmiko import netmiko_send_command
 from openpyxl import Workbook
 
+from modules.utility.acl_analyzer import AclAnalyzer
+from modules.utility.acl_parser import AclParser
+from modules.utility.command_cache import CommandCache
+from modules.utility.counter_rate_calculator import CounterRateCalculator
 from modules.utility.excel_exporter import ExcelExporter
+from modules.utility.export_writer import ExportWriter
+from modules.utility.json_serializer import JSONSerializer
 from modules.utility.network_info_collector import NetworkInfoCollector
 from modules.utility.network_info_parser import NetworkInfoParser
+from modules.utility.snapshot_store import SnapshotStore
 from modules.utility.text_file_exporter import FileExporter
 
 
@@ -20,16 +28,37 @@ class NetworkInfoExporter:
     Args:
         info_collector (NetworkInfoCollector): objekt, který slouží k obdržení komplexních dat ze síťových prvků - např. při paralelním slučování
                                                několika MultiResult objektů z více Nornir podúloh (subtasků) s jiným typem přístupu k NAPALM knihovně.
+        snapshot_store (SnapshotStore): lokální SQLite úložiště, do kterého jsou exportovaná data zároveň ukládána. Defaultně None (data se ukládají pouze do souborů).
+        serializer (JSONSerializer): objekt pro serializaci JSON exportů. Defaultně None (orjson, pokud je nainstalován, jinak json).
+        command_cache (CommandCache): mezipaměť výstupů show příkazů a NAPALM getterů (lze sdílet s NetworkUtilityViewer). Defaultně None (vlastní mezipaměť).
+        export_writer (ExportWriter): asynchronní zapisovač textových exportů (atomický zápis, volitelná komprese). Defaultně None (synchronní zápis).
 
 
     Attributes:
          info_collector (NetworkInfoCollector): objekt, který slouží k obdržení komplexních dat ze síťových prvků - např. při paralelním slučování
                                                několika MultiResult objektů z více Nornir podúloh (subtasků) s jiným typem přístupu k NAPALM knihovn
+         snapshot_store (Optional[SnapshotStore]): lokální SQLite úložiště sesbíraných dat.
+         snapshot_id (Optional[int]): identifikátor snapshotu, pod kterým jsou data tohoto exportéru ukládána.
+         serializer (JSONSerializer): objekt pro serializaci JSON exportů.
+         command_cache (CommandCache): mezipaměť výstupů show příkazů a NAPALM getterů (čítače rozhraní se vždy čtou ze zařízení).
+         export_writer (Optional[ExportWriter]): asynchronní zapisovač textových exportů.
 
     """
 
-    def __init__(self, info_collector: NetworkInfoCollector):
+    FACTS_HEADERS = ["hostname", "FQDN", "vendor", "model", "serial_number", "os_version", "uptime", "connection"]
+    COUNTERS_HEADERS = ["interface", "rx_broadcast", "rx_discards", "rx_errors",
+                        "rx_multicast", "rx_octets", "rx_unicast",
+                        "tx_discards", "tx_errors", "tx_octets", "tx_unicast"]
+
+    def __init__(self, info_collector: NetworkInfoCollector, snapshot_store: Optional[SnapshotStore] = None,
+                 serializer: JSONSerializer = None, command_cache: CommandCache = None,
+                 export_writer: Optional[ExportWriter] = None):
         self._info_collector = info_collector
+        self._snapshot_store = snapshot_store
+        self._snapshot_id = snapshot_store.create_snapshot("NetworkInfoExporter") if snapshot_store else None
+        self._serializer = serializer or JSONSerializer()
+        self._command_cache = command_cache or CommandCache()
+        self._export_writer = export_writer
 
     def export_device_facts(self, nornir_devices: Nornir) -> None:
         """
@@ -42,18 +71,16 @@ class NetworkInfoExporter:
             None
 
         """
-        sorted_headers_export = ["hostname", "FQDN", "vendor", "model", "serial_number", "os_version", "uptime", "connection"]
-        wider_header_columns = ["os_version", "FQDN"]
         dest_file_path = Path(Path.cwd() / 'export' / "excel" / "facts.xlsx")
         try:
             all_results_aggregation: AggregatedResult = nornir_devices.run(
                 task=self._info_collector.get_conn_state_and_device_facts)
-            exporter = ExcelExporter(Workbook(), "Základní informace o zařízeních", dest_file_path)
             parser = NetworkInfoParser()
             parsed_data = parser.get_parsed_facts_data(all_results_aggregation)
-            exporter.write_header(sorted_headers_export, wider_header_columns)
-            exporter.write_data(sorted_headers_export, parsed_data)
-            exporter.save_xlsx_file()
+            if self._snapshot_store:
+                for host, facts in zip(all_results_aggregation.keys(), parsed_data):
+                    self._snapshot_store.write_facts(self._snapshot_id, host, facts)
+            self._write_facts_xlsx(parsed_data, dest_file_path)
         except (NornirExecutionError, OSError, ValueError) as err:
             print(f"{Fore.RED}Export device facts to {dest_file_path.name} failed.")
             print(err)
@@ -72,33 +99,24 @@ class NetworkInfoExporter:
              None
 
          """
-        sorted_headers_export = ["interface", "rx_broadcast", "rx_discards", "rx_errors",
-                                 "rx_multicast", "rx_octets", "rx_unicast",
-                                 "tx_discards", "tx_errors", "tx_octets", "tx_unicast"]
-        wider_header_columns = ["interface"]
         dest_file_path = Path(Path.cwd() / 'export' / "excel" / f"packets_counter.xlsx")
         try:
             all_results_aggregation: AggregatedResult = nornir_devices.run(
                 task=napalm_get, name="Get interfaces packet counters", getters=["interfaces_counters"])
             parser = NetworkInfoParser()
             parser.parse_interfaces_packet_counters_data(all_results_aggregation)
-            first_host = list(all_results_aggregation.keys())[0]
-            exporter = ExcelExporter(Workbook(), first_host, dest_file_path)
+            hosts_interfaces = {}
             for host in all_results_aggregation:
-                sheet_name = host
-                exporter.create_sheet(sheet_name)
-                exporter.change_active_sheet(sheet_name)
-                row = 2
-                column = 1
-                exporter.write_header(sorted_headers_export, wider_header_columns, row, column)
                 interfaces_data = all_results_aggregation[host][0].result['interfaces_counters']
+                if self._snapshot_store:
+                    self._snapshot_store.write_interface_counters(self._snapshot_id, host, interfaces_data)
                 host_interfaces_lst = []
                 for interface in sorted(interfaces_data):
                     interface_dict = interfaces_data[interface]
                     interface_dict['interface'] = interface
                     host_interfaces_lst.append(interface_dict)
-                exporter.write_data(sorted_headers_export, host_interfaces_lst, row, column)
-            exporter.save_xlsx_file()
+                hosts_interfaces[host] = host_interfaces_lst
+            self._write_interfaces_counters_xlsx(hosts_interfaces, dest_file_path)
         except (ValueError, NornirExecutionError) as err:
             print(f"{Fore.RED}Export interfaces packet counters to {dest_file_path.name} failed.")
             print(err)
@@ -106,6 +124,54 @@ class NetworkInfoExporter:
             print(f"{Fore.RED}Export interfaces packet counters to {dest_file_path.name} failed.")
             print(f"{Fore.RED}Error: Creating directories for specified path {dest_file_path.parent} failed.")
 
+    def export_interfaces_packet_rates(self, nornir_devices: Nornir, rate_calculator: CounterRateCalculator,
+                                       samples: int = 2, interval: int = 10) -> None:
+        """
+        Export rychlostí (za sekundu) přijímaných a vysílaných paketů/bajtů pro jednotlivá rozhraní síťových zařízení do .xlsx souboru.
+        Statistiky jsou několikrát po sobě sesbírány (polling) a rychlosti spočítány pomocí CounterRateCalculator (včetně ošetření přetečení a resetu čítačů).
+        Předchozí vzorky zůstávají v rate_calculator, takže při opakovaném volání stačí jeden vzorek (samples=1).
+
+        Args:
+            nornir_devices (Nornir): filtrovaný Nornir objekt umožňující na daných zařízeních volat nornir úkoly.
+            rate_calculator (CounterRateCalculator): objekt, který uchovává předchozí vzorky a počítá rychlosti.
+            samples (int): počet sběrů statistik. Defaultně 2.
+            interval (int): počet sekund mezi jednotlivými sběry. Defaultně 10.
+
+        Returns:
+            None
+
+        """
+        headers = ["interface"] + rate_calculator.counters
+        dest_file_path = Path(Path.cwd() / 'export' / "excel" / "packets_rates.xlsx")
+        try:
+            rates = {}
+            for sample in range(samples):
+                if sample:
+                    time.sleep(interval)
+                all_results_aggregation: AggregatedResult = nornir_devices.run(
+                    task=napalm_get, name="Get interfaces packet counters", getters=["interfaces_counters"])
+                fetch_time = time.time()
+                counters = {host: multi_result[0].result["interfaces_counters"]
+                            for host, multi_result in all_results_aggregation.items() if not multi_result.failed}
+                rates = rate_calculator.update(counters, {host: fetch_time for host in counters})
+            hosts_interfaces = {}
+            for host, interfaces in rates.items():
+                hosts_interfaces[host] = [{"interface": interface, **{counter: None for counter in rate_calculator.counters},
+                                           **{counter: round(rate, 2) for counter, rate in interfaces[interface].items()}}
+                                          for interface in sorted(interfaces)]
+            if not any(hosts_interfaces.values()):
+                raise ValueError("No interfaces packet rates were computed (at least two samples are needed).")
+            wider_header_columns = ["interface"]
+            exporter = ExcelExporter(Workbook(), list(hosts_interfaces.keys())[0], dest_file_path)
+            for host, host_interfaces_lst in hosts_interfaces.items():
+                exporter.create_sheet(host)
+                exporter.change_active_sheet(host)
+                exporter.write_header(headers, wider_header_columns, 2, 1)
+                exporter.write_data(headers, host_interfaces_lst, 2, 1)
+            exporter.save_xlsx_file()
+        except (ValueError, NornirExecutionError, OSError) as err:
+            print(f"{Fore.RED}Export interfaces packet rates to {dest_file_path.name} failed.")
+            print(err)
 
     def export_device_configuration(self, task: Task) -> None:
         """
@@ -119,11 +185,13 @@ class NetworkInfoExporter:
             None
 
         """
-        result = task.run(task=napalm_get, name="Get configuration", getters=["config"])
+        result = task.run(task=self._command_cache.napalm_get, name="Get configuration", getters=["config"])
         if not result.failed:
             running_configuration = result[0].result["config"]['running'].strip()
+            if self._snapshot_store:
+                self._snapshot_store.write_config(self._snapshot_id, task.host.name, running_configuration)
             file_path = Path(Path.cwd() / 'export' / "running_configuration" / f"{task.host.name}.conf")
-            exporter = FileExporter(file_path, running_configuration)
+            exporter = FileExporter(file_path, running_configuration, writer=self._export_writer)
             exporter.export_to_file()
         else:
             print(f"{Fore.RED}Export failed for host {task.host.name} more in nornir.log")
@@ -154,15 +222,17 @@ class NetworkInfoExporter:
         else:
             print(f"{Fore.RED}Export failed for host {task.host.name} - not implemented for that vendor.")
             raise NornirSubTaskError(f"Function was not implemented for vendor {task.host.name}.", task)
-        result = task.run(task=netmiko_send_command, name="Get IP routes", command_string=command)
+        result = task.run(task=self._command_cache.netmiko_send_command, name="Get IP routes", command_string=command)
         if not result.failed:
             ipv4_routes = result[0].result
             if task.host['vendor'] == "juniper":
                 parser = NetworkInfoParser()
                 ipv4_routes = parser.get_parsed_juniper_routes(result)
+            if self._snapshot_store:
+                self._snapshot_store.write_routes(self._snapshot_id, task.host.name, "ipv4", ipv4_routes)
             if ipv4_routes != "":
                 file_path = Path(Path.cwd() / 'export' / "ip_routes" / f"{task.host.name}_ipv4.txt")
-                exporter = FileExporter(file_path, ipv4_routes)
+                exporter = FileExporter(file_path, ipv4_routes, writer=self._export_writer)
                 exporter.export_to_file()
             else:
                 print(f"{Fore.RED}{task.host.name}: No IPv4 routes are defined.")
@@ -195,15 +265,17 @@ class NetworkInfoExporter:
         else:
             print(f"{Fore.RED}Export failed for host {task.host.name} - not implemented for that vendor.")
             raise NornirSubTaskError(f"Function was not implemented for vendor {task.host.name}.", task)
-        result = task.run(task=netmiko_send_command, name="Get IP routes", command_string=command)
+        result = task.run(task=self._command_cache.netmiko_send_command, name="Get IP routes", command_string=command)
         if not result.failed:
             ipv6_routes = result[0].result
             if task.host['vendor'] == "juniper":
                 parser = NetworkInfoParser()
                 ipv6_routes = parser.get_parsed_juniper_routes(result, ipv6_routes=True)
+            if self._snapshot_store:
+                self._snapshot_store.write_routes(self._snapshot_id, task.host.name, "ipv6", ipv6_routes)
             if ipv6_routes != "":
                 file_path = Path(Path.cwd() / 'export' / "ip_routes" / f"{task.host.name}_ipv6.txt")
-                exporter = FileExporter(file_path, ipv6_routes)
+                exporter = FileExporter(file_path, ipv6_routes, writer=self._export_writer)
                 exporter.export_to_file()
             else:
                 print(f"{Fore.RED}{task.host.name}: No IPv6 routes are defined.")
@@ -227,23 +299,235 @@ class NetworkInfoExporter:
             None
 
         """
-        command = ""
-        if task.host['vendor'] == "cisco" and (
-                task.host['dev_type'] == "router" or task.host['dev_type'] == "L3_switch"):
-            command = "show access-lists"
-        elif task.host['vendor'] == "juniper" and task.host['dev_type'] == "router":
-            command = "show configuration firewall"
-        else:
-            print(f"{Fore.RED}Export failed for host {task.host.name} - not implemented for that vendor.")
-            raise NornirSubTaskError(f"Function was not implemented for vendor {task.host.name}.", task)
-        result = task.run(task=netmiko_send_command, name="Get packet filters info", command_string=command)
+        command = self._get_packet_filter_command(task)
+        result = task.run(task=self._command_cache.netmiko_send_command, name="Get packet filters info", command_string=command)
         if not result.failed:
             packet_filter_info = result[0].result
+            if self._snapshot_store:
+                self._snapshot_store.write_acls(self._snapshot_id, task.host.name, packet_filter_info)
             if packet_filter_info != "":
                 file_path = Path(Path.cwd() / 'export' / "packet_filter" / f"{task.host.name}.txt")
-                exporter = FileExporter(file_path, packet_filter_info)
+                exporter = FileExporter(file_path, packet_filter_info, writer=self._export_writer)
                 exporter.export_to_file()
             else:
                 print(f"{Fore.RED}{task.host.name}: No packet filter is defined.")
         else:
             print(f"{Fore.RED}Export failed for host {task.host.name} more in nornir.log")
+
+    def export_packet_filter_analysis(self, task: Task) -> None:
+        """
+        Analýza paketových filtrů (IPv4 i IPv6) u jednotlivých síťových prvků - zastíněné (shadowed), nadbytečné (redundant)
+        a částečně se překrývající (overlap) záznamy (viz AclAnalyzer). Výsledek je vypsán a exportován do .txt souboru.
+        Export je proveden paralelně. Výsledná cesta je ./export/packet_filter/{konkrétní host}_analysis.txt (při spuštění skriptu na GNU/Linux).
+        Podporovaní výrobci + typy zařízení: Cisco (L3 switche nebo routery), Juniper (routery).
+
+        Args:
+            task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
+
+        Raises:
+            NornirSubTaskError: Výjimka, která nastane, pokud nastana chyba v nornir úkolu nebo pokud provádíte
+                export na nepodporovaných zařízeních.
+
+        Returns:
+            None
+
+        """
+        command = self._get_packet_filter_command(task)
+        result = task.run(task=self._command_cache.netmiko_send_command, name="Get packet filters info", command_string=command)
+        if not result.failed:
+            parser = AclParser()
+            entries = parser.parse(result[0].result, task.host['vendor'])
+            if entries:
+                analyzer = AclAnalyzer()
+                analysis = analyzer.analyze(entries)
+                analyzer.print_report(task.host.name, analysis)
+                lines = analyzer.format_report(analysis) + [f"unparsed: {line}" for line in parser.unparsed]
+                file_path = Path(Path.cwd() / 'export' / "packet_filter" / f"{task.host.name}_analysis.txt")
+                FileExporter(file_path, "\n".join(lines), writer=self._export_writer).export_to_file()
+            else:
+                print(f"{Fore.RED}{task.host.name}: No packet filter is defined.")
+        else:
+            print(f"{Fore.RED}Export failed for host {task.host.name} more in nornir.log")
+
+    def _get_packet_filter_command(self, task: Task) -> str:
+        """
+        Metoda, která vrací show příkaz pro výpis paketových filtrů daného zařízení.
+
+        Args:
+            task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
+
+        Raises:
+            NornirSubTaskError: Výjimka, která nastane, pokud výrobce nebo typ zařízení není podporován.
+
+        Returns:
+            Vrací show access-lists (Cisco) nebo show configuration firewall (Juniper).
+        """
+        if task.host['vendor'] == "cisco" and (
+                task.host['dev_type'] == "router" or task.host['dev_type'] == "L3_switch"):
+            return "show access-lists"
+        if task.host['vendor'] == "juniper" and task.host['dev_type'] == "router":
+            return "show configuration firewall"
+        print(f"{Fore.RED}Export failed for host {task.host.name} - not implemented for that vendor.")
+        raise NornirSubTaskError(f"Function was not implemented for vendor {task.host.name}.", task)
+
+    def export_vlans(self, task: Task) -> None:
+        """
+        Export konfigurovaných VLAN jednotlivých switchů (L2 i L3) do .txt souborů (a do lokálního úložiště, pokud je definováno).
+        Export je proveden paralelně. Výsledná cesta je ./export/vlans/{konkrétní host}.txt (při spuštění skriptu na GNU/Linux).
+
+        Args:
+            task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
+
+        Returns:
+            None
+
+        """
+        if task.host['dev_type'] != "switch" and task.host['dev_type'] != "L3_switch":
+            print(f"{Fore.RED}Export failed for host {task.host.name} - only switches and L3_switches are supported.")
+            return
+        result = task.run(task=self._command_cache.napalm_get, name="Get VLANs", getters=["vlans"])
+        if not result.failed:
+            vlans = result[0].result["vlans"]
+            if self._snapshot_store:
+                self._snapshot_store.write_vlans(self._snapshot_id, task.host.name, vlans)
+            vlans_lst = [{"vlan_id": int(vlan_id), "name": data.get("name"), "interfaces": ",".join(data.get("interfaces", []))}
+                         for vlan_id, data in vlans.items()]
+            file_path = Path(Path.cwd() / 'export' / "vlans" / f"{task.host.name}.txt")
+            exporter = FileExporter(file_path, self._format_vlans(sorted(vlans_lst, key=lambda vlan: vlan["vlan_id"])),
+                                    writer=self._export_writer)
+            exporter.export_to_file()
+        else:
+            print(f"{Fore.RED}Export failed for host {task.host.name} more in nornir.log")
+
+    def export_napalm_getters_json(self, task: Task, getters: List[str]) -> None:
+        """
+        Export výstupu NAPALM getterů (např. interfaces_counters, interfaces_ip) jednotlivých zařízení do .json souborů.
+        Export je proveden paralelně. Výsledná cesta je ./export/json/{konkrétní host}.json (při spuštění skriptu na GNU/Linux).
+
+        Args:
+            task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
+            getters (List[str]): NAPALM gettery, jejichž výstup se exportuje.
+
+        Returns:
+            None
+        """
+        result = task.run(task=self._command_cache.napalm_get, name="Get NAPALM getters data", getters=getters)
+        if not result.failed:
+            file_path = Path(Path.cwd() / 'export' / "json" / f"{task.host.name}.json")
+            exporter = FileExporter(file_path, self._serializer.dumps(result[0].result, indent=True), writer=self._export_writer)
+            exporter.export_to_file()
+        else:
+            print(f"{Fore.RED}Export failed for host {task.host.name} more in nornir.log")
+
+    def export_snapshot_views(self, snapshot_id: Optional[int] = None) -> None:
+        """
+        Vygenerování všech exportů (.txt, .conf, .xlsx) z dat uložených v lokálním úložišti - bez připojení k síťovým zařízením.
+
+        Args:
+            snapshot_id (Optional[int]): identifikátor snapshotu. Defaultně None (snapshot tohoto exportéru, případně poslední snapshot).
+
+        Raises:
+            ValueError: Výjimka, která nastane, pokud není definováno lokální úložiště nebo v něm není žádný snapshot.
+
+        Returns:
+            None
+
+        """
+        if not self._snapshot_store:
+            raise ValueError("Snapshot store is not defined.")
+        if snapshot_id is None:
+            snapshot_id = self._snapshot_id if self._snapshot_id is not None else self._snapshot_store.get_latest_snapshot_id()
+        if snapshot_id is None:
+            raise ValueError("Snapshot store is empty.")
+        store = self._snapshot_store
+        export_path = Path(Path.cwd() / 'export')
+        try:
+            facts = store.get_facts(snapshot_id)
+            if facts:
+                self._write_facts_xlsx(facts, export_path / "excel" / "facts.xlsx")
+            counters = store.get_interface_counters(snapshot_id)
+            if counters:
+                self._write_interfaces_counters_xlsx(counters, export_path / "excel" / "packets_counter.xlsx")
+        except (OSError, ValueError) as err:
+            print(f"{Fore.RED}Export of .xlsx views from snapshot {snapshot_id} failed.")
+            print(err)
+        for host in store.get_hosts(snapshot_id, "configs"):
+            FileExporter(export_path / "running_configuration" / f"{host}.conf",
+                         store.get_config(snapshot_id, host), writer=self._export_writer).export_to_file()
+        for host in store.get_hosts(snapshot_id, "routes"):
+            for address_family in ["ipv4", "ipv6"]:
+                routes = store.get_routes(snapshot_id, host, address_family)
+                if routes:
+                    FileExporter(export_path / "ip_routes" / f"{host}_{address_family}.txt", routes,
+                                 writer=self._export_writer).export_to_file()
+        for host in store.get_hosts(snapshot_id, "acls"):
+            packet_filter_info = store.get_acls(snapshot_id, host)
+            if packet_filter_info:
+                FileExporter(export_path / "packet_filter" / f"{host}.txt", packet_filter_info, writer=self._export_writer).export_to_file()
+        for host in store.get_hosts(snapshot_id, "vlans"):
+            FileExporter(export_path / "vlans" / f"{host}.txt",
+                         self._format_vlans(store.get_vlans(snapshot_id, host)), writer=self._export_writer).export_to_file()
+
+    def _write_facts_xlsx(self, facts_data: List[Dict[str, str]], dest_file_path: Path) -> None:
+        """
+        Zápis základních údajů o zařízeních do .xlsx souboru.
+
+        Args:
+            facts_data (List[Dict[str, str]]): list slovníků se základními údaji o zařízeních.
+            dest_file_path (Path): cesta k výslednému .xlsx souboru.
+
+        Returns:
+            None
+
+        """
+        wider_header_columns = ["os_version", "FQDN"]
+        exporter = ExcelExporter(Workbook(), "Základní informace o zařízeních", dest_file_path)
+        exporter.write_header(self.FACTS_HEADERS, wider_header_columns)
+        exporter.write_data(self.FACTS_HEADERS, facts_data)
+        exporter.save_xlsx_file()
+
+    def _write_interfaces_counters_xlsx(self, hosts_interfaces: Dict[str, List[Dict]], dest_file_path: Path) -> None:
+        """
+        Zápis statistik rozhraní do .xlsx souboru (jeden list pro každého hosta).
+
+        Args:
+            hosts_interfaces (Dict[str, List[Dict]]): slovník host -> list slovníků se statistikami jednotlivých rozhraní.
+            dest_file_path (Path): cesta k výslednému .xlsx souboru.
+
+        Raises:
+            ValueError: Výjimka, která nastane, pokud nejsou k dispozici žádná data.
+
+        Returns:
+            None
+
+        """
+        if not hosts_interfaces:
+            raise ValueError("No interfaces packet counters to export.")
+        wider_header_columns = ["interface"]
+        first_host = list(hosts_interfaces.keys())[0]
+        exporter = ExcelExporter(Workbook(), first_host, dest_file_path)
+        for host, host_interfaces_lst in hosts_interfaces.items():
+            sheet_name = host
+            exporter.create_sheet(sheet_name)
+            exporter.change_active_sheet(sheet_name)
+            row = 2
+            column = 1
+            exporter.write_header(self.COUNTERS_HEADERS, wider_header_columns, row, column)
+            exporter.write_data(self.COUNTERS_HEADERS, host_interfaces_lst, row, column)
+        exporter.save_xlsx_file()
+
+    def _format_vlans(self, vlans: List[Dict]) -> str:
+        """
+        Převedení VLAN do textové tabulky.
+
+        Args:
+            vlans (List[Dict]): list slovníků (vlan_id, name, interfaces).
+
+        Returns:
+            Vrací VLAN jako textovou tabulku.
+
+        """
+        lines = [f"{'VLAN':<6}{'Name':<33}Interfaces"]
+        for vlan in vlans:
+            lines.append(f"{vlan['vlan_id']:<6}{str(vlan['name']):<33}{vlan['interfaces']}")
+        return "\n".join(lines)
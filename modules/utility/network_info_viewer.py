@@ -1,11 +1,10 @@
 import datetime
-import json
 from colorama import Fore
 from nornir.core.exceptions import NornirSubTaskError
 from nornir.core.task import MultiResult, Task
-from nornir_napalm.plugins.tasks import napalm_get
-from nornir_netmiko import netmiko_send_command
 from nornir_utils.plugins.functions import print_result, print_title
+from modules.utility.command_cache import CommandCache
+from modules.utility.json_serializer import JSONSerializer
 from modules.utility.network_info_parser import NetworkInfoParser
 
 
@@ -13,8 +12,23 @@ class NetworkUtilityViewer:
     """
     Třída, která slouží pro zobrazení informací ze síťových zařízení.
     Data jsou zobrazována v konzoli (buď jako strukturovaný JSON string nebo nestrukturovaný string - podle NAPALM nebo TextFSM podpory)
+
+    Args:
+        serializer (JSONSerializer): objekt pro serializaci JSON výstupu (json_out=True). Defaultně None (orjson, pokud je nainstalován, jinak json).
+        json_lines (bool): jestli se má JSON výstup vypisovat jako jeden řádek na hosta (NDJSON) místo formátovaného JSON. Defaultně False.
+        command_cache (CommandCache): mezipaměť výstupů show příkazů a NAPALM getterů (lze sdílet s NetworkInfoExporter). Defaultně None (vlastní mezipaměť).
+
+    Attributes:
+        serializer (JSONSerializer): objekt pro serializaci JSON výstupu.
+        json_lines (bool): jestli se JSON výstup vypisuje jako jeden řádek na hosta.
+        command_cache (CommandCache): mezipaměť výstupů show příkazů a NAPALM getterů.
     """
 
+    def __init__(self, serializer: JSONSerializer = None, json_lines: bool = False, command_cache: CommandCache = None):
+        self._serializer = serializer or JSONSerializer()
+        self._json_lines = json_lines
+        self._command_cache = command_cache or CommandCache()
+
     def show_device_configuration(self, task: Task) -> None:
         """
         Metoda pro zobrazení současné (running) konfigurace u jednotlivých síťových zařízení.
@@ -25,7 +39,7 @@ class NetworkUtilityViewer:
         Returns:
             None
         """
-        result = task.run(task=napalm_get, name="Show running configuration", getters=["config"])
+        result = task.run(task=self._command_cache.napalm_get, name="Show running configuration", getters=["config"])
         if result[0].result and not result.failed:
             result[0].result = result[0].result["config"]['running'].strip()
         self._print_info_default(result)
@@ -42,7 +56,7 @@ class NetworkUtilityViewer:
         Returns:
             None
         """
-        result = task.run(task=napalm_get, name="Show NTP info (servers, peers, statistics)",
+        result = task.run(task=self._command_cache.napalm_get, name="Show NTP info (servers, peers, statistics)",
                           getters=["ntp_servers", "ntp_peers", "ntp_stats"])
         if json_out:
             self._print_info_json(result)
@@ -60,7 +74,7 @@ class NetworkUtilityViewer:
         Returns:
             None
         """
-        result = task.run(task=napalm_get, name="Show SNMP info", getters=["snmp_information"])
+        result = task.run(task=self._command_cache.napalm_get, name="Show SNMP info", getters=["snmp_information"])
         if json_out:
             self._print_info_json(result)
         else:
@@ -78,7 +92,7 @@ class NetworkUtilityViewer:
             None
         """
         if not task.host['image'] == "olive":
-            result = task.run(task=napalm_get, name="Show created users on device", getters=["users"])
+            result = task.run(task=self._command_cache.napalm_get, name="Show created users on device", getters=["users"])
             if json_out:
                 self._print_info_json(result)
             else:
@@ -114,7 +128,7 @@ class NetworkUtilityViewer:
             None
         """
         if task.host['image'] != "olive":
-            result = task.run(task=napalm_get, name="Show HW details", getters=["environment"])
+            result = task.run(task=self._command_cache.napalm_get, name="Show HW details", getters=["environment"])
             if json_out:
                 self._print_info_json(result)
             else:
@@ -143,7 +157,7 @@ class NetworkUtilityViewer:
             command = "show route"
         else:
             raise NornirSubTaskError("Function was not implemented for particular vendor.", task)
-        result = task.run(task=netmiko_send_command, name="Show IPv4 routes", command_string=command)
+        result = task.run(task=self._command_cache.netmiko_send_command, name="Show IPv4 routes", command_string=command)
         if task.host['vendor'] == "juniper" and result[0].result:
             parser = NetworkInfoParser()
             parsed_routes = parser.get_parsed_juniper_routes(result)
@@ -171,7 +185,7 @@ class NetworkUtilityViewer:
             command = "show configuration firewall"
         else:
             raise NornirSubTaskError("Function was not implemented for particular vendor.", task)
-        result = task.run(task=netmiko_send_command, name="Show packet filters info", command_string=command)
+        result = task.run(task=self._command_cache.netmiko_send_command, name="Show packet filters info", command_string=command)
         self._print_info_default(result)
 
     def show_ipv6_routes(self, task: Task) -> None:
@@ -195,7 +209,7 @@ class NetworkUtilityViewer:
             command = "show route"
         else:
             raise NornirSubTaskError("Function was not implemented for particular vendor.", task)
-        result = task.run(task=netmiko_send_command, name="Show IPv6 routes", command_string=command)
+        result = task.run(task=self._command_cache.netmiko_send_command, name="Show IPv6 routes", command_string=command)
         if task.host['vendor'] == "juniper" and result[0].result:
             parser = NetworkInfoParser()
             parsed_routes = parser.get_parsed_juniper_routes(result, ipv6_routes=True)
@@ -214,7 +228,7 @@ class NetworkUtilityViewer:
             None
         """
         if task.host['dev_type'] == "switch" or task.host['dev_type'] == "L3_switch":
-            result = task.run(task=napalm_get, name="Show configured VLANs", getters=["vlans"])
+            result = task.run(task=self._command_cache.napalm_get, name="Show configured VLANs", getters=["vlans"])
             if json_out:
                 self._print_info_json(result)
             else:
@@ -233,7 +247,7 @@ class NetworkUtilityViewer:
         Returns:
             None
         """
-        result = task.run(task=napalm_get, name="Show device basic facts", getters=["facts"])
+        result = task.run(task=self._command_cache.napalm_get, name="Show device basic facts", getters=["facts"])
 
         if not result.failed:
             uptime = result[0].result['facts']['uptime']
@@ -255,7 +269,7 @@ class NetworkUtilityViewer:
         Returns:
             None
         """
-        result = task.run(task=napalm_get, name="Show interfaces basic info", getters=["interfaces"])
+        result = task.run(task=self._command_cache.napalm_get, name="Show interfaces basic info", getters=["interfaces"])
         if json_out:
             self._print_info_json(result)
         else:
@@ -272,7 +286,7 @@ class NetworkUtilityViewer:
         Returns:
             None
         """
-        result = task.run(task=napalm_get, name="Show IP addresses assigned to interfaces", getters=["interfaces_ip"])
+        result = task.run(task=self._command_cache.napalm_get, name="Show IP addresses assigned to interfaces", getters=["interfaces_ip"])
         if json_out:
             self._print_info_json(result)
         else:
@@ -289,7 +303,7 @@ class NetworkUtilityViewer:
         Returns:
             None
         """
-        result = task.run(task=napalm_get, name="Show interfaces packet counters", getters=["interfaces_counters"])
+        result = task.run(task=self._command_cache.napalm_get, name="Show interfaces packet counters", getters=["interfaces_counters"])
         if json_out:
             self._print_info_json(result)
         else:
@@ -329,9 +343,9 @@ class NetworkUtilityViewer:
         else:
             raise NornirSubTaskError("Function was not implemented for particular vendor.", task)
         if ipv6:
-            result = task.run(task=netmiko_send_command, name="Show OSPFv3 neighbors", command_string=command)
+            result = task.run(task=self._command_cache.netmiko_send_command, name="Show OSPFv3 neighbors", command_string=command)
         else:
-            result = task.run(task=netmiko_send_command, name="Show OSPF neighbors", command_string=command)
+            result = task.run(task=self._command_cache.netmiko_send_command, name="Show OSPF neighbors", command_string=command)
         self._print_info_default(result)
 
     def _print_info_default(self, result_list: MultiResult) -> None:
@@ -354,7 +368,8 @@ class NetworkUtilityViewer:
 
     def _print_info_json(self, result_list: MultiResult) -> None:
         """
-         Metoda, pro přehledné zobrazení Nornir objektů v konzoli. Nornir objekty jsou zobrazeny jako formátovaný JSON string.
+         Metoda, pro přehledné zobrazení Nornir objektů v konzoli. Nornir objekty jsou zobrazeny jako formátovaný JSON string
+         (nebo jako jeden JSON řádek na hosta, pokud je nastaven json_lines).
 
          Args:
              result_list (MultiResult): Speciální nornir objekt (připomínající Python list), který obsahuje výsledky několika nornir úkolů konkrétního síťového zařízení.
@@ -362,9 +377,12 @@ class NetworkUtilityViewer:
          Returns:
              None
          """
-        if not result_list.failed:
+        if not result_list.failed and self._json_lines:
+            print(self._serializer.dumps({"host": str(result_list.host),
+                                          "results": [{"name": result.name, "result": result.result} for result in result_list]}))
+        elif not result_list.failed:
             print_title(f"Device {result_list.host}:")
             for result in result_list:
-                print(json.dumps(result.result, sort_keys=True, indent=4))
+                print(self._serializer.dumps(result.result, indent=True))
         else:
             print(f"{Fore.RED}Task failed for host {result_list.host}")
@@ -0,0 +1,197 @@
+import io
+import re
+import sys
+import threading
+from typing import Dict, List, Optional, TextIO
+
+from colorama import Style
+from nornir.core.inventory import Host
+from nornir.core.task import AggregatedResult, MultiResult, Task
+
+from modules.utility.json_serializer import JSONSerializer
+
+
+class _ThreadLocalStdout:
+    """
+    Náhrada sys.stdout, která zápisy z vlákna s nastaveným bufferem ukládá do bufferu daného vlákna (hosta).
+    Zápisy z ostatních vláken (např. hlavního vlákna) jsou předány původnímu streamu.
+
+    Args:
+        stream (TextIO): původní stream (sys.stdout).
+
+    Attributes:
+        stream (TextIO): původní stream.
+        local (threading.local): úložiště bufferu aktuálního vlákna.
+    """
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._local = threading.local()
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream
+
+    def get_buffer(self) -> Optional[io.StringIO]:
+        return getattr(self._local, "buffer", None)
+
+    def set_buffer(self, buffer: Optional[io.StringIO]) -> None:
+        self._local.buffer = buffer
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            return self._stream.write(text)
+        buffer.write(text)
+        if "\x1b[" in text:
+            buffer.write(Style.RESET_ALL)  # stejně jako colorama (autoreset) - barva se nepřenese na další výpis
+        return len(text)
+
+    def flush(self) -> None:
+        if getattr(self._local, "buffer", None) is None:
+            self._stream.flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self._stream, name)
+
+
+class OrderedOutputProcessor:
+    """
+    Nornir processor, který výstup úkolů (print, print_title, print_result) z jednotlivých vláken ukládá do bufferu daného hosta
+    a po dokončení úkolu na hostovi jej vypíše najednou. Výstupy hostů se tak neprolínají a vlákna se nezdržují zápisem do konzole.
+
+    Pořadí výpisu:
+
+    - completion: hosti jsou vypisováni v pořadí dokončení úkolu,
+    - inventory: hosti jsou vypisováni v pořadí inventáře (host je vypsán, jakmile jsou vypsáni všichni předchozí hosti).
+
+    V režimu ndjson je za každého hosta vypsán jeden JSON řádek (host, task, failed, changed, output, results) - vhodné pro zpracování dalšími nástroji.
+
+    Processor se registruje pomocí Nornir.with_processors([OrderedOutputProcessor(...)]).
+
+    Args:
+        order (str): pořadí výpisu hostů (completion nebo inventory). Defaultně completion.
+        ndjson (bool): jestli se má výstup vypisovat jako NDJSON (jeden JSON objekt na řádek). Defaultně False.
+        stream (Optional[TextIO]): stream, do kterého se výstup zapisuje. Defaultně None (sys.stdout, v režimu ndjson sys.__stdout__).
+        serializer (JSONSerializer): objekt pro serializaci NDJSON záznamů. Defaultně None (orjson, pokud je nainstalován, jinak json).
+
+    Attributes:
+        order (str): pořadí výpisu hostů.
+        ndjson (bool): jestli se výstup vypisuje jako NDJSON.
+        stream (Optional[TextIO]): stream, do kterého se výstup zapisuje.
+        serializer (JSONSerializer): objekt pro serializaci NDJSON záznamů.
+        stdout (Optional[_ThreadLocalStdout]): náhrada sys.stdout během běhu úkolu.
+        buffers (Dict[str, io.StringIO]): buffery jednotlivých hostů.
+        pending (Dict[str, str]): dokončené, dosud nevypsané výstupy hostů (pořadí inventory).
+        host_order (List[str]): pořadí hostů v inventáři.
+        position (int): index dalšího hosta k vypsání (pořadí inventory).
+        lock (threading.Lock): zámek pro výpis a sdílené struktury.
+    """
+
+    ORDERS = ["completion", "inventory"]
+
+    ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+    def __init__(self, order: str = "completion", ndjson: bool = False, stream: Optional[TextIO] = None,
+                 serializer: JSONSerializer = None):
+        if order not in self.ORDERS:
+            raise ValueError(f"Unknown output order {order}. Supported orders: {', '.join(self.ORDERS)}.")
+        self._order = order
+        self._ndjson = ndjson
+        self._stream = stream
+        self._serializer = serializer or JSONSerializer(sort_keys=False)
+        self._stdout: Optional[_ThreadLocalStdout] = None
+        self._buffers: Dict[str, io.StringIO] = {}
+        self._pending: Dict[str, str] = {}
+        self._host_order: List[str] = []
+        self._position = 0
+        self._lock = threading.Lock()
+
+    def task_started(self, task: Task) -> None:
+        self._stdout = _ThreadLocalStdout(sys.stdout)
+        sys.stdout = self._stdout
+        self._buffers = {}
+        self._pending = {}
+        self._host_order = [name for name in task.nornir.inventory.hosts if name not in task.nornir.data.failed_hosts]
+        self._position = 0
+
+    def task_completed(self, task: Task, result: AggregatedResult) -> None:
+        with self._lock:
+            for host in self._host_order[self._position:]:
+                if host in self._pending:
+                    self._write(self._pending.pop(host))
+            for output in self._pending.values():
+                self._write(output)
+            self._pending = {}
+        sys.stdout = self._stdout.stream
+        self._stdout = None
+
+    def task_instance_started(self, task: Task, host: Host) -> None:
+        buffer = io.StringIO()
+        with self._lock:
+            self._buffers[host.name] = buffer
+        self._stdout.set_buffer(buffer)
+
+    def task_instance_completed(self, task: Task, host: Host, result: MultiResult) -> None:
+        self._stdout.set_buffer(None)
+        with self._lock:
+            text = self._buffers.pop(host.name).getvalue()
+            output = self._format_ndjson(task, host, result, text) if self._ndjson else text
+            if self._order == "completion":
+                self._write(output)
+                return
+            self._pending[host.name] = output
+            while self._position < len(self._host_order) and self._host_order[self._position] in self._pending:
+                self._write(self._pending.pop(self._host_order[self._position]))
+                self._position += 1
+
+    def subtask_instance_started(self, task: Task, host: Host) -> None:
+        pass
+
+    def subtask_instance_completed(self, task: Task, host: Host, result: MultiResult) -> None:
+        pass
+
+    def _write(self, output: str) -> None:
+        """
+        Metoda, která najednou zapíše výstup hosta do výstupního streamu (volá se pod zámkem).
+
+        Args:
+            output (str): výstup hosta
+
+        Returns:
+            None
+        """
+        if not output:
+            return
+        if self._stream is not None:
+            stream = self._stream
+        elif self._ndjson:
+            stream = sys.__stdout__  # bez colorama wrapperu (autoreset by do JSON řádků přidával escape sekvence)
+        else:
+            stream = self._stdout.stream if self._stdout else sys.stdout
+        stream.write(output)
+        stream.flush()
+
+    def _format_ndjson(self, task: Task, host: Host, result: MultiResult, text: str) -> str:
+        """
+        Metoda, která převede výstup a výsledky úkolu hosta na jeden JSON řádek.
+
+        Args:
+            task (Task): Task objekt
+            host (Host): host, na kterém byl úkol proveden
+            result (MultiResult): výsledky úkolu a jeho podúkolů
+            text (str): zachycený výstup hosta (print)
+
+        Returns:
+            Vrací JSON řádek (včetně znaku nového řádku).
+        """
+        record = {
+            "host": host.name,
+            "task": task.name,
+            "failed": result.failed,
+            "changed": result.changed,
+            "output": self.ANSI_ESCAPE.sub("", text),
+            "results": [{"name": res.name, "failed": res.failed, "changed": res.changed, "result": res.result,
+                         "exception": str(res.exception) if res.exception else None} for res in result],
+        }
+        return self._serializer.dumps_line(record)
@@ -0,0 +1,173 @@
+import hashlib
+import re
+import shutil
+from pathlib import Path
+from typing import Any
+
+from nornir.core.inventory import Host
+from nornir.core.task import AggregatedResult, MultiResult, Task
+
+
+class SpooledResult:
+    """
+    Malá reference na data výsledku nornir úkolu, která byla uložena na disk (místo samotných dat v paměti).
+
+    Args:
+        path (Path): cesta k souboru s uloženými daty.
+        size (int): velikost dat v bajtech.
+        sha256 (str): SHA-256 hash uložených dat.
+
+    Attributes:
+        path (Path): cesta k souboru s uloženými daty.
+        size (int): velikost dat v bajtech.
+        sha256 (str): SHA-256 hash uložených dat.
+    """
+
+    def __init__(self, path: Path, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def read(self) -> str:
+        """
+        Metoda, která načte uložená data zpět do paměti.
+
+        Returns:
+            Vrací uložená data jako string.
+        """
+        return self.path.read_text(encoding="utf-8")
+
+    def __str__(self) -> str:
+        try:
+            path = self.path.relative_to(Path.cwd())
+        except ValueError:
+            path = self.path
+        return f"<spooled to {path} ({self.size} B)>"
+
+    def __repr__(self) -> str:
+        return f"SpooledResult({str(self.path)!r}, size={self.size})"
+
+
+class StreamingResultProcessor:
+    """
+    Nornir processor, který po dokončení úkolu na daném hostovi (ne až po doběhnutí celého běhu) zapíše velká data
+    z výsledků (např. running konfigurace z napalm_get, vyrenderované šablony) na disk a ve výsledku ponechá pouze
+    malou referenci (SpooledResult). Zároveň z hosta odstraní vyrenderované konfigurace (ipv4_interfaces, ipv4_ospf, ...),
+    které už po nahrání na zařízení nejsou potřeba. Spotřeba paměti tak nezávisí na velikosti inventáře.
+
+    Processor se registruje pomocí Nornir.with_processors([StreamingResultProcessor(...)]).
+
+    Args:
+        spool_dir (Path): složka, do které se ukládají data výsledků.
+        min_size (int): minimální velikost stringu (počet znaků), od které jsou data ukládána na disk. Defaultně 1024.
+        release_rendered (bool): jestli se mají z hosta odstranit vyrenderované konfigurace. Defaultně True.
+
+    Attributes:
+        spool_dir (Path): složka, do které se ukládají data výsledků.
+        min_size (int): minimální velikost stringu, od které jsou data ukládána na disk.
+        release_rendered (bool): jestli se mají z hosta odstranit vyrenderované konfigurace.
+    """
+
+    RENDERED_HOST_KEYS = ["ipv4_interfaces", "ipv6_interfaces", "switching_interfaces_config", "ipv4_ospf",
+                          "ipv6_ospf", "ipv4_eigrp", "ipv6_eigrp", "ipv4_static", "ipv6_static",
+                          "ipv4_packet_filter", "ipv6_packet_filter", "nat_overload", "conf_delete",
+                          "restore_running_conf"]
+
+    def __init__(self, spool_dir: Path, min_size: int = 1024, release_rendered: bool = True):
+        self._spool_dir = spool_dir
+        self._min_size = min_size
+        self._release_rendered = release_rendered
+
+    def clear(self) -> None:
+        """
+        Metoda, která smaže všechna data uložená processorem.
+
+        Returns:
+            None
+        """
+        shutil.rmtree(self._spool_dir, ignore_errors=True)
+
+    def task_started(self, task: Task) -> None:
+        pass
+
+    def task_completed(self, task: Task, result: AggregatedResult) -> None:
+        pass
+
+    def task_instance_started(self, task: Task, host: Host) -> None:
+        pass
+
+    def task_instance_completed(self, task: Task, host: Host, result: MultiResult) -> None:
+        """
+        Metoda volaná nornirem po dokončení úkolu na konkrétním hostovi. Uloží velká data výsledků na disk.
+
+        Args:
+            task (Task): dokončený nornir úkol
+            host (Host): host, na kterém byl úkol dokončen
+            result (MultiResult): výsledky úkolu a všech jeho podúkolů pro daného hosta
+
+        Returns:
+            None
+        """
+        host_dir = self._spool_dir / self._safe_name(task.name) / self._safe_name(host.name)
+        for position, item in enumerate(result):
+            file_stem = f"{position}_{self._safe_name(item.name or 'result')}"
+            item.result = self._spool_value(item.result, host_dir, file_stem)
+        if self._release_rendered:
+            for key in self.RENDERED_HOST_KEYS:
+                host.data.pop(key, None)
+
+    def subtask_instance_started(self, task: Task, host: Host) -> None:
+        pass
+
+    def subtask_instance_completed(self, task: Task, host: Host, result: MultiResult) -> None:
+        pass
+
+    def _spool_value(self, value: Any, folder: Path, file_stem: str) -> Any:
+        """
+        Metoda, která rekurzivně projde výsledek (string, slovník, list) a velké stringy nahradí SpooledResult referencí.
+
+        Args:
+            value (Any): výsledek nornir úkolu (nebo jeho část)
+            folder (Path): složka pro uložení dat
+            file_stem (str): název souboru (bez přípony)
+
+        Returns:
+            Vrací upravenou hodnotu (velké stringy jsou nahrazeny SpooledResult objekty).
+        """
+        if isinstance(value, str) and len(value) >= self._min_size:
+            return self._write(value, folder / f"{file_stem}.txt")
+        if isinstance(value, dict):
+            for key in value:
+                value[key] = self._spool_value(value[key], folder, f"{file_stem}_{self._safe_name(str(key))}")
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                value[i] = self._spool_value(item, folder, f"{file_stem}_{i}")
+        return value
+
+    def _write(self, content: str, file_path: Path) -> SpooledResult:
+        """
+        Metoda, která zapíše data na disk.
+
+        Args:
+            content (str): data k uložení
+            file_path (Path): cesta k souboru
+
+        Returns:
+            Vrací SpooledResult referenci na uložená data.
+        """
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        data = content.encode("utf-8")
+        file_path.write_bytes(data)
+        return SpooledResult(file_path, len(data), hashlib.sha256(data).hexdigest())
+
+    def _safe_name(self, name: str) -> str:
+        """
+        Metoda, která z názvu úkolu/hosta vytvoří bezpečný název souboru/složky.
+
+        Args:
+            name (str): původní název
+
+        Returns:
+            Vrací název obsahující pouze písmena, číslice, podtržítka, tečky a pomlčky.
+        """
+        return re.sub(r"[^\w.-]+", "_", name).strip("_") or "result"
@@ -0,0 +1,144 @@
+from typing import Any, Dict, Hashable, Optional
+
+
+class SampleCompressor:
+    """
+    Třída, která rozhoduje, které monitorované hodnoty se mají zapsat do databáze (komprese datových bodů při sběru).
+    Pro každý field lze nastavit vlastní politiku:
+
+    - always: hodnota se zapíše vždy,
+    - change_only: hodnota se zapíše pouze pokud se změnila,
+    - deadband: hodnota se zapíše pouze pokud se od poslední zapsané hodnoty liší o více než threshold,
+    - linear: hodnota se zapíše pouze pokud se o více než threshold liší od lineární predikce (poslední zapsaná hodnota + slope * uplynulý čas) - vhodné pro uptime,
+    - heartbeat: hodnota se zapíše pouze jednou za heartbeat cyklů.
+
+    U všech politik lze nastavit heartbeat - po heartbeat cyklech bez zápisu se hodnota zapíše vždy (důkaz, že zařízení je stále monitorováno).
+    První hodnota každé série se zapíše vždy.
+
+    Args:
+        policies (Optional[Dict[str, Dict[str, Any]]]): slovník field -> nastavení politiky (policy, threshold, slope, heartbeat). Defaultně None (DEFAULT_POLICIES).
+        default_policy (Optional[Dict[str, Any]]): politika pro fieldy, které nejsou v policies. Defaultně None (always).
+
+    Attributes:
+        policies (Dict[str, Dict[str, Any]]): nastavení politik jednotlivých fieldů.
+        default_policy (Dict[str, Any]): politika pro ostatní fieldy.
+        state (Dict[tuple, Dict[str, Any]]): stav série (poslední zapsaná hodnota, čas zápisu, počet cyklů od zápisu).
+        stats (Dict[str, Dict[str, int]]): počet zapsaných a potlačených hodnot pro jednotlivé fieldy.
+    """
+
+    POLICIES = ["always", "change_only", "deadband", "linear", "heartbeat"]
+
+    PACKET_RATE_POLICY = {"policy": "deadband", "threshold": 1, "heartbeat": 30}  # paketů za sekundu
+    OCTET_RATE_POLICY = {"policy": "deadband", "threshold": 1000, "heartbeat": 30}  # bajtů za sekundu
+
+    DEFAULT_POLICIES = {
+        "uptime": {"policy": "linear", "threshold": 60, "slope": 1.0, "heartbeat": 60},
+        "cpu_usage": {"policy": "deadband", "threshold": 5, "heartbeat": 30},
+        # rychlosti rozhraní (CounterRateCalculator) - nečinná rozhraní mají stále nulové rychlosti
+        "rx_octets": OCTET_RATE_POLICY,
+        "tx_octets": OCTET_RATE_POLICY,
+        **dict.fromkeys(("rx_unicast_packets", "tx_unicast_packets", "rx_multicast_packets", "tx_multicast_packets",
+                         "rx_broadcast_packets", "tx_broadcast_packets", "rx_discards", "tx_discards", "rx_errors",
+                         "tx_errors"), PACKET_RATE_POLICY),
+    }
+
+    def __init__(self, policies: Optional[Dict[str, Dict[str, Any]]] = None,
+                 default_policy: Optional[Dict[str, Any]] = None):
+        self._policies = policies if policies is not None else dict(self.DEFAULT_POLICIES)
+        self._default_policy = default_policy or {"policy": "always"}
+        for field, policy in list(self._policies.items()) + [("default", self._default_policy)]:
+            if policy.get("policy") not in self.POLICIES:
+                raise ValueError(f"Unknown compression policy {policy.get('policy')} for field {field}.")
+            if policy["policy"] == "heartbeat" and not policy.get("heartbeat"):
+                raise ValueError(f"Heartbeat policy for field {field} requires heartbeat (number of cycles).")
+        self._state: Dict[tuple, Dict[str, Any]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def filter_fields(self, series: Hashable, fields_dict: Dict[str, Any], timestamp: float) -> Dict[str, Any]:
+        """
+        Metoda, která z fieldů jednoho datového bodu vybere ty, které se mají zapsat. Potlačené hodnoty jsou započítány do statistik.
+
+        Args:
+            series (Hashable): identifikace série (např. (host, measurement) nebo (host, measurement, interface)).
+            fields_dict (Dict[str, Any]): Python slovník, který obsahuje jednotlivé sloupce (s daty) - fields.
+            timestamp (float): čas získání hodnot (unix timestamp).
+
+        Returns:
+            Vrací slovník fieldů, které se mají zapsat (prázdný slovník = nic se nezapisuje).
+        """
+        return {field: value for field, value in fields_dict.items() if self.should_write(series, field, value, timestamp)}
+
+    def should_write(self, series: Hashable, field: str, value: Any, timestamp: float) -> bool:
+        """
+        Metoda, která rozhodne, jestli se má hodnota zapsat (a aktualizuje stav série a statistiky).
+
+        Args:
+            series (Hashable): identifikace série
+            field (str): název fieldu
+            value (Any): aktuální hodnota
+            timestamp (float): čas získání hodnoty (unix timestamp)
+
+        Returns:
+            Vrací True, pokud se má hodnota zapsat.
+        """
+        policy = self._policies.get(field, self._default_policy)
+        key = (series, field)
+        state = self._state.get(key)
+        write = state is None or self._evaluate(policy, state, value, timestamp)
+        if not write and policy.get("heartbeat") and state["cycles"] + 1 >= policy["heartbeat"]:
+            write = True
+
+        stats = self._stats.setdefault(field, {"written": 0, "suppressed": 0})
+        if write:
+            self._state[key] = {"value": value, "time": timestamp, "cycles": 0}
+            stats["written"] += 1
+        else:
+            state["cycles"] += 1
+            stats["suppressed"] += 1
+        return write
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Metoda, která vrací statistiky zapsaných a potlačených hodnot.
+
+        Returns:
+            Vrací slovník field -> {"written": počet, "suppressed": počet}.
+        """
+        return {field: dict(stats) for field, stats in self._stats.items()}
+
+    def get_totals(self) -> Dict[str, int]:
+        """
+        Metoda, která vrací celkový počet zapsaných a potlačených hodnot (přes všechny fieldy).
+
+        Returns:
+            Vrací slovník {"written": počet, "suppressed": počet}.
+        """
+        return {"written": sum(stats["written"] for stats in self._stats.values()),
+                "suppressed": sum(stats["suppressed"] for stats in self._stats.values())}
+
+    def _evaluate(self, policy: Dict[str, Any], state: Dict[str, Any], value: Any, timestamp: float) -> bool:
+        """
+        Metoda, která vyhodnotí politiku pro hodnotu, která už má předchozí zapsanou hodnotu.
+
+        Args:
+            policy (Dict[str, Any]): nastavení politiky
+            state (Dict[str, Any]): stav série (poslední zapsaná hodnota a čas zápisu)
+            value (Any): aktuální hodnota
+            timestamp (float): čas získání hodnoty
+
+        Returns:
+            Vrací True, pokud se má hodnota dle politiky zapsat.
+        """
+        name = policy["policy"]
+        last_value = state["value"]
+        if name == "always":
+            return True
+        if name == "heartbeat":
+            return False
+        if name == "change_only" or not isinstance(value, (int, float)) or not isinstance(last_value, (int, float)):
+            return value != last_value
+        threshold = policy.get("threshold", 0)
+        if name == "deadband":
+            return abs(value - last_value) > threshold
+        predicted = last_value + policy.get("slope", 1.0) * (timestamp - state["time"])
+        return abs(value - predicted) > threshold
@@ -0,0 +1,207 @@
+import multiprocessing
+import os
+import pickle
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from colorama import Fore
+from nornir.core import Nornir
+from nornir.core.task import AggregatedResult, MultiResult, Result
+from nornir.plugins.runners import ThreadedRunner
+
+from modules.utility.log_pipeline import setup_log_pipeline, setup_worker_log_pipeline
+
+
+class ShardedTaskError(Exception):
+    """
+    Výjimka, která nahrazuje původní výjimku z pracovního procesu (původní výjimky často nejdou přenést mezi procesy - obsahují Task/Host objekty).
+    """
+
+
+def _to_picklable(value: Any) -> Any:
+    """
+    Funkce, která ověří, jestli lze hodnotu přenést mezi procesy. Pokud ne, je nahrazena svou textovou reprezentací.
+
+    Args:
+        value (Any): hodnota (výsledek nornir úkolu)
+
+    Returns:
+        Vrací původní hodnotu nebo její textovou reprezentaci.
+    """
+    try:
+        pickle.dumps(value)
+        return value
+    except Exception:
+        return str(value)
+
+
+def _serialize_aggregated_result(aggregated_result: AggregatedResult) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Funkce, která převede AggregatedResult na slovník jednoduchých (přenositelných) hodnot.
+
+    Args:
+        aggregated_result (AggregatedResult): výsledky nornir úkolu z jednoho pracovního procesu.
+
+    Returns:
+        Vrací slovník host -> list slovníků (jeden slovník pro každý Result objekt v MultiResult).
+    """
+    serialized = {}
+    for host, multi_result in aggregated_result.items():
+        serialized[host] = []
+        for result in multi_result:
+            exception = None
+            if result.exception is not None:
+                exception = f"{type(result.exception).__name__}: {result.exception}"
+            serialized[host].append({"name": result.name, "result": _to_picklable(result.result),
+                                     "changed": result.changed, "diff": _to_picklable(result.diff),
+                                     "failed": result.failed, "exception": exception,
+                                     "severity_level": result.severity_level})
+    return serialized
+
+
+def _init_worker(log_queue: Any) -> None:
+    """
+    Funkce, která inicializuje pracovní proces - logovací pipeline zděděná od rodičovského procesu (fork) nemá v pracovním procesu
+    zapisovací vlákno, proto je nahrazena pipeline, která záznamy přeposílá do rodičovského procesu (do nornir.log zapisuje
+    a soubor rotuje pouze rodičovský proces).
+
+    Args:
+        log_queue (Any): fronta rodičovského procesu pro log záznamy (multiprocessing.Queue)
+
+    Returns:
+        None
+    """
+    setup_worker_log_pipeline(log_queue)
+
+
+def _run_shard(inventory_factory: Callable[[], Nornir], host_names: List[str], num_workers: Optional[int],
+               task: Callable, name: Optional[str], kwargs: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Funkce, která běží v pracovním procesu. Vytvoří vlastní Nornir objekt (včetně vlastních spojení na zařízení),
+    vyfiltruje hosty daného shardu a spustí na nich nornir úkol.
+
+    Args:
+        inventory_factory (Callable[[], Nornir]): funkce, která vytvoří Nornir objekt (např. setup_inventory z main.py).
+        host_names (List[str]): jména hostů, které patří do daného shardu.
+        num_workers (Optional[int]): počet vláken threaded runneru v rámci procesu. None - ponechá se hodnota z config.yml.
+        task (Callable): nornir úkol (musí jít serializovat pomocí pickle - funkce nebo metoda objektu na úrovni modulu).
+        name (Optional[str]): název nornir úkolu
+        kwargs (Dict[str, Any]): argumenty nornir úkolu
+
+    Returns:
+        Vrací serializované výsledky nornir úkolu (viz _serialize_aggregated_result).
+    """
+    nornir_obj = inventory_factory()
+    if num_workers:
+        nornir_obj = nornir_obj.with_runner(ThreadedRunner(num_workers=num_workers))
+    shard_names = set(host_names)
+    shard = nornir_obj.filter(filter_func=lambda host: host.name in shard_names)
+    try:
+        result = shard.run(task=task, name=name, **kwargs)
+        return _serialize_aggregated_result(result)
+    finally:
+        shard.close_connections()
+
+
+class ShardedRunner:
+    """
+    Třída, která rozdělí inventář do několika shardů a každý shard zpracuje v samostatném procesu (s vlastním Nornir objektem,
+    vlastním threaded runnerem a vlastními spojeními). Parsování, tvorba reportů a renderování šablon tak nesoupeří o GIL jednoho procesu.
+    Výsledky jednotlivých procesů jsou v rodičovském procesu sloučeny zpět do jednoho AggregatedResult objektu.
+    Log záznamy pracovních procesů jsou přeposílány do logovací pipeline rodičovského procesu (do nornir.log zapisuje jediný proces).
+
+    Args:
+        inventory_factory (Callable[[], Nornir]): funkce, která v pracovním procesu vytvoří Nornir objekt (např. setup_inventory z main.py).
+        num_processes (int): počet pracovních procesů. Defaultně None (počet CPU jader).
+        num_workers (int): počet vláken v rámci jednoho procesu. Defaultně None (hodnota z config.yml).
+
+    Attributes:
+        inventory_factory (Callable[[], Nornir]): funkce pro vytvoření Nornir objektu v pracovním procesu.
+        num_processes (int): počet pracovních procesů.
+        num_workers (Optional[int]): počet vláken v rámci jednoho procesu.
+    """
+
+    def __init__(self, inventory_factory: Callable[[], Nornir], num_processes: Optional[int] = None,
+                 num_workers: Optional[int] = None):
+        self._inventory_factory = inventory_factory
+        self._num_processes = num_processes or os.cpu_count() or 1
+        self._num_workers = num_workers
+
+    def split_inventory(self, nornir_devices: Nornir) -> List[List[str]]:
+        """
+        Metoda, která rozdělí hosty do shardů (round-robin - zařízení stejného typu jsou rozprostřena mezi všechny procesy).
+
+        Args:
+            nornir_devices (Nornir): filtrovaný Nornir objekt, jehož hosti budou rozděleni.
+
+        Returns:
+            Vrací list shardů (každý shard je list jmen hostů). Prázdné shardy nejsou vraceny.
+        """
+        host_names = list(nornir_devices.inventory.hosts.keys())
+        shards = [host_names[i::self._num_processes] for i in range(self._num_processes)]
+        return [shard for shard in shards if shard]
+
+    def run(self, nornir_devices: Nornir, task: Callable, name: Optional[str] = None, **kwargs: Any) -> AggregatedResult:
+        """
+        Metoda, která paralelně spustí nornir úkol ve více procesech a sloučí výsledky.
+
+        Args:
+            nornir_devices (Nornir): filtrovaný Nornir objekt, který určuje, na kterých hostech bude úkol spuštěn.
+            task (Callable): nornir úkol (funkce nebo metoda objektu, kterou lze serializovat pomocí pickle).
+            name (Optional[str]): název nornir úkolu. Defaultně None (název funkce).
+            **kwargs (Any): argumenty předané nornir úkolu.
+
+        Returns:
+            Vrací AggregatedResult objekt se sloučenými výsledky ze všech procesů (Result objekty odkazují na Host objekty rodičovského procesu).
+            Hosti, jejichž proces selhal, jsou označeni jako failed.
+        """
+        task_name = name or getattr(task, "__name__", str(task))
+        aggregated_result = AggregatedResult(task_name)
+        shards = self.split_inventory(nornir_devices)
+        if not shards:
+            return aggregated_result
+        log_pipeline = setup_log_pipeline()
+        log_queue = multiprocessing.Queue()
+        log_pipeline.listen(log_queue)
+        try:
+            with ProcessPoolExecutor(max_workers=min(self._num_processes, len(shards)), initializer=_init_worker,
+                                     initargs=(log_queue,)) as executor:
+                futures = {executor.submit(_run_shard, self._inventory_factory, shard, self._num_workers, task, name, kwargs):
+                           shard for shard in shards}
+                for future, shard in futures.items():
+                    try:
+                        shard_result = future.result()
+                    except Exception as err:
+                        print(f"{Fore.RED}Shard {shard} failed: {err}")
+                        shard_result = {host: [{"name": task_name, "result": traceback.format_exc(), "changed": False,
+                                                "diff": "", "failed": True,
+                                                "exception": f"{type(err).__name__}: {err}", "severity_level": 40}]
+                                        for host in shard}
+                    self._merge(nornir_devices, aggregated_result, shard_result)
+        finally:
+            log_pipeline.stop_listening(log_queue)  # předání zbývajících záznamů pracovních procesů
+        return aggregated_result
+
+    def _merge(self, nornir_devices: Nornir, aggregated_result: AggregatedResult,
+               shard_result: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        Metoda, která převede serializované výsledky jednoho shardu zpět na nornir Result/MultiResult objekty a vloží je do AggregatedResult.
+
+        Args:
+            nornir_devices (Nornir): Nornir objekt rodičovského procesu (zdroj Host objektů).
+            aggregated_result (AggregatedResult): výsledný objekt, do kterého jsou výsledky vkládány.
+            shard_result (Dict[str, List[Dict[str, Any]]]): serializované výsledky shardu.
+
+        Returns:
+            None
+        """
+        for host_name, results in shard_result.items():
+            host = nornir_devices.inventory.hosts.get(host_name)
+            multi_result = MultiResult(aggregated_result.name)
+            for data in results:
+                exception = ShardedTaskError(data["exception"]) if data["exception"] else None
+                multi_result.append(Result(host=host, result=data["result"], changed=data["changed"],
+                                           diff=data["diff"], failed=data["failed"], exception=exception,
+                                           severity_level=data["severity_level"], name=data["name"]))
+            aggregated_result[host_name] = multi_result
@@ -0,0 +1,507 @@
+import hashlib
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class SnapshotStore:
+    """
+    Třída, která slouží jako lokální úložiště (SQLite) pro veškerá sesbíraná síťová data (základní údaje, statistiky rozhraní,
+    směrovací tabulky, ACL, VLAN a konfigurace). Data jsou ukládána pod identifikátorem snapshotu (jeden běh sběru dat) a jménem hosta,
+    takže je lze zpětně dotazovat a porovnávat. Textové a .xlsx exporty lze z uložených dat kdykoliv znovu vygenerovat.
+    Počty shod záznamů ACL jsou ukládány jako časová řada (host, záznam, čas sběru) nezávislá na snapshotech.
+
+    Args:
+        db_path (Path): cesta k SQLite databázi. Složky jsou vytvořeny, pokud neexistují.
+
+    Attributes:
+        db_path (Path): cesta k SQLite databázi.
+        conn (sqlite3.Connection): spojení s databází (sdílené vlákny nornir runneru).
+        lock (threading.Lock): zámek, který serializuje zápisy z více vláken.
+    """
+
+    COUNTER_COLUMNS = ["rx_broadcast", "rx_discards", "rx_errors", "rx_multicast", "rx_octets", "rx_unicast",
+                       "tx_broadcast", "tx_discards", "tx_errors", "tx_multicast", "tx_octets", "tx_unicast"]
+
+    FACTS_COLUMNS = ["hostname", "FQDN", "vendor", "model", "serial_number", "os_version", "uptime", "connection"]
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at TEXT NOT NULL,
+            description TEXT
+        );
+        CREATE TABLE IF NOT EXISTS facts (
+            snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+            host TEXT NOT NULL,
+            hostname TEXT, FQDN TEXT, vendor TEXT, model TEXT, serial_number TEXT,
+            os_version TEXT, uptime TEXT, connection TEXT,
+            PRIMARY KEY (snapshot_id, host)
+        );
+        CREATE TABLE IF NOT EXISTS interface_counters (
+            snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+            host TEXT NOT NULL,
+            interface TEXT NOT NULL,
+            rx_broadcast INTEGER, rx_discards INTEGER, rx_errors INTEGER, rx_multicast INTEGER,
+            rx_octets INTEGER, rx_unicast INTEGER, tx_broadcast INTEGER, tx_discards INTEGER,
+            tx_errors INTEGER, tx_multicast INTEGER, tx_octets INTEGER, tx_unicast INTEGER,
+            PRIMARY KEY (snapshot_id, host, interface)
+        );
+        CREATE TABLE IF NOT EXISTS routes (
+            snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+            host TEXT NOT NULL,
+            address_family TEXT NOT NULL,
+            line_no INTEGER NOT NULL,
+            prefix TEXT,
+            line TEXT NOT NULL,
+            PRIMARY KEY (snapshot_id, host, address_family, line_no)
+        );
+        CREATE INDEX IF NOT EXISTS routes_prefix_idx ON routes (prefix, snapshot_id);
+        CREATE TABLE IF NOT EXISTS acls (
+            snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+            host TEXT NOT NULL,
+            line_no INTEGER NOT NULL,
+            acl_name TEXT,
+            line TEXT NOT NULL,
+            PRIMARY KEY (snapshot_id, host, line_no)
+        );
+        CREATE INDEX IF NOT EXISTS acls_name_idx ON acls (acl_name, snapshot_id);
+        CREATE TABLE IF NOT EXISTS vlans (
+            snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+            host TEXT NOT NULL,
+            vlan_id INTEGER NOT NULL,
+            name TEXT,
+            interfaces TEXT,
+            PRIMARY KEY (snapshot_id, host, vlan_id)
+        );
+        CREATE INDEX IF NOT EXISTS vlans_vlan_idx ON vlans (vlan_id, snapshot_id);
+        CREATE TABLE IF NOT EXISTS configs (
+            snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+            host TEXT NOT NULL,
+            sha256 TEXT NOT NULL,
+            config TEXT NOT NULL,
+            PRIMARY KEY (snapshot_id, host)
+        );
+        CREATE INDEX IF NOT EXISTS configs_sha_idx ON configs (host, sha256);
+        CREATE TABLE IF NOT EXISTS acl_hits (
+            host TEXT NOT NULL,
+            acl_name TEXT NOT NULL,
+            seq TEXT NOT NULL,
+            collected_at TEXT NOT NULL,
+            line TEXT NOT NULL,
+            hits INTEGER NOT NULL,
+            delta INTEGER,
+            PRIMARY KEY (host, acl_name, seq, collected_at)
+        );
+        CREATE INDEX IF NOT EXISTS acl_hits_time_idx ON acl_hits (host, collected_at);
+    """
+
+    def __init__(self, db_path: Path):
+        self._db_path = db_path
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+            self._conn.commit()
+
+    def close(self) -> None:
+        """
+        Metoda pro uzavření spojení s databází.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._conn.close()
+
+    def create_snapshot(self, description: str = "") -> int:
+        """
+        Metoda, která vytvoří nový snapshot (jeden běh sběru dat).
+
+        Args:
+            description (str): popis snapshotu. Defaultně prázdný string.
+
+        Returns:
+            Vrací identifikátor nového snapshotu.
+        """
+        with self._lock:
+            cursor = self._conn.execute("INSERT INTO snapshots (created_at, description) VALUES (?, ?)",
+                                        (datetime.now().isoformat(timespec="seconds"), description))
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def get_latest_snapshot_id(self) -> Optional[int]:
+        """
+        Metoda, která vrací identifikátor posledního snapshotu.
+
+        Returns:
+            Vrací identifikátor posledního snapshotu nebo None (pokud žádný snapshot neexistuje).
+        """
+        row = self._query("SELECT MAX(id) AS id FROM snapshots")
+        return row[0]["id"] if row else None
+
+    def write_facts(self, snapshot_id: int, host: str, facts: Dict[str, Any]) -> None:
+        """
+        Metoda pro uložení základních údajů o zařízení (zparsovaný výstup NAPALM getteru facts).
+
+        Args:
+            snapshot_id (int): identifikátor snapshotu
+            host (str): jméno hosta
+            facts (Dict[str, Any]): základní údaje o zařízení (viz NetworkInfoParser.get_parsed_facts_data)
+
+        Returns:
+            None
+        """
+        values = [str(facts[column]) if facts.get(column) is not None else None for column in self.FACTS_COLUMNS]
+        self._execute(f"INSERT OR REPLACE INTO facts (snapshot_id, host, {', '.join(self.FACTS_COLUMNS)}) "
+                      f"VALUES (?, ?, {', '.join('?' * len(self.FACTS_COLUMNS))})", [(snapshot_id, host, *values)])
+
+    def write_interface_counters(self, snapshot_id: int, host: str, counters: Dict[str, Dict[str, int]]) -> None:
+        """
+        Metoda pro uložení statistik rozhraní (zparsovaný výstup NAPALM getteru interfaces_counters).
+
+        Args:
+            snapshot_id (int): identifikátor snapshotu
+            host (str): jméno hosta
+            counters (Dict[str, Dict[str, int]]): slovník rozhraní -> statistiky (viz NetworkInfoParser.parse_interfaces_packet_counters_data)
+
+        Returns:
+            None
+        """
+        rows = [(snapshot_id, host, interface, *[data.get(column) for column in self.COUNTER_COLUMNS])
+                for interface, data in counters.items()]
+        self._execute(f"INSERT OR REPLACE INTO interface_counters (snapshot_id, host, interface, "
+                      f"{', '.join(self.COUNTER_COLUMNS)}) VALUES (?, ?, ?, {', '.join('?' * len(self.COUNTER_COLUMNS))})",
+                      rows)
+
+    def write_routes(self, snapshot_id: int, host: str, address_family: str, routes: str) -> None:
+        """
+        Metoda pro uložení směrovací tabulky (řádek po řádku, u každého řádku je uložen i nalezený prefix).
+
+        Args:
+            snapshot_id (int): identifikátor snapshotu
+            host (str): jméno hosta
+            address_family (str): ipv4 nebo ipv6
+            routes (str): nestrukturovaný výstup směrovací tabulky
+
+        Returns:
+            None
+        """
+        rows = [(snapshot_id, host, address_family, line_no, self._find_prefix(line), line)
+                for line_no, line in enumerate(routes.splitlines())]
+        with self._lock:
+            self._conn.execute("DELETE FROM routes WHERE snapshot_id = ? AND host = ? AND address_family = ?",
+                               (snapshot_id, host, address_family))
+            self._conn.executemany("INSERT INTO routes (snapshot_id, host, address_family, line_no, prefix, line) "
+                                   "VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def write_acls(self, snapshot_id: int, host: str, packet_filter_info: str) -> None:
+        """
+        Metoda pro uložení paketových filtrů (řádek po řádku, u každého řádku je uložen i název ACL/filtru, do kterého patří).
+
+        Args:
+            snapshot_id (int): identifikátor snapshotu
+            host (str): jméno hosta
+            packet_filter_info (str): nestrukturovaný výstup (show access-lists nebo show configuration firewall)
+
+        Returns:
+            None
+        """
+        rows = []
+        acl_name = None
+        for line_no, line in enumerate(packet_filter_info.splitlines()):
+            header = re.match(r"^(?:Standard|Extended|Reflexive)?\s*(?:IP|IPv6|MAC)?\s*access list\s+(\S+)", line)
+            junos_filter = re.match(r"^\s*filter\s+(\S+)\s*\{", line)
+            if header:
+                acl_name = header.group(1)
+            elif junos_filter:
+                acl_name = junos_filter.group(1)
+            rows.append((snapshot_id, host, line_no, acl_name, line))
+        with self._lock:
+            self._conn.execute("DELETE FROM acls WHERE snapshot_id = ? AND host = ?", (snapshot_id, host))
+            self._conn.executemany("INSERT INTO acls (snapshot_id, host, line_no, acl_name, line) VALUES (?, ?, ?, ?, ?)",
+                                   rows)
+            self._conn.commit()
+
+    def write_acl_hits(self, host: str, collected_at: str, samples: List[Dict[str, Any]]) -> None:
+        """
+        Metoda pro uložení vzorku počtu shod jednotlivých záznamů ACL (časová řada - jeden řádek na záznam a čas sběru).
+
+        Args:
+            host (str): jméno hosta
+            collected_at (str): čas sběru (ISO formát)
+            samples (List[Dict[str, Any]]): záznamy ACL - slovníky s klíči acl, seq, line, hits a delta (viz AclHitCollector)
+
+        Returns:
+            None
+        """
+        self._execute("INSERT OR REPLACE INTO acl_hits (host, acl_name, seq, collected_at, line, hits, delta) "
+                      "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                      [(host, sample["acl"], sample["seq"], collected_at, sample["line"], sample["hits"], sample["delta"])
+                       for sample in samples])
+
+    def write_vlans(self, snapshot_id: int, host: str, vlans: Dict[Any, Dict[str, Any]]) -> None:
+        """
+        Metoda pro uložení VLAN (výstup NAPALM getteru vlans).
+
+        Args:
+            snapshot_id (int): identifikátor snapshotu
+            host (str): jméno hosta
+            vlans (Dict[Any, Dict[str, Any]]): slovník VLAN ID -> {"name": ..., "interfaces": [...]}
+
+        Returns:
+            None
+        """
+        rows = [(snapshot_id, host, int(vlan_id), data.get("name"), ",".join(data.get("interfaces", [])))
+                for vlan_id, data in vlans.items()]
+        self._execute("INSERT OR REPLACE INTO vlans (snapshot_id, host, vlan_id, name, interfaces) VALUES (?, ?, ?, ?, ?)",
+                      rows)
+
+    def write_config(self, snapshot_id: int, host: str, config: str) -> None:
+        """
+        Metoda pro uložení running konfigurace zařízení.
+
+        Args:
+            snapshot_id (int): identifikátor snapshotu
+            host (str): jméno hosta
+            config (str): running konfigurace
+
+        Returns:
+            None
+        """
+        sha256 = hashlib.sha256(config.encode("utf-8")).hexdigest()
+        self._execute("INSERT OR REPLACE INTO configs (snapshot_id, host, sha256, config) VALUES (?, ?, ?, ?)",
+                      [(snapshot_id, host, sha256, config)])
+
+    def get_facts(self, snapshot_id: int) -> List[Dict[str, Any]]:
+        """
+        Metoda, která vrací základní údaje o zařízeních daného snapshotu.
+
+        Args:
+            snapshot_id (int): identifikátor snapshotu
+
+        Returns:
+            Vrací list slovníků (jeden slovník pro každého hosta).
+        """
+        return [dict(row) for row in self._query("SELECT * FROM facts WHERE snapshot_id = ? ORDER BY host", (snapshot_id,))]
+
+    def get_interface_counters(self, snapshot_id: int) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Metoda, která vrací statistiky rozhraní daného snapshotu.
+
+        Args:
+            snapshot_id (int): identifikátor snapshotu
+
+        Returns:
+            Vrací slovník host -> list slovníků se statistikami jednotlivých rozhraní (seřazeno dle názvu rozhraní).
+        """
+        data = {}
+        for row in self._query("SELECT * FROM interface_counters WHERE snapshot_id = ? ORDER BY host, interface",
+                               (snapshot_id,)):
+            data.setdefault(row["host"], []).append(dict(row))
+        return data
+
+    def get_routes(self, snapshot_id: int, host: str, address_family: str) -> str:
+        """
+        Metoda, která vrací směrovací tabulku hosta v původní textové podobě.
+
+        Args:
+            snapshot_id (int): identifikátor snapshotu
+            host (str): jméno hosta
+            address_family (str): ipv4 nebo ipv6
+
+        Returns:
+            Vrací směrovací tabulku jako string.
+        """
+        rows = self._query("SELECT line FROM routes WHERE snapshot_id = ? AND host = ? AND address_family = ? "
+                           "ORDER BY line_no", (snapshot_id, host, address_family))
+        return "\n".join(row["line"] for row in rows)
+
+    def get_acls(self, snapshot_id: int, host: str) -> str:
+        """
+        Metoda, která vrací paketové filtry hosta v původní textové podobě.
+
+        Args:
+            snapshot_id (int): identifikátor snapshotu
+            host (str): jméno hosta
+
+        Returns:
+            Vrací paketové filtry jako string.
+        """
+        rows = self._query("SELECT line FROM acls WHERE snapshot_id = ? AND host = ? ORDER BY line_no",
+                           (snapshot_id, host))
+        return "\n".join(row["line"] for row in rows)
+
+    def get_vlans(self, snapshot_id: int, host: str) -> List[Dict[str, Any]]:
+        """
+        Metoda, která vrací VLAN hosta.
+
+        Args:
+            snapshot_id (int): identifikátor snapshotu
+            host (str): jméno hosta
+
+        Returns:
+            Vrací list slovníků (vlan_id, name, interfaces) seřazený dle VLAN ID.
+        """
+        rows = self._query("SELECT vlan_id, name, interfaces FROM vlans WHERE snapshot_id = ? AND host = ? ORDER BY vlan_id",
+                           (snapshot_id, host))
+        return [dict(row) for row in rows]
+
+    def get_config(self, snapshot_id: int, host: str) -> Optional[str]:
+        """
+        Metoda, která vrací running konfiguraci hosta.
+
+        Args:
+            snapshot_id (int): identifikátor snapshotu
+            host (str): jméno hosta
+
+        Returns:
+            Vrací running konfiguraci nebo None (pokud nebyla uložena).
+        """
+        rows = self._query("SELECT config FROM configs WHERE snapshot_id = ? AND host = ?", (snapshot_id, host))
+        return rows[0]["config"] if rows else None
+
+    def get_latest_acl_hits(self, host: str) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Metoda, která vrací poslední uložený vzorek počtu shod záznamů ACL hosta.
+
+        Args:
+            host (str): jméno hosta
+
+        Returns:
+            Vrací slovník (název ACL, pořadové číslo) -> {"line": ..., "hits": ...} (prázdný slovník, pokud vzorek neexistuje).
+        """
+        rows = self._query("SELECT acl_name, seq, line, hits FROM acl_hits WHERE host = ? AND collected_at = "
+                           "(SELECT MAX(collected_at) FROM acl_hits WHERE host = ?)", (host, host))
+        return {(row["acl_name"], row["seq"]): {"line": row["line"], "hits": row["hits"]} for row in rows}
+
+    def get_acl_hits(self, host: str, acl_name: Optional[str] = None, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Metoda, která vrací časovou řadu počtu shod záznamů ACL hosta.
+
+        Args:
+            host (str): jméno hosta
+            acl_name (Optional[str]): název ACL. Defaultně None (všechny ACL).
+            since (Optional[str]): počáteční čas (ISO formát). Defaultně None (celá řada).
+
+        Returns:
+            Vrací list slovníků (acl_name, seq, collected_at, line, hits, delta) seřazený dle ACL, záznamu a času.
+        """
+        query = "SELECT acl_name, seq, collected_at, line, hits, delta FROM acl_hits WHERE host = ?"
+        params = [host]
+        if acl_name is not None:
+            query += " AND acl_name = ?"
+            params.append(acl_name)
+        if since is not None:
+            query += " AND collected_at >= ?"
+            params.append(since)
+        rows = self._query(query + " ORDER BY acl_name, CAST(seq AS INTEGER), seq, collected_at", tuple(params))
+        return [dict(row) for row in rows]
+
+    def find_unused_acl_entries(self, since: str, host: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Metoda, která vyhledá záznamy ACL bez jediné shody od daného času. Uvažovány jsou pouze záznamy, které jsou sledovány
+        nejpozději od tohoto času (starší vzorek) a jsou obsaženy v posledním vzorku hosta (záznam nebyl mezitím odstraněn).
+
+        Args:
+            since (str): počáteční čas okna (ISO formát)
+            host (Optional[str]): jméno hosta. Defaultně None (všichni hosti).
+
+        Returns:
+            Vrací list slovníků (host, acl_name, seq, line, hits, first_seen) seřazený dle hosta, ACL a pořadového čísla.
+        """
+        query = """
+            SELECT h.host, h.acl_name, h.seq, h.line, MAX(h.hits) AS hits, MIN(h.collected_at) AS first_seen
+            FROM acl_hits h
+            JOIN (SELECT host, MAX(collected_at) AS collected_at FROM acl_hits GROUP BY host) latest ON latest.host = h.host
+            WHERE (? IS NULL OR h.host = ?)
+            GROUP BY h.host, h.acl_name, h.seq, h.line
+            HAVING MIN(h.collected_at) <= ? AND MAX(h.collected_at) = MAX(latest.collected_at)
+                AND SUM(CASE WHEN h.collected_at > ? THEN COALESCE(h.delta, 0) ELSE 0 END) = 0
+            ORDER BY h.host, h.acl_name, CAST(h.seq AS INTEGER), h.seq
+        """
+        return [dict(row) for row in self._query(query, (host, host, since, since))]
+
+    def get_hosts(self, snapshot_id: int, table: str) -> List[str]:
+        """
+        Metoda, která vrací jména hostů, pro které jsou v daném snapshotu uložena data.
+
+        Args:
+            snapshot_id (int): identifikátor snapshotu
+            table (str): název tabulky (facts, interface_counters, routes, acls, vlans, configs)
+
+        Raises:
+            ValueError: Výjimka, která nastane, pokud tabulka neexistuje.
+
+        Returns:
+            Vrací seřazený list jmen hostů.
+        """
+        if table not in ["facts", "interface_counters", "routes", "acls", "vlans", "configs"]:
+            raise ValueError(f"Unknown table {table}.")
+        rows = self._query(f"SELECT DISTINCT host FROM {table} WHERE snapshot_id = ? ORDER BY host", (snapshot_id,))
+        return [row["host"] for row in rows]
+
+    def find_routes(self, prefix: str, snapshot_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Metoda, která vyhledá hosty, jejichž směrovací tabulka obsahuje daný prefix.
+
+        Args:
+            prefix (str): hledaný prefix (např. 192.168.30.0/24)
+            snapshot_id (Optional[int]): identifikátor snapshotu. Defaultně None (poslední snapshot).
+
+        Returns:
+            Vrací list slovníků (host, address_family, line).
+        """
+        snapshot_id = snapshot_id if snapshot_id is not None else self.get_latest_snapshot_id()
+        rows = self._query("SELECT host, address_family, line FROM routes WHERE prefix = ? AND snapshot_id = ? "
+                           "ORDER BY host", (prefix, snapshot_id))
+        return [dict(row) for row in rows]
+
+    def _find_prefix(self, line: str) -> Optional[str]:
+        """
+        Metoda, která v řádku směrovací tabulky najde první IPv4 nebo IPv6 prefix.
+
+        Args:
+            line (str): řádek směrovací tabulky
+
+        Returns:
+            Vrací nalezený prefix (malými písmeny) nebo None.
+        """
+        match = re.search(r"(\d{1,3}(?:\.\d{1,3}){3}(?:/\d{1,2})?|[0-9A-Fa-f]*:[0-9A-Fa-f:]+/\d{1,3})", line)
+        return match.group(1).lower() if match else None
+
+    def _execute(self, query: str, rows: List[tuple]) -> None:
+        """
+        Metoda, která provede zápis více řádků v jedné transakci.
+
+        Args:
+            query (str): SQL příkaz
+            rows (List[tuple]): parametry jednotlivých řádků
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._conn.executemany(query, rows)
+            self._conn.commit()
+
+    def _query(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """
+        Metoda, která provede SQL dotaz.
+
+        Args:
+            query (str): SQL dotaz
+            params (tuple): parametry dotazu
+
+        Returns:
+            Vrací list řádků výsledku.
+        """
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
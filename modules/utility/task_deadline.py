@@ -0,0 +1,208 @@
+import sys
+import threading
+from typing import Callable, Dict, List, Optional
+
+from colorama import Fore
+from nornir.core.exceptions import NornirSubTaskError
+from nornir.core.inventory import Host
+from nornir.core.plugins.connections import ConnectionPlugin
+from nornir.core.processor import Processors
+from nornir.core.task import AggregatedResult, MultiResult, Task
+
+
+class TaskDeadlineExceeded(Exception):
+    """
+    Výjimka, která nastane, pokud nornir úkol (podúkol) nedoběhne do nastaveného deadlinu.
+    """
+
+
+class TaskCancelled(Exception):
+    """
+    Výjimka, která v pomocném vlákně ukončí opuštěný úkol před spuštěním jeho dalšího podúkolu (viz _CancellationProcessor).
+    """
+
+
+class _CancellationProcessor:
+    """
+    Nornir processor pomocného vlákna, který před spuštěním každého dalšího podúkolu zkontroluje příznak zrušení.
+    Po vypršení deadlinu tak opuštěný úkol nespustí žádný další podúkol (např. další část konfigurace).
+
+    Args:
+        cancelled (threading.Event): příznak zrušení (nastaven po vypršení deadlinu).
+
+    Attributes:
+        cancelled (threading.Event): příznak zrušení.
+    """
+
+    def __init__(self, cancelled: threading.Event):
+        self._cancelled = cancelled
+
+    def task_started(self, task: Task) -> None:
+        pass
+
+    def task_completed(self, task: Task, result: AggregatedResult) -> None:
+        pass
+
+    def task_instance_started(self, task: Task, host: Host) -> None:
+        pass
+
+    def task_instance_completed(self, task: Task, host: Host, result: MultiResult) -> None:
+        pass
+
+    def subtask_instance_started(self, task: Task, host: Host) -> None:
+        if self._cancelled.is_set():
+            raise TaskCancelled(f"{host.name}: task {task.name} was not started - parent task exceeded its deadline.")
+
+    def subtask_instance_completed(self, task: Task, host: Host, result: MultiResult) -> None:
+        pass
+
+
+class TaskDeadline:
+    """
+    Třída, která omezuje dobu běhu nornir úkolů a podúkolů (wall-clock deadline). Úkol běží v pomocném vlákně, pracovní vlákno nornir runneru
+    na něj čeká nejvýše po dobu deadlinu. Po vypršení deadlinu je spojení k hostovi opuštěno (odebráno z hosta a zavřeno na pozadí -
+    tím se ukončí i visící operace pomocného vlákna), host je označen jako timed out a pracovní vlákno je uvolněno pro další hosty.
+    Celková doba běhu úkolu je tak omezena deadlinem, nikoliv nejpomalejším zařízením.
+
+    Vlákno v Pythonu nelze násilně ukončit - pomocné vlákno po vypršení deadlinu dál dokončuje právě prováděnou operaci.
+    Opuštěný úkol proto dostane příznak zrušení, který se kontroluje před každým dalším podúkolem (task.run) - žádný další
+    podúkol (např. další část konfigurace) se už nespustí. Operace, která v okamžiku vypršení běží uvnitř jednoho podúkolu
+    (např. už odeslaný konfigurační příkaz), se ale zastavit nedá - konfigurace zařízení tak může zůstat částečně provedená.
+    Výstup pomocného vlákna (print) jde do bufferu hosta v OrderedOutputProcessor. Výstup opuštěného úkolu po vypršení
+    deadlinu už není součástí výstupu hosta - během nornir úkolu se zahodí, po jeho skončení se vypíše samostatně.
+
+    Args:
+        deadlines (Optional[Dict[str, float]]): slovník název úkolu/podúkolu -> deadline v sekundách. Defaultně None.
+        default_deadline (Optional[float]): deadline pro úkoly, které nejsou v deadlines. Defaultně None (bez omezení).
+
+    Attributes:
+        deadlines (Dict[str, float]): deadliny jednotlivých úkolů.
+        default_deadline (Optional[float]): deadline pro ostatní úkoly.
+        timed_out (Dict[str, List[str]]): host -> názvy úkolů, které nedoběhly do deadlinu.
+        lock (threading.Lock): zámek pro přístup z více vláken.
+    """
+
+    def __init__(self, deadlines: Optional[Dict[str, float]] = None, default_deadline: Optional[float] = None):
+        self._deadlines = deadlines or {}
+        self._default_deadline = default_deadline
+        self._timed_out: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def get_deadline(self, task_name: str) -> Optional[float]:
+        return self._deadlines.get(task_name, self._default_deadline)
+
+    def get_timed_out_hosts(self) -> Dict[str, List[str]]:
+        """
+        Metoda, která vrací hosty, u kterých některý úkol nedoběhl do deadlinu.
+
+        Returns:
+            Vrací slovník host -> názvy úkolů.
+        """
+        with self._lock:
+            return {host: list(tasks) for host, tasks in self._timed_out.items()}
+
+    def run_task(self, task: Task, task_func: Callable, **kwargs) -> None:
+        """
+        Nornir úkol, který spustí task_func s deadlinem dle názvu úkolu - např. nornir_devices.run(task=deadline.run_task, task_func=..., name=...).
+
+        Args:
+            task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
+            task_func (Callable): obalovaný nornir úkol
+            **kwargs: argumenty obalovaného úkolu
+
+        Raises:
+            TaskDeadlineExceeded: Výjimka, která nastane, pokud úkol nedoběhne do deadlinu.
+            NornirSubTaskError: Výjimka, která nastane, pokud obalovaný úkol selže.
+
+        Returns:
+            None
+        """
+        self.run_subtask(task, task_func, name=task.name, **kwargs)
+
+    def run_subtask(self, task: Task, task_func: Callable, name: Optional[str] = None, deadline: Optional[float] = None,
+                    **kwargs) -> MultiResult:
+        """
+        Metoda, která slouží jako náhrada za Task.run - spustí podúkol s deadlinem. Bez deadlinu je podúkol spuštěn přímo (Task.run).
+
+        Args:
+            task (Task): Task objekt nadřazeného úkolu
+            task_func (Callable): nornir podúkol
+            name (Optional[str]): název podúkolu. Defaultně None (název funkce).
+            deadline (Optional[float]): deadline v sekundách. Defaultně None (dle názvu podúkolu, případně default_deadline).
+            **kwargs: argumenty podúkolu
+
+        Raises:
+            TaskDeadlineExceeded: Výjimka, která nastane, pokud podúkol nedoběhne do deadlinu.
+            NornirSubTaskError: Výjimka, která nastane, pokud podúkol selže.
+
+        Returns:
+            Vrací MultiResult objekt s výsledky podúkolu.
+        """
+        name = name or task_func.__name__
+        deadline = deadline if deadline is not None else self.get_deadline(name)
+        if deadline is None:
+            return task.run(task=task_func, name=name, **kwargs)
+        if "severity_level" not in kwargs:
+            kwargs["severity_level"] = task.severity_level
+        # vlastní Task objekt - výsledky opuštěného podúkolu se nikdy nepřipojí k výsledkům nadřazeného úkolu
+        cancelled = threading.Event()
+        processors = Processors(list(task.processors) + [_CancellationProcessor(cancelled)])
+        subtask = Task(task_func, task.nornir, global_dry_run=task.global_dry_run, processors=processors,
+                       name=name, parent_task=task, **kwargs)
+        outcome: Dict[str, MultiResult] = {}
+        stdout = sys.stdout
+        buffer = stdout.get_buffer() if hasattr(stdout, "get_buffer") else None  # buffer hosta (OrderedOutputProcessor)
+
+        def run_helper() -> None:
+            if buffer is not None:
+                stdout.set_buffer(buffer)
+            outcome["result"] = subtask.start(task.host)
+
+        thread = threading.Thread(target=run_helper, name=f"deadline-{task.host.name}", daemon=True)
+        thread.start()
+        thread.join(deadline)
+        if thread.is_alive():
+            cancelled.set()
+            self._abandon(task, name, deadline)
+            raise TaskDeadlineExceeded(f"{task.host.name}: task {name} exceeded deadline of {deadline} s.")
+        result = outcome["result"]
+        task.results.append(result[0] if len(result) == 1 else result)
+        if result.failed:
+            raise NornirSubTaskError(task=subtask, result=result)
+        return result
+
+    def _abandon(self, task: Task, name: str, deadline: float) -> None:
+        """
+        Metoda, která označí hosta jako timed out a opustí jeho spojení (odebere je z hosta a zavře je na pozadí,
+        protože zavření visícího spojení může také blokovat).
+
+        Args:
+            task (Task): Task objekt nadřazeného úkolu
+            name (str): název úkolu, který nedoběhl do deadlinu
+            deadline (float): deadline v sekundách
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._timed_out.setdefault(task.host.name, []).append(name)
+        connections = [task.host.connections.pop(conn_name) for conn_name in list(task.host.connections.keys())]
+        threading.Thread(target=self._close_connections, args=(connections,), name=f"abandon-{task.host.name}",
+                         daemon=True).start()
+        print(f"{Fore.RED}{task.host.name}: {name} timed out after {deadline} s - session abandoned.")
+
+    def _close_connections(self, connections: List[ConnectionPlugin]) -> None:
+        """
+        Metoda, která zavře opuštěná spojení (běží v samostatném vlákně).
+
+        Args:
+            connections (List[ConnectionPlugin]): opuštěná spojení
+
+        Returns:
+            None
+        """
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception:
+                pass  # spojení je opuštěné - chyba při zavírání už nemá vliv na výsledek úkolu
@@ -0,0 +1,273 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from colorama import Fore
+from napalm.base.exceptions import ConnectionException
+from netmiko.exceptions import NetmikoAuthenticationException, NetmikoTimeoutException
+from nornir.core import Nornir
+from nornir.core.exceptions import NornirSubTaskError
+from nornir.core.task import AggregatedResult, Result, Task
+from paramiko.ssh_exception import SSHException
+
+from modules.utility.task_deadline import TaskDeadline, TaskDeadlineExceeded
+
+
+class RetryPolicy:
+    """
+    Třída, která určuje, kolikrát a s jakým zpožděním se má neúspěšný nornir úkol opakovat. Zpoždění roste exponenciálně
+    (base_delay * multiplier^(pokus - 1), maximálně max_delay) a je náhodně zkráceno (jitter), aby se opakované pokusy více
+    vláken nesetkaly ve stejném okamžiku. Opakovány jsou pouze přechodné chyby (timeout, ztráta spojení).
+
+    Args:
+        max_attempts (int): maximální počet pokusů (včetně prvního). Defaultně 3.
+        base_delay (float): zpoždění před druhým pokusem (v sekundách). Defaultně 2.
+        max_delay (float): maximální zpoždění (v sekundách). Defaultně 30.
+        multiplier (float): koeficient exponenciálního růstu zpoždění. Defaultně 2.
+        jitter (float): část zpoždění (0 - 1), o kterou může být zpoždění náhodně zkráceno. Defaultně 0.5.
+        retry_on (Tuple[Type[BaseException], ...]): přechodné chyby, při kterých se úkol opakuje. Defaultně None (TRANSIENT_EXCEPTIONS).
+
+    Attributes:
+        max_attempts (int): maximální počet pokusů.
+        base_delay (float): zpoždění před druhým pokusem.
+        max_delay (float): maximální zpoždění.
+        multiplier (float): koeficient exponenciálního růstu zpoždění.
+        jitter (float): část zpoždění, o kterou může být zpoždění náhodně zkráceno.
+        retry_on (Tuple[Type[BaseException], ...]): přechodné chyby.
+    """
+
+    TRANSIENT_EXCEPTIONS = (TimeoutError, ConnectionError, EOFError, NetmikoTimeoutException, SSHException,
+                            ConnectionException)
+    PERMANENT_EXCEPTIONS = (NetmikoAuthenticationException,)
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 2, max_delay: float = 30, multiplier: float = 2,
+                 jitter: float = 0.5, retry_on: Optional[Tuple[Type[BaseException], ...]] = None):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1.")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retry_on = retry_on or self.TRANSIENT_EXCEPTIONS
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        Metoda, která vrací zpoždění před dalším pokusem.
+
+        Args:
+            attempt (int): číslo neúspěšného pokusu (od 1)
+
+        Returns:
+            Vrací zpoždění v sekundách.
+        """
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    def is_retryable(self, exception: BaseException) -> bool:
+        """
+        Metoda, která určí, jestli jde o přechodnou chybu (úkol má smysl opakovat).
+
+        Args:
+            exception (BaseException): výjimka, která způsobila selhání úkolu
+
+        Returns:
+            Vrací True, pokud se má úkol opakovat.
+        """
+        return isinstance(exception, self.retry_on) and not isinstance(exception, self.PERMANENT_EXCEPTIONS)
+
+
+class CircuitBreaker:
+    """
+    Třída, která po failure_threshold po sobě jdoucích selháních úkolů daného hosta "rozpojí obvod" - host je v dalších úkolech přeskočen,
+    dokud neuplyne cooldown. Poté je povolen jeden zkušební pokus (half-open) - při úspěchu je obvod opět spojen, při selhání znovu rozpojen.
+
+    Args:
+        failure_threshold (int): počet po sobě jdoucích selhání, po kterém je host přeskakován. Defaultně 3.
+        cooldown (float): doba (v sekundách), po kterou je host přeskakován. Defaultně 300.
+
+    Attributes:
+        failure_threshold (int): počet po sobě jdoucích selhání, po kterém je host přeskakován.
+        cooldown (float): doba, po kterou je host přeskakován.
+        failures (Dict[str, int]): počet po sobě jdoucích selhání jednotlivých hostů.
+        opened_at (Dict[str, float]): čas rozpojení obvodu jednotlivých hostů (time.monotonic).
+        lock (threading.Lock): zámek pro přístup z více vláken.
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 300):
+        self._failure_threshold = failure_threshold
+        self._cooldown = cooldown
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host: str) -> bool:
+        """
+        Metoda, která určí, jestli se má úkol na hostovi provést.
+
+        Args:
+            host (str): jméno hosta
+
+        Returns:
+            Vrací False, pokud je obvod hosta rozpojen a cooldown ještě neuplynul.
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at >= self._cooldown:
+                self._opened_at[host] = time.monotonic()  # half-open - do dalšího cooldownu je povolen pouze tento pokus
+                return True
+            return False
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] >= self._failure_threshold:
+                self._opened_at[host] = time.monotonic()
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            return opened_at is not None and time.monotonic() - opened_at < self._cooldown
+
+    def get_open_hosts(self) -> List[str]:
+        """
+        Metoda, která vrací hosty s rozpojeným obvodem.
+
+        Returns:
+            Vrací list jmen hostů, které jsou přeskakovány.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return [host for host, opened_at in self._opened_at.items() if now - opened_at < self._cooldown]
+
+
+class ResilientTaskRunner:
+    """
+    Třída, která spouští nornir úkoly s opakováním přechodných chyb (RetryPolicy dle názvu úkolu) a s per-host circuit breakerem.
+    Před opakováním je z výsledků odstraněn neúspěšný pokus a jsou zavřena spojení k hostovi (při dalším pokusu se otevřou znovu).
+
+    Nornir standardně vyřadí hosta po prvním selhání ze všech dalších úkolů. Při použití metody run o vyřazení rozhoduje circuit breaker -
+    hosti, kteří ještě nedosáhli limitu selhání, jsou v dalších úkolech opět použiti.
+
+    Args:
+        policies (Optional[Dict[str, RetryPolicy]]): slovník název úkolu -> RetryPolicy. Defaultně None (pro všechny úkoly default_policy).
+        default_policy (Optional[RetryPolicy]): politika pro úkoly, které nejsou v policies. Defaultně None (RetryPolicy()).
+        circuit_breaker (Optional[CircuitBreaker]): circuit breaker sdílený všemi úkoly. Defaultně None (CircuitBreaker()).
+        deadline (Optional[TaskDeadline]): deadliny jednotlivých pokusů (úkol, který nedoběhne do deadlinu, se neopakuje). Defaultně None (bez omezení).
+
+    Attributes:
+        policies (Dict[str, RetryPolicy]): politiky opakování jednotlivých úkolů.
+        default_policy (RetryPolicy): politika pro ostatní úkoly.
+        circuit_breaker (CircuitBreaker): circuit breaker sdílený všemi úkoly.
+        deadline (Optional[TaskDeadline]): deadliny jednotlivých pokusů.
+    """
+
+    def __init__(self, policies: Optional[Dict[str, RetryPolicy]] = None, default_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None, deadline: Optional[TaskDeadline] = None):
+        self._policies = policies or {}
+        self._default_policy = default_policy or RetryPolicy()
+        self._circuit_breaker = circuit_breaker or CircuitBreaker()
+        self._deadline = deadline
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        return self._circuit_breaker
+
+    def get_policy(self, task_name: str) -> RetryPolicy:
+        return self._policies.get(task_name, self._default_policy)
+
+    def run(self, nornir_devices: Nornir, task_func: Callable, name: Optional[str] = None, **kwargs) -> AggregatedResult:
+        """
+        Metoda, která spustí nornir úkol (s opakováním a circuit breakerem) na všech zařízeních. Hosti, kteří selhali, jsou poté vráceni
+        mezi aktivní hosty (nornir je ve výchozím stavu vyřazuje natrvalo) - hosti s rozpojeným obvodem jsou v dalších úkolech přeskočeni
+        bez připojení k zařízení a po uplynutí cooldownu jsou znovu vyzkoušeni.
+
+        Args:
+            nornir_devices (Nornir): Nornir objekt, umožňující volat paralelně nornir úkoly (tasky) a agregovat výsledky z jednotlivých tasků pro daná zařízení.
+            task_func (Callable): nornir úkol
+            name (Optional[str]): název úkolu (dle názvu je vybrána RetryPolicy). Defaultně None (název funkce).
+            **kwargs: argumenty nornir úkolu
+
+        Returns:
+            Vrací AggregatedResult objekt s výsledky úkolu.
+        """
+        name = name or task_func.__name__
+        result = nornir_devices.run(task=self.run_task, name=name, task_func=task_func, **kwargs)
+        for host in result.failed_hosts:
+            nornir_devices.data.recover_host(host)  # o přeskočení hosta rozhoduje circuit breaker (i po uplynutí cooldownu)
+        open_hosts = self._circuit_breaker.get_open_hosts()
+        if open_hosts:
+            print(f"{Fore.RED}Circuit open (hosts skipped until cooldown passes): {', '.join(sorted(open_hosts))}")
+        return result
+
+    def run_task(self, task: Task, task_func: Callable, **kwargs) -> Optional[Result]:
+        """
+        Nornir úkol, který obaluje task_func - přeskočí hosta s rozpojeným obvodem a při přechodné chybě úkol opakuje dle RetryPolicy.
+
+        Args:
+            task (Task): Task objekt, umožňující paralelně volat a seskupovat další nornir úkoly (funkce).
+            task_func (Callable): obalovaný nornir úkol
+            **kwargs: argumenty obalovaného úkolu
+
+        Raises:
+            NornirSubTaskError: Výjimka, která nastane, pokud obalovaný úkol selže i po posledním pokusu (nebo selže nepřechodnou chybou).
+
+        Returns:
+            Vrací neúspěšný Result objekt, pokud byl host přeskočen (rozpojený obvod), jinak None.
+        """
+        host = task.host.name
+        if not self._circuit_breaker.allow(host):
+            return Result(host=task.host, result=f"{host}: skipped - circuit open after repeated failures.", failed=True)
+        policy = self.get_policy(task.name)
+        for attempt in range(1, policy.max_attempts + 1):
+            results_count = len(task.results)
+            try:
+                if self._deadline is not None:
+                    self._deadline.run_subtask(task, task_func, name=task.name, **kwargs)
+                else:
+                    task.run(task=task_func, name=task.name, **kwargs)
+            except TaskDeadlineExceeded:
+                self._circuit_breaker.record_failure(host)  # visící zařízení se neopakuje - zbytečně by blokovalo pracovní vlákno
+                raise
+            except NornirSubTaskError as err:
+                root_exception = self._get_root_exception(err)
+                if attempt == policy.max_attempts or not policy.is_retryable(root_exception):
+                    self._circuit_breaker.record_failure(host)
+                    raise
+                del task.results[results_count:]  # neúspěšný pokus nemá ovlivnit výsledek úkolu
+                task.host.close_connections()
+                delay = policy.get_delay(attempt)
+                print(f"{Fore.YELLOW}{host}: {task.name} failed ({type(root_exception).__name__}), "
+                      f"retrying in {delay:.1f} s (attempt {attempt + 1}/{policy.max_attempts}).")
+                time.sleep(delay)
+                continue
+            self._circuit_breaker.record_success(host)
+            return None
+
+    def _get_root_exception(self, exception: BaseException) -> BaseException:
+        """
+        Metoda, která v zanořených NornirSubTaskError najde původní výjimku (např. NetmikoTimeoutException).
+
+        Args:
+            exception (BaseException): výjimka vyvolaná úkolem
+
+        Returns:
+            Vrací původní výjimku (nebo předanou výjimku, pokud původní nelze určit).
+        """
+        while isinstance(exception, NornirSubTaskError):
+            failed = [result for result in exception.result if result.failed and result.exception is not None]
+            if not failed:
+                return exception
+            exception = next((result.exception for result in failed if not isinstance(result.exception, NornirSubTaskError)),
+                             failed[0].exception)
+        return exception
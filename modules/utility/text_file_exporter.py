@@ -1,25 +1,34 @@
 from pathlib import Path
+from typing import Optional
 
 from colorama import Fore
 
+from modules.utility.export_writer import ExportWriter
+
 
 class FileExporter:
     """
-    Třida pro exportování dat do formátu .txt nebo .conf.
+    Třida pro exportování dat do formátu .txt nebo .conf (případně .json/.ndjson - serializovaná data).
 
     Args:
         file_path (Path): argument metody, obsahující cestu k exportovanému .txt nebo .conf souboru.
         content (str): argument metody, obsahující data, která budou exportována do .txt nebo .conf souboru.
+        writer (Optional[ExportWriter]): asynchronní zapisovač, přes který se data zapíší (atomicky, případně komprimovaně) bez blokování
+                                         volajícího vlákna. Defaultně None (synchronní zápis).
 
     Attributes:
          dest_file (Path): instanční proměnná, definující cestu k exportovanému .txt nebo .conf souboru.
          content (str): instanční proměnná, definující data, která budou exportována do .txt nebo .conf souboru.
+         writer (Optional[ExportWriter]): asynchronní zapisovač.
 
     """
 
-    def __init__(self, file_path: Path, content: str):
+    SUPPORTED_SUFFIXES = [".txt", ".conf", ".json", ".ndjson"]
+
+    def __init__(self, file_path: Path, content: str, writer: Optional[ExportWriter] = None):
         self._dest_file = file_path
         self._content = content
+        self._writer = writer
         self._check_full_file_path()
 
     def _create_parent_folders(self, folder_path: Path) -> None:
@@ -38,7 +47,7 @@ class FileExporter:
 
     def _check_full_file_path(self) -> None:
         """
-        Metoda, která zkontroluje, jestli je k instanční proměnné dest_file přiřazena validní cesta k .txt nebo .conf souboru.
+        Metoda, která zkontroluje, jestli je k instanční proměnné dest_file přiřazena validní cesta k .txt nebo .conf (.json, .ndjson) souboru.
         Dodatečně vytvoří požadované nadřazené složky, pokud už nejsou vytvořené za pomocí metody _create_parent_folders.
 
         Raises:
@@ -47,7 +56,7 @@ class FileExporter:
         Returns:
             None
         """
-        if self._dest_file.suffix == ".txt" or self._dest_file.suffix == ".conf":
+        if self._dest_file.suffix in self.SUPPORTED_SUFFIXES:
             folder_path = self._dest_file.parent
             self._create_parent_folders(folder_path)
         else:
@@ -55,7 +64,8 @@ class FileExporter:
 
     def export_to_file(self, append: bool = False) -> None:
         """
-        Metoda, která provádí export dat do souboru.
+        Metoda, která provádí export dat do souboru. Pokud je nastaven writer, data jsou pouze vložena do jeho fronty
+        (zápis a souhrnný výpis provede ExportWriter).
 
         Args:
             append (bool): argument, který rozlišuje, jestli se mají data přidávat na konec existujícího souboru (True) nebo se má vytvořit zcela nový soubor (False).
@@ -64,6 +74,9 @@ class FileExporter:
         Returns:
             None
         """
+        if self._writer is not None:
+            self._writer.submit(self._dest_file, self._content, append=append)
+            return
         mode = "a" if append else "w"
         with open(self._dest_file, mode) as file:
             file.write(self._content)
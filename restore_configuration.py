@@ -10,6 +10,7 @@ from nornir_utils.plugins.functions import print_result
 from nornir_utils.plugins.tasks.data import load_yaml
 
 from modules.utility.credential_handler import CredentialHandler
+from modules.utility.log_pipeline import setup_log_pipeline
 
 
 class RestoreConfiguration:
@@ -25,6 +26,7 @@ class RestoreConfiguration:
             Nornir - nornir objekt, který obsahuje zparsované informace o hostech, skupinách. Dále zajišťuje multithreading funkcionalitu.
         """
         creds_handler = CredentialHandler()
+        setup_log_pipeline()  # logování nornir přes frontu (config.yml - logging: enabled: False)
         nr = InitNornir(config_file="config.yml")  # Nornir objekt, který přeskočí hosty, které nezvládli požadovaný (sub)task - více o chybě v nornir.log
         creds_handler.insert_creds(nr)
         return nr
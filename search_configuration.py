@@ -0,0 +1,69 @@
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List, Union
+
+from colorama import Fore
+from nornir_utils.plugins.functions import print_title
+
+from modules.utility.config_index import ConfigIndex
+
+INDEX_PATH = Path(Path.cwd() / "export" / "config_index.sqlite")
+CONFIG_DIRECTORIES = [Path(Path.cwd() / "backups"), Path(Path.cwd() / "export" / "running_configuration")]
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Funkce, která zpracuje argumenty příkazové řádky.
+
+    Returns:
+        Vrací objekt s argumenty.
+    """
+    parser = argparse.ArgumentParser(description="Full-text search over backed up and exported device configurations.")
+    parser.add_argument("query", nargs="?", help='searched phrase, e.g. "access-list 101"')
+    parser.add_argument("--ip", help="searched IP address or prefix, e.g. 10.1.1.0/24 (addresses and networks inside the prefix)")
+    parser.add_argument("--host", help="search only configurations of this host")
+    parser.add_argument("--latest", action="store_true", help="search only the latest configuration of each host")
+    parser.add_argument("--limit", type=int, help="maximum number of printed lines")
+    parser.add_argument("--no-update", action="store_true", help="do not index new or changed files before the search")
+    args = parser.parse_args()
+    if not args.query and not args.ip:
+        parser.error("query or --ip is required")
+    return args
+
+
+def print_matches(matches: List[Dict[str, Union[str, int]]], elapsed: float) -> None:
+    """
+    Funkce, která vypíše nalezené řádky (host, datum, číslo řádku a řádek konfigurace).
+
+    Args:
+        matches (List[Dict[str, Union[str, int]]]): nalezené řádky (viz ConfigIndex.search)
+        elapsed (float): doba vyhledávání v sekundách
+
+    Returns:
+        None
+    """
+    for match in matches:
+        print(f"{Fore.GREEN}{match['host']}{Fore.RESET} {match['date']} line {match['line_no']}: {match['line'].strip()}")
+    hosts = sorted({match["host"] for match in matches})
+    print(f"{len(matches)} lines on {len(hosts)} hosts ({', '.join(hosts)}) found in {elapsed * 1000:.1f} ms.")
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    config_index = ConfigIndex(INDEX_PATH)
+    if not args.no_update:
+        config_index.index_directories([directory for directory in CONFIG_DIRECTORIES if directory.exists()])
+    started = time.perf_counter()
+    if args.ip:
+        print_title(f"Configuration lines with addresses in {args.ip}")
+        try:
+            matches = config_index.search_ip(args.ip, host=args.host, latest=args.latest, limit=args.limit)
+        except ValueError as err:
+            print(f"{Fore.RED}{err}")
+            matches = []
+    else:
+        print_title(f"Configuration lines matching '{args.query}'")
+        matches = config_index.search(args.query, host=args.host, latest=args.latest, limit=args.limit)
+    print_matches(matches, time.perf_counter() - started)
+    config_index.close()